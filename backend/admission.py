@@ -0,0 +1,286 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+import metrics
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "admission.sqlite3")
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is turned away; retry_after is the suggested wait in seconds"""
+
+    def __init__(self, reason, message, retry_after):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def refill(tokens, updated_at, now, rate, capacity):
+    return min(capacity, tokens + (now - updated_at) * rate)
+
+
+class MemoryAdmissionBackend:
+    """Quota buckets and concurrency slots for a single process"""
+
+    # Buckets of clients idle this long are full again and can be forgotten
+    IDLE_SECONDS = 3600
+
+    def __init__(self, max_clients=10000):
+        self.max_clients = max_clients
+        self._buckets = {}  # client -> (tokens, updated_at)
+        self._slots = {}  # slot id -> weight
+        self._next_slot = 0
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+
+    def take(self, client_id, cost, rate, capacity):
+        """Take cost tokens from the client's bucket; returns 0 if granted, else the seconds until they would be"""
+        now = time.time()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(client_id, (capacity, now))
+            tokens = refill(tokens, updated_at, now, rate, capacity)
+            granted = tokens >= cost
+            self._buckets[client_id] = (tokens - cost if granted else tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets = {
+                    client: bucket for client, bucket in self._buckets.items() if now - bucket[1] < self.IDLE_SECONDS
+                }
+        return 0.0 if granted else (cost - tokens) / rate
+
+    def refund(self, client_id, cost, capacity):
+        with self._lock:
+            if client_id in self._buckets:
+                tokens, updated_at = self._buckets[client_id]
+                self._buckets[client_id] = (min(capacity, tokens + cost), updated_at)
+
+    def try_acquire(self, weight, limit):
+        """A slot id if weight more units fit under limit (or nothing else is running), else None"""
+        with self._lock:
+            in_use = sum(self._slots.values())
+            if in_use and in_use + weight > limit:
+                return None
+            self._next_slot += 1
+            self._slots[self._next_slot] = weight
+            return self._next_slot
+
+    def release(self, slot_id):
+        with self._lock:
+            self._slots.pop(slot_id, None)
+            self._released.notify_all()
+
+    def wait(self, timeout):
+        """Block until a slot is released or timeout seconds pass"""
+        with self._released:
+            self._released.wait(timeout)
+
+    def in_use(self):
+        with self._lock:
+            return sum(self._slots.values())
+
+
+class SQLiteAdmissionBackend:
+    """Quota buckets and concurrency slots shared by every worker process through one SQLite file.
+
+    Slots expire after lease_seconds so a crashed worker can't hold them forever.
+    Waiters poll for free slots every poll_interval seconds.
+    """
+
+    def __init__(self, path=None, lease_seconds=900, poll_interval=0.1):
+        self.path = path or os.getenv("ADMISSION_DB_PATH", DEFAULT_DB_PATH)
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._takes = 0
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Autocommit; every read-modify-write runs in its own BEGIN IMMEDIATE transaction
+        self._conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS admission_buckets ("
+            "client_id TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS admission_slots ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, weight INTEGER NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def take(self, client_id, cost, rate, capacity):
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM admission_buckets WHERE client_id = ?", (client_id,)
+            ).fetchone()
+            tokens = refill(*row, now, rate, capacity) if row else capacity
+            granted = tokens >= cost
+            conn.execute(
+                "INSERT OR REPLACE INTO admission_buckets (client_id, tokens, updated_at) VALUES (?, ?, ?)",
+                (client_id, tokens - cost if granted else tokens, now)
+            )
+            self._takes += 1
+            if self._takes % 1000 == 0:
+                conn.execute(
+                    "DELETE FROM admission_buckets WHERE updated_at < ?", (now - MemoryAdmissionBackend.IDLE_SECONDS,)
+                )
+        return 0.0 if granted else (cost - tokens) / rate
+
+    def refund(self, client_id, cost, capacity):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE admission_buckets SET tokens = MIN(?, tokens + ?) WHERE client_id = ?",
+                (capacity, cost, client_id)
+            )
+
+    def try_acquire(self, weight, limit):
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM admission_slots WHERE expires_at < ?", (now,))
+            in_use = conn.execute("SELECT COALESCE(SUM(weight), 0) FROM admission_slots").fetchone()[0]
+            if in_use and in_use + weight > limit:
+                return None
+            cursor = conn.execute(
+                "INSERT INTO admission_slots (weight, expires_at) VALUES (?, ?)", (weight, now + self.lease_seconds)
+            )
+            return cursor.lastrowid
+
+    def release(self, slot_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM admission_slots WHERE id = ?", (slot_id,))
+
+    def wait(self, timeout):
+        time.sleep(min(timeout, self.poll_interval))
+
+    def in_use(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(weight), 0) FROM admission_slots WHERE expires_at >= ?", (time.time(),)
+            ).fetchone()[0]
+
+
+def create_backend(name=None):
+    """The admission backend named by ADMISSION_BACKEND: 'memory' (default) or 'sqlite' for multiple workers"""
+    name = name or os.getenv("ADMISSION_BACKEND", "memory")
+    if name == "memory":
+        return MemoryAdmissionBackend()
+    if name == "sqlite":
+        return SQLiteAdmissionBackend()
+    raise ValueError(f"Unknown admission backend '{name}'; expected 'memory' or 'sqlite'")
+
+
+class AdmissionController:
+    """Admission control in front of crew runs.
+
+    Each client has a token bucket of `burst` tokens refilled at
+    rate_per_minute, and all crews together may use at most max_concurrent
+    units. Requests cost units by the work they trigger (a batch costs one per
+    meal). Over-quota clients are rejected at once; when the crews are busy a
+    request waits up to queue_timeout seconds in a queue of at most max_queue
+    waiters (per process) before it is rejected. A rate of 0 disables quotas.
+    """
+
+    def __init__(self, backend=None, max_concurrent=4, rate_per_minute=10, burst=5, max_queue=8, queue_timeout=30):
+        self.backend = backend or MemoryAdmissionBackend()
+        self.max_concurrent = max_concurrent
+        self.rate = rate_per_minute / 60
+        self.burst = burst
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.waiting = 0
+        self._lock = threading.Lock()
+
+    def check_quota(self, client_id, cost=1):
+        """Charge cost to the client's quota, or raise AdmissionRejected"""
+        if self.rate <= 0:
+            return
+        retry_after = self.backend.take(client_id, min(cost, self.burst), self.rate, self.burst)
+        if retry_after:
+            metrics.record_admission("rejected_quota")
+            raise AdmissionRejected("quota", "Too many meal plan requests; slow down", retry_after)
+
+    def acquire(self, cost=1, timeout=None, queue=True):
+        """A concurrency slot for cost units, waiting up to timeout seconds (queue_timeout by default).
+
+        Queued waiters count against max_queue; with queue=False the wait is
+        unbounded and uncounted, for work that already waited in a queue of its own.
+        """
+        slot = self.backend.try_acquire(cost, self.max_concurrent)
+        if slot is not None:
+            metrics.record_admission("admitted")
+            return slot
+
+        if queue:
+            with self._lock:
+                if self.waiting >= self.max_queue:
+                    metrics.record_admission("rejected_queue_full")
+                    raise AdmissionRejected("busy", "Server is busy; try again shortly", self.queue_timeout)
+                self.waiting += 1
+            timeout = self.queue_timeout if timeout is None else timeout
+        started = time.monotonic()
+        try:
+            while True:
+                remaining = None if timeout is None else timeout - (time.monotonic() - started)
+                if remaining is not None and remaining <= 0:
+                    metrics.record_admission("rejected_timeout")
+                    raise AdmissionRejected("busy", "Server is busy; try again shortly", self.queue_timeout)
+                # Bounded, so a release just before the wait delays a waiter by at most a second
+                self.backend.wait(min(remaining, 1.0) if remaining is not None else 1.0)
+                slot = self.backend.try_acquire(cost, self.max_concurrent)
+                if slot is not None:
+                    metrics.record_admission("admitted_after_wait", time.monotonic() - started)
+                    return slot
+        finally:
+            if queue:
+                with self._lock:
+                    self.waiting -= 1
+
+    def release(self, slot):
+        self.backend.release(slot)
+
+    @contextmanager
+    def admit(self, client_id, cost=1):
+        """Check the client's quota and hold a concurrency slot for the duration of the block"""
+        self.check_quota(client_id, cost)
+        try:
+            slot = self.acquire(cost)
+        except AdmissionRejected:
+            # Turned away for lack of capacity; don't also charge the client's quota
+            self.backend.refund(client_id, min(cost, self.burst), self.burst)
+            raise
+        try:
+            yield
+        finally:
+            self.release(slot)
+
+    def stats(self):
+        with self._lock:
+            waiting = self.waiting
+        return {
+            "backend": "sqlite" if isinstance(self.backend, SQLiteAdmissionBackend) else "memory",
+            "in_use": self.backend.in_use(),
+            "max_concurrent": self.max_concurrent,
+            "waiting": waiting,
+            "max_queue": self.max_queue,
+            "queue_timeout_seconds": self.queue_timeout,
+            "rate_per_minute": round(self.rate * 60, 2),
+            "burst": self.burst,
+        }
+
+
+def retry_after_header(seconds):
+    """Retry-After value: whole seconds, at least 1"""
+    return str(max(1, math.ceil(seconds)))
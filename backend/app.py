@@ -1,10 +1,24 @@
 import os
+import hashlib
 import warnings
-from flask import Flask, request, jsonify
+import queue
+import threading
+import time
+from contextlib import ExitStack, nullcontext
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
-from models import MealPlanRequest, GroceryShoppingPlan, MealPlan
-from crew_service import AlexCrewService
+from models import BatchMealPlanRequest, MealPlanRequest, GroceryShoppingPlan, MealPlan
+from plan_cache import PlanCache, is_cacheable, request_key
+from catalog import SUPPORTED_MEALS, COOKING_SKILLS, COMMON_DIETARY_RESTRICTIONS
+from jobs import JobManager, QueueFullError
+from admission import AdmissionController, AdmissionRejected, create_backend, retry_after_header
+from warmup import PlanWarmer
+from llm_router import LLMRouter
+import outbound
+from revision import changed_fields, reusable_outputs
+from responses import ORJSONProvider, StaticJSON, dumps, finalize_json_response, select_fields
+import metrics
 import logging
 
 # Suppress Pydantic deprecation warnings from third-party packages
@@ -15,115 +29,611 @@ load_dotenv()
 
 # Create Flask app
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 CORS(app)
 
-# Configure logging
+# Configure logging; an imported dependency may already have set up a root handler, so set the level too
 logging.basicConfig(level=logging.INFO)
+logging.getLogger().setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize CrewAI service
-crew_service = AlexCrewService()
+# Per-task LLM tiers, timeouts and token budgets (config/models.yaml); crewai loads on first LLM
+llm_router = LLMRouter()
+
+# CrewAI service; importing crewai and building the crews takes seconds, so it's
+# built on first use or in the background instead of at import time
+crew_service = None
+crew_service_lock = threading.Lock()
+
+def get_crew_service():
+    """The shared AlexCrewService, imported and built on first use"""
+    global crew_service
+    if crew_service is None:
+        with crew_service_lock:
+            if crew_service is None:
+                started = time.perf_counter()
+                from crew_service import AlexCrewService
+                imported = time.perf_counter()
+                crew_service = AlexCrewService(router=llm_router)
+                logger.info(
+                    f"Crew service ready in {time.perf_counter() - started:.1f}s "
+                    f"(imports {imported - started:.1f}s)"
+                )
+    return crew_service
+
+def preload_crew_service():
+    """Build the crew service in a background thread (CREW_SERVICE_PRELOAD=background, the default)"""
+    def build():
+        try:
+            get_crew_service()
+        except Exception as e:
+            logger.error(f"Background crew service build failed: {str(e)}")
+
+    if os.getenv('CREW_SERVICE_PRELOAD', 'background') == 'background':
+        threading.Thread(target=build, name="crew-service-preload", daemon=True).start()
+
+# Initialize meal plan result cache
+plan_cache = PlanCache()
+
+# Pre-generate catalog plans on a schedule (WARMUP_INTERVAL seconds, disabled by default)
+plan_warmer = PlanWarmer(get_crew_service, plan_cache)
+plan_warmer.start()
+
+preload_crew_service()
+
+# Set once shutdown starts; /ready then fails so no new traffic is routed here
+draining = threading.Event()
+
+def run_meal_plan(meal_request, on_task_complete=None, reuse=None):
+    """Serve a meal plan from the result cache, or generate and cache it.
+
+    Returns the result, the cache status ('hit', 'similar', 'miss', 'bypass' or
+    'fallback', a cached plan served while a provider is down) and the
+    request's timing breakdown. on_task_complete(task_name, output, timing) is
+    called for every task output, including those replayed from the cache.
+    reuse holds task outputs of an earlier plan to generate with (see revision.py).
+    """
+    with metrics.trace_request() as trace:
+        if meal_request.cache != "bypass":
+            cached = plan_cache.get(meal_request)
+            metrics.record_cache_lookup("plan", hit=cached is not None)
+            if cached is not None:
+                if on_task_complete:
+                    task_timings = cached.get("timings", {}).get("tasks", {})
+                    for task_name, output in cached["task_outputs"].items():
+                        on_task_complete(task_name, output, task_timings.get(task_name))
+                if "cache_match" not in cached:
+                    return cached, "hit", trace.to_dict()
+                # Stored under this request too, so it has a plan id to revise
+                plan_cache.set(meal_request, cached)
+                return cached, "similar", trace.to_dict()
+
+        try:
+            result = get_crew_service().generate_meal_plan(meal_request, on_task_complete=on_task_complete, reuse=reuse)
+        except outbound.CircuitOpenError as e:
+            # Fail fast, but serve the cached plan the lookup above skipped if there is one
+            fallback = None
+            if meal_request.cache == "bypass" or meal_request.llm_summary:
+                fallback = plan_cache.get(meal_request.model_copy(update={"llm_summary": False}))
+            if fallback is None:
+                raise
+            logger.warning(f"Serving a cached plan for {meal_request.meal_name}: {str(e)}")
+            return fallback, "fallback", trace.to_dict()
+
+        if is_cacheable(result):
+            plan_cache.set(meal_request, result)
+
+    return result, "bypass" if meal_request.cache == "bypass" else "miss", trace.to_dict()
+
+def run_meal_plan_job(meal_request):
+    """Job body for asynchronous meal plan generation"""
+    # Jobs already waited in the job queue, so wait for a crew slot without a deadline
+    slot = admission.acquire(queue=False)
+    try:
+        result, cache_status, timing = run_meal_plan(meal_request)
+    finally:
+        admission.release(slot)
+    return {
+        "data": result,
+        "request_info": build_request_info(meal_request, cache_status, timing, result)
+    }
+
+def build_request_info(meal_request, cache_status, timing, result):
+    stored = cache_status in ("hit", "similar") or (cache_status != "fallback" and is_cacheable(result))
+    return {
+        "plan_id": request_key(meal_request) if stored else None,
+        "meal_name": meal_request.meal_name,
+        "servings": meal_request.servings,
+        "budget": meal_request.budget,
+        "dietary_restrictions": meal_request.dietary_restrictions,
+        "cooking_skill": meal_request.cooking_skill,
+        "cache": cache_status,
+        "timing": timing
+    }
+
+def provider_unavailable(error):
+    """503 response for a request that failed fast on an open circuit breaker"""
+    response = jsonify({"error": str(error), "provider": error.provider})
+    response.headers['Retry-After'] = str(int(error.retry_after + 0.5))
+    return response, 503
+
+def client_id():
+    """Quota key of the caller: its API key (hashed) if it sends one, else its IP address"""
+    api_key = request.headers.get('X-API-Key')
+    if api_key:
+        return "key:" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    return "ip:" + (request.remote_addr or "unknown")
+
+def admit_request(meal_request, cost=1):
+    """Admission for a request that will run crews; exact cache hits are served without it"""
+    if meal_request.cache != "bypass" and plan_cache.contains(meal_request):
+        return nullcontext()
+    return admission.admit(client_id(), cost)
+
+def admission_rejected(error):
+    """429 response for a request turned away by admission control"""
+    response = jsonify({"error": str(error), "reason": error.reason})
+    response.headers['Retry-After'] = retry_after_header(error.retry_after)
+    return response, 429
+
+def parse_meal_plan_request(body=None, model=MealPlanRequest):
+    """Validate the request data (the JSON body by default) and API keys for a meal plan request.
+
+    Returns (meal_request, None) on success or (None, error_response) on failure.
+    """
+    if body is None:
+        body = request.get_json(silent=True)
+    if not body:
+        return None, (jsonify({"error": "Request body must be JSON"}), 400)
+
+    try:
+        meal_request = model(**body)
+    except Exception as e:
+        return None, (jsonify({"error": f"Invalid request data: {str(e)}"}), 400)
+
+    if not os.getenv('SERPER_API_KEY'):
+        return None, (jsonify({"error": "SERPER_API_KEY not configured"}), 500)
+
+    if not os.getenv('GEMINI_API_KEY'):
+        return None, (jsonify({"error": "GEMINI_API_KEY not configured"}), 500)
+
+    return meal_request, None
+
+# Initialize background job manager
+job_manager = JobManager(
+    max_workers=int(os.getenv('JOB_WORKERS', 2)),
+    max_queue_depth=int(os.getenv('JOB_QUEUE_DEPTH', 16)),
+    retention_seconds=int(os.getenv('JOB_RETENTION_SECONDS', 3600))
+)
+
+# Initialize admission control for requests that run crews
+admission = AdmissionController(
+    backend=create_backend(),
+    max_concurrent=int(os.getenv('ADMISSION_MAX_CONCURRENT', 4)),
+    rate_per_minute=float(os.getenv('ADMISSION_RATE_PER_MINUTE', 10)),
+    burst=int(os.getenv('ADMISSION_BURST', 5)),
+    max_queue=int(os.getenv('ADMISSION_MAX_QUEUE', 8)),
+    queue_timeout=float(os.getenv('ADMISSION_QUEUE_TIMEOUT', 30))
+)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_duration(response):
+    started = g.get('request_started')
+    if started is not None:
+        endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+        metrics.HTTP_REQUEST_DURATION.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            endpoint=endpoint,
+            status=response.status_code
+        )
+    return response
+
+@app.after_request
+def compress_response(response):
+    """ETag, conditional GET and gzip/brotli for JSON responses"""
+    return finalize_json_response(response)
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({"status": "healthy", "message": "Alex Meal Planner API is running"})
 
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    """Readiness probe: 503 while draining or unable to generate plans, unlike the /health liveness probe"""
+    service = crew_service
+    checks = {
+        "accepting_requests": not draining.is_set(),
+        "api_keys_configured": bool(os.getenv('SERPER_API_KEY')) and bool(os.getenv('GEMINI_API_KEY')),
+        "crew_pool_built": service is not None and service.crew_pool.created > 0,
+    }
+    ready = all(checks.values())
+    return jsonify({
+        "status": "ready" if ready else "not_ready",
+        "checks": checks,
+        "crews_in_flight": service.crew_pool.in_use if service else 0,
+        # Informational: an open circuit fails requests fast but doesn't take the instance out of rotation
+        "providers": outbound.stats(),
+        "admission": admission.stats()
+    }), 200 if ready else 503
+
+def drain(timeout=None):
+    """Stop taking work and wait up to timeout seconds for in-flight crews and jobs to finish.
+
+    Returns True if everything finished in time.
+    """
+    draining.set()
+    deadline = time.monotonic() + timeout if timeout is not None else None
+
+    def remaining():
+        return max(0.0, deadline - time.monotonic()) if deadline is not None else None
+
+    plan_warmer.stop()
+    service = crew_service
+    if service is None:
+        # Nothing was ever generated by this process
+        return job_manager.drain(remaining())
+
+    service.price_refresher.stop()
+    logger.info(f"Draining {service.crew_pool.in_use} in-flight crews and {job_manager.stats()['running']} running jobs")
+    drained = job_manager.drain(remaining()) and service.crew_pool.wait_idle(remaining())
+    if drained:
+        logger.info("Drained all in-flight work")
+    else:
+        logger.warning(f"Shutting down with {service.crew_pool.in_use} crews still running")
+    return drained
+
 @app.route('/api/meal-plan', methods=['POST'])
 def generate_meal_plan():
-    """Generate a complete meal plan with shopping list and budget analysis"""
+    """Generate a complete meal plan with shopping list and budget analysis.
+
+    A fields query parameter ('summary,task_outputs.budget') limits the data returned.
+    """
     try:
-        # Validate request data
-        if not request.json:
-            return jsonify({"error": "Request body must be JSON"}), 400
+        meal_request, error_response = parse_meal_plan_request()
+        if error_response:
+            return error_response
         
-        # Parse and validate request
-        try:
-            meal_request = MealPlanRequest(**request.json)
-        except Exception as e:
-            return jsonify({"error": f"Invalid request data: {str(e)}"}), 400
+        logger.info(f"Generating meal plan for: {meal_request.meal_name}")
         
-        # Check required environment variables
-        if not os.getenv('SERPER_API_KEY'):
-            return jsonify({"error": "SERPER_API_KEY not configured"}), 500
+        # Generate meal plan using CrewAI, unless it is already cached
+        with admit_request(meal_request):
+            result, cache_status, timing = run_meal_plan(meal_request)
         
-        if not os.getenv('GEMINI_API_KEY'):
-            return jsonify({"error": "GEMINI_API_KEY not configured"}), 500
+        logger.info(f"Meal plan generation completed successfully (cache: {cache_status}, {timing['total_seconds']}s)")
         
-        logger.info(f"Generating meal plan for: {meal_request.meal_name}")
+        return jsonify({
+            "status": "success",
+            "data": select_fields(result, request.args.get('fields')),
+            "request_info": build_request_info(meal_request, cache_status, timing, result)
+        })
         
-        # Generate meal plan using CrewAI
-        result = crew_service.generate_meal_plan(meal_request)
+    except AdmissionRejected as e:
+        logger.warning(f"Meal plan request rejected ({e.reason}): {str(e)}")
+        return admission_rejected(e)
+    except outbound.CircuitOpenError as e:
+        logger.error(f"Meal plan generation failed fast: {str(e)}")
+        return provider_unavailable(e)
+    except Exception as e:
+        logger.error(f"Error generating meal plan: {str(e)}")
+        return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+
+@app.route('/api/meal-plan/<plan_id>', methods=['GET'])
+def get_meal_plan(plan_id):
+    """Get a stored meal plan by the plan_id of its request_info.
+
+    Responses carry an ETag, so a client re-fetching a plan it already has gets a 304.
+    """
+    stored = plan_cache.get_plan(plan_id)
+    if stored is None:
+        return jsonify({"error": "Meal plan not found or expired"}), 404
+    params, result = stored
+
+    response = jsonify({
+        "status": "success",
+        "data": select_fields(result, request.args.get('fields')),
+        "request_info": {"plan_id": plan_id, **params}
+    })
+    # Cached browsers and proxies must revalidate, since the plan can expire or be regenerated
+    response.cache_control.no_cache = True
+    return response
+
+@app.route('/api/meal-plan/<plan_id>/revise', methods=['POST'])
+def revise_meal_plan(plan_id):
+    """Revise a stored meal plan with a partial change to its request.
+
+    The stored meal plan is reused unless the meal, dietary restrictions or
+    cooking skill change; a servings change scales its quantities. Only the
+    tasks that depend on the changed fields are run again.
+    """
+    try:
+        stored = plan_cache.get_plan(plan_id)
+        if stored is None:
+            return jsonify({"error": "Meal plan not found or expired"}), 404
+        previous_request, previous_result = stored
+
+        changes = request.get_json(silent=True)
+        if not changes or not isinstance(changes, dict):
+            return jsonify({"error": "Request body must be a JSON object of the fields to change"}), 400
+
+        meal_request, error_response = parse_meal_plan_request({**previous_request, **changes})
+        if error_response:
+            return error_response
+
+        changed = changed_fields(previous_request, meal_request)
+        reuse = reusable_outputs(previous_request, meal_request, previous_result)
+        logger.info(
+            f"Revising meal plan {plan_id[:12]} ({', '.join(changed) or 'no changes'}), "
+            f"reusing: {', '.join(reuse) or 'nothing'}"
+        )
+
+        with admit_request(meal_request):
+            result, cache_status, timing = run_meal_plan(meal_request, reuse=reuse)
+        generated = cache_status in ("miss", "bypass")
+
+        return jsonify({
+            "status": "success",
+            "data": select_fields(result, request.args.get('fields')),
+            "request_info": {
+                **build_request_info(meal_request, cache_status, timing, result),
+                "revision": {
+                    "from_plan_id": plan_id,
+                    "changed_fields": changed,
+                    "reused_tasks": sorted(reuse) if generated else [],
+                }
+            }
+        })
+
+    except AdmissionRejected as e:
+        logger.warning(f"Meal plan revision rejected ({e.reason}): {str(e)}")
+        return admission_rejected(e)
+    except outbound.CircuitOpenError as e:
+        logger.error(f"Meal plan revision failed fast: {str(e)}")
+        return provider_unavailable(e)
+    except Exception as e:
+        logger.error(f"Error revising meal plan: {str(e)}")
+        return jsonify({"error": f"Internal server error: {str(e)}"}), 500
+
+@app.route('/api/meal-plans/batch', methods=['POST'])
+def generate_batch_meal_plan():
+    """Plan several meals at once with one merged shopping list and a single budget analysis"""
+    try:
+        batch_request, error_response = parse_meal_plan_request(model=BatchMealPlanRequest)
+        if error_response:
+            return error_response
         
-        logger.info("Meal plan generation completed successfully")
+        logger.info(f"Generating batch meal plan for {len(batch_request.meals)} meals: {', '.join(batch_request.meals)}")
+        
+        # A batch runs a meal planning crew per meal, so it weighs as much as that many requests
+        with admission.admit(client_id(), cost=len(batch_request.meals)), metrics.trace_request() as trace:
+            result = get_crew_service().generate_batch_meal_plan(batch_request)
+        timing = trace.to_dict()
+        
+        logger.info(f"Batch meal plan generation completed successfully ({timing['total_seconds']}s)")
         
         return jsonify({
             "status": "success",
-            "data": result,
+            "data": select_fields(result, request.args.get('fields')),
             "request_info": {
-                "meal_name": meal_request.meal_name,
-                "servings": meal_request.servings,
-                "budget": meal_request.budget,
-                "dietary_restrictions": meal_request.dietary_restrictions,
-                "cooking_skill": meal_request.cooking_skill
+                "meals": batch_request.meals,
+                "servings": batch_request.servings,
+                "budget": batch_request.budget,
+                "dietary_restrictions": batch_request.dietary_restrictions,
+                "cooking_skill": batch_request.cooking_skill,
+                "timing": timing
             }
         })
         
+    except AdmissionRejected as e:
+        logger.warning(f"Batch meal plan request rejected ({e.reason}): {str(e)}")
+        return admission_rejected(e)
+    except outbound.CircuitOpenError as e:
+        logger.error(f"Batch meal plan generation failed fast: {str(e)}")
+        return provider_unavailable(e)
     except Exception as e:
-        logger.error(f"Error generating meal plan: {str(e)}")
+        logger.error(f"Error generating batch meal plan: {str(e)}")
         return jsonify({"error": f"Internal server error: {str(e)}"}), 500
 
-@app.route('/api/meal-plans', methods=['GET'])
-def get_supported_meals():
-    """Get list of supported meal types (for frontend reference)"""
-    supported_meals = [
-        "Chicken Stir Fry",
-        "Paneer Butter Masala",
-        "Pasta Carbonara",
-        "Beef Tacos",
-        "Vegetarian Pizza",
-        "Salmon Teriyaki",
-        "Thai Green Curry",
-        "Mediterranean Bowl",
-        "Chicken Tikka Masala",
-        "Caesar Salad with Grilled Chicken"
-    ]
-    
+def format_sse(event, data):
+    return f"event: {event}\ndata: {dumps(data).decode('utf-8')}\n\n"
+
+@app.route('/api/meal-plan/stream', methods=['GET'])
+def stream_meal_plan():
+    """Generate a meal plan, streaming each task output as a Server-Sent Event as soon as it finishes.
+
+    Takes the MealPlanRequest fields as query parameters; dietary_restrictions
+    may be repeated or comma-separated. fields limits the data of the complete event.
+    """
+    restrictions = []
+    for value in request.args.getlist('dietary_restrictions'):
+        restrictions.extend(r.strip() for r in value.split(',') if r.strip())
+
+    body = {key: value for key, value in request.args.items() if key not in ('dietary_restrictions', 'fields')}
+    fields = request.args.get('fields')
+    body['dietary_restrictions'] = restrictions
+
+    meal_request, error_response = parse_meal_plan_request(body)
+    if error_response:
+        return error_response
+
+    # Admitted before the stream starts, so a rejection is still a plain 429; the worker releases it
+    admitted = ExitStack()
+    try:
+        admitted.enter_context(admit_request(meal_request))
+    except AdmissionRejected as e:
+        logger.warning(f"Streamed meal plan rejected ({e.reason}): {str(e)}")
+        return admission_rejected(e)
+
+    events = queue.Queue()
+
+    def on_task_complete(task_name, output, timing):
+        events.put(format_sse("task", {"task": task_name, "output": output, "timing": timing}))
+
+    def worker():
+        try:
+            result, cache_status, timing = run_meal_plan(meal_request, on_task_complete=on_task_complete)
+            events.put(format_sse("complete", {
+                "status": "success",
+                "data": select_fields(result, fields),
+                "request_info": build_request_info(meal_request, cache_status, timing, result)
+            }))
+        except outbound.CircuitOpenError as e:
+            logger.error(f"Streamed meal plan failed fast: {str(e)}")
+            events.put(format_sse("error", {"error": str(e), "provider": e.provider, "retry_after": round(e.retry_after)}))
+        except Exception as e:
+            logger.error(f"Error streaming meal plan: {str(e)}")
+            events.put(format_sse("error", {"error": f"Internal server error: {str(e)}"}))
+        finally:
+            admitted.close()
+            events.put(None)
+
+    logger.info(f"Streaming meal plan for: {meal_request.meal_name}")
+    threading.Thread(target=worker, daemon=True).start()
+
+    def generate():
+        while True:
+            try:
+                event = events.get(timeout=15)
+            except queue.Empty:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                return
+            yield event
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_meal_plan_job():
+    """Queue a meal plan generation and return a job id to poll"""
+    meal_request, error_response = parse_meal_plan_request()
+    if error_response:
+        return error_response
+
+    try:
+        if meal_request.cache == "bypass" or not plan_cache.contains(meal_request):
+            admission.check_quota(client_id())
+    except AdmissionRejected as e:
+        return admission_rejected(e)
+
+    try:
+        # request_key ignores the cache mode; a bypass must not be answered by an in-flight cached run
+        job_key = request_key(meal_request) + (":bypass" if meal_request.cache == "bypass" else "")
+        job, created = job_manager.submit(job_key, run_meal_plan_job, meal_request)
+    except QueueFullError as e:
+        response = jsonify({"error": str(e)})
+        response.headers['Retry-After'] = os.getenv('JOB_RETRY_AFTER_SECONDS', '30')
+        return response, 429
+
+    if created:
+        logger.info(f"Queued meal plan job {job.id} for: {meal_request.meal_name}")
+    else:
+        logger.info(f"Coalesced meal plan request onto in-flight job {job.id}")
+
+    response = jsonify({
+        "status": "accepted",
+        "data": job.to_dict()
+    })
+    response.headers['Location'] = f"/api/jobs/{job.id}"
+    return response, 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_meal_plan_job(job_id):
+    """Get the status, and once completed the result, of a meal plan job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+
+    data = job.to_dict()
+    if "result" in data:
+        data["result"] = {**data["result"], "data": select_fields(data["result"]["data"], request.args.get('fields'))}
+
     return jsonify({
         "status": "success",
-        "data": {
-            "supported_meals": supported_meals,
-            "cooking_skills": ["beginner", "intermediate", "advance"],
-            "common_dietary_restrictions": [
-                "vegetarian",
-                "vegan", 
-                "gluten-free",
-                "dairy-free",
-                "nut-free",
-                "low-carb",
-                "keto"
-            ]
-        }
+        "data": data
     })
 
-@app.route('/api/config', methods=['GET'])
-def get_config():
-    """Get API configuration status"""
+@app.route('/api/cache', methods=['GET'])
+def get_cache_stats():
+    """Get meal plan result cache, search cache and price index statistics.
+
+    Search and price stats are only included once the crew service is built;
+    this endpoint doesn't build it.
+    """
+    service = crew_service
+    data = {"plans": plan_cache.stats()}
+    if service is not None:
+        data["search"] = service.search_tool.stats()
+        data["prices"] = service.price_index.stats()
+    return jsonify({
+        "status": "success",
+        "data": data
+    })
+
+@app.route('/api/warmup', methods=['GET'])
+def get_warmup_status():
+    """Get catalog warm-up progress and how much of the catalog is cached"""
     return jsonify({
         "status": "success",
-        "data": {
-            "serper_configured": bool(os.getenv('SERPER_API_KEY')),
-            "anthropic_configured": bool(os.getenv('ANTHROPIC_API_KEY')),
-            "api_version": "1.0.0",
-            "supported_features": [
-                "meal_planning",
-                "shopping_list_generation",
-                "budget_analysis",
-                "leftover_management"
-            ]
-        }
+        "data": plan_warmer.status()
     })
 
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus metrics for the crew pipeline, tools and caches"""
+    return Response(metrics.REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/meal-plans', methods=['GET'])
+def get_supported_meals():
+    """Get list of supported meal types (for frontend reference)"""
+    return catalog_document.response()
+
+@app.route('/api/config', methods=['GET'])
+def get_config():
+    """Get API configuration status"""
+    return config_document.response()
+
+# Neither changes while the process runs, so they are built once and cached by clients
+catalog_document = StaticJSON(lambda: {
+    "status": "success",
+    "data": {
+        "supported_meals": SUPPORTED_MEALS,
+        "cooking_skills": COOKING_SKILLS,
+        "common_dietary_restrictions": COMMON_DIETARY_RESTRICTIONS
+    }
+}, max_age=int(os.getenv('CATALOG_MAX_AGE_SECONDS', 86400)))
+
+config_document = StaticJSON(lambda: {
+    "status": "success",
+    "data": {
+        "serper_configured": bool(os.getenv('SERPER_API_KEY')),
+        "anthropic_configured": bool(os.getenv('ANTHROPIC_API_KEY')),
+        "api_version": "1.0.0",
+        "supported_features": [
+            "meal_planning",
+            "shopping_list_generation",
+            "budget_analysis",
+            "leftover_management",
+            "async_jobs",
+            "streaming",
+            "batch_meal_planning",
+            "llm_routing",
+            "field_selection",
+            "response_compression"
+        ],
+        "llm_routing": llm_router.describe()
+    }
+}, max_age=int(os.getenv('CONFIG_MAX_AGE_SECONDS', 300)))
+
 @app.errorhandler(404)
 def not_found(error):
     return jsonify({"error": "Endpoint not found"}), 404
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Offline comparison of planning N meals as N independent runs against one batch run.
+
+Both sides use the fake LLM and fake Serper tool from fakes.py. The
+independent runs are issued concurrently, like a client firing one
+/api/meal-plan request per meal.
+
+Usage: python benchmarks/bench_batch.py [--meals 7] [--llm-latency 0.2] [--json results.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+# Each service learns ingredient sections in its own in-memory store
+os.environ.setdefault("TAXONOMY_LEARNED_PATH", ":memory:")
+os.environ.setdefault("CHECKPOINT_PATH", ":memory:")
+os.environ.setdefault("PRICE_REFRESH_INTERVAL", "0")
+
+from crew_service import AlexCrewService
+from fakes import FakeLLM, FakeSerperTool
+from load_test import MEALS
+from models import BatchMealPlanRequest, MealPlanRequest
+from price_index import PriceIndex
+
+
+def measure(label, service, run):
+    llm, search_tool = service.llm, service.search_tool
+    llm_before, search_before = llm.stats(), search_tool.external_calls
+    started = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - started
+    llm_after = llm.stats()
+    return {
+        "label": label,
+        "seconds": round(elapsed, 3),
+        "llm_calls": llm_after["calls"] - llm_before["calls"],
+        "llm_prompt_tokens": llm_after["prompt_tokens"] - llm_before["prompt_tokens"],
+        "search_calls": search_tool.external_calls - search_before,
+    }
+
+
+def build_service(args):
+    # Fresh in-memory caches per side, so neither warms the other
+    return AlexCrewService(
+        llm=FakeLLM(latency=args.llm_latency),
+        search_tool=FakeSerperTool(latency=args.search_latency),
+        price_index=PriceIndex(":memory:"),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meals", type=int, default=7, help="Number of meals to plan (1-7)")
+    parser.add_argument("--servings", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds per fake LLM call")
+    parser.add_argument("--search-latency", type=float, default=0.1, help="Seconds per fake Serper call")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    meals = MEALS[:max(1, min(args.meals, 7))]
+    total_budget = 15 * len(meals)
+
+    independent_service = build_service(args)
+
+    def independent():
+        requests = [
+            MealPlanRequest(meal_name=meal, servings=args.servings, budget="$15")
+            for meal in meals
+        ]
+        with ThreadPoolExecutor(max_workers=len(requests)) as executor:
+            list(executor.map(independent_service.generate_meal_plan, requests))
+
+    batch_service = build_service(args)
+
+    def batch():
+        batch_service.generate_batch_meal_plan(
+            BatchMealPlanRequest(meals=meals, servings=args.servings, budget=f"${total_budget}")
+        )
+
+    results = [
+        measure(f"{len(meals)} independent runs", independent_service, independent),
+        measure("one batch run", batch_service, batch),
+    ]
+
+    print(f"{'run':<22} {'seconds':>10} {'LLM calls':>10} {'prompt tokens':>14} {'searches':>10}")
+    for result in results:
+        print(
+            f"{result['label']:<22} {result['seconds']:>10} {result['llm_calls']:>10} "
+            f"{result['llm_prompt_tokens']:>14} {result['search_calls']:>10}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
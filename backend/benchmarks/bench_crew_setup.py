@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of per-request crew setup overhead.
+
+Compares building agents, tasks and crews for every request (the previous
+behaviour) against checking a pre-built template out of the crew pool.
+No LLM or search calls are made.
+
+Usage: python benchmarks/bench_crew_setup.py [--iterations 50] [--json results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crew_service import AlexCrewService, CrewTemplate
+
+
+def measure(label, setup, iterations):
+    """Time setup() and record the memory it allocates per call"""
+    # Warm up imports and lazily created state outside the measurement
+    setup()
+
+    durations = []
+    allocated = []
+    peaks = []
+    for _ in range(iterations):
+        tracemalloc.start()
+        started = time.perf_counter()
+        setup()
+        durations.append(time.perf_counter() - started)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        allocated.append(current)
+        peaks.append(peak)
+
+    return {
+        "label": label,
+        "iterations": iterations,
+        "mean_ms": round(statistics.mean(durations) * 1000, 3),
+        "p50_ms": round(statistics.median(durations) * 1000, 3),
+        "max_ms": round(max(durations) * 1000, 3),
+        "retained_kib": round(statistics.mean(allocated) / 1024, 1),
+        "peak_kib": round(statistics.mean(peaks) / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    service = AlexCrewService()
+
+    def per_request_build():
+        CrewTemplate(service)
+
+    def pooled_checkout():
+        with service.crew_pool.checkout():
+            pass
+
+    results = [
+        measure("per-request build", per_request_build, args.iterations),
+        measure("pooled template", pooled_checkout, args.iterations),
+    ]
+
+    print(f"{'setup':<20} {'mean ms':>10} {'p50 ms':>10} {'max ms':>10} {'retained KiB':>14} {'peak KiB':>10}")
+    for result in results:
+        print(
+            f"{result['label']:<20} {result['mean_ms']:>10} {result['p50_ms']:>10} {result['max_ms']:>10} "
+            f"{result['retained_kib']:>14} {result['peak_kib']:>10}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
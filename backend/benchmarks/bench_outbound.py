@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Offline comparison of Serper calls through the outbound client against plain SerperDevTool.
+
+Runs against the local stub server from stub_serper.py, which fails a share
+of requests with 429s. Reports, for the same searches, how many succeed, how
+many HTTP requests and connections they take and their latency. Then takes
+the stub down and shows the circuit breaker failing calls fast instead of
+every call waiting out its retries.
+
+Usage: python benchmarks/bench_outbound.py [--searches 200] [--concurrency 8] [--fail-rate 0.1] [--json results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("SERPER_API_KEY", "stub")
+
+from crewai_tools import SerperDevTool
+from outbound import OutboundClient
+from search_cache import CachedSerperTool
+from stub_serper import StubSerperServer
+
+
+def run_searches(label, search, server, args):
+    server.reset()
+
+    def timed(i):
+        started = time.perf_counter()
+        try:
+            search(f"chicken stir fry variation {i}")
+            ok = True
+        except Exception:
+            ok = False
+        return ok, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(timed, range(args.searches)))
+    elapsed = time.perf_counter() - started
+    latencies = sorted(duration for _, duration in results)
+    return {
+        "label": label,
+        "searches": args.searches,
+        "succeeded": sum(1 for ok, _ in results if ok),
+        "http_requests": server.requests,
+        "connections": len(server.connections),
+        "p50_seconds": round(statistics.median(latencies), 4),
+        "p99_seconds": round(latencies[int(0.99 * (len(latencies) - 1))], 4),
+        "wall_seconds": round(elapsed, 3),
+    }
+
+
+def client(args, **overrides):
+    settings = {
+        "rate_per_second": 0,
+        "max_attempts": args.max_attempts,
+        "backoff_base_seconds": args.backoff,
+        "backoff_max_seconds": args.backoff * 8,
+        "pool_size": args.concurrency,
+        **overrides,
+    }
+    return OutboundClient("serper", **settings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--searches", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds per stub response")
+    parser.add_argument("--fail-rate", type=float, default=0.1, help="Share of stub responses that are 429s")
+    parser.add_argument("--max-attempts", type=int, default=3)
+    parser.add_argument("--backoff", type=float, default=0.02, help="Base backoff seconds")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    server = StubSerperServer(latency=args.latency, fail_rate=args.fail_rate)
+    base_url = server.start()
+
+    direct = SerperDevTool(base_url=base_url)
+    pooled = CachedSerperTool(cache_path=":memory:", base_url=base_url)
+    pooled._client = client(args, failure_threshold=args.searches)
+
+    results = [
+        run_searches("SerperDevTool", lambda query: direct._make_api_request(query, "search"), server, args),
+        run_searches("outbound client", lambda query: pooled._make_api_request(query, "search"), server, args),
+    ]
+
+    # Outage: every call fails; the breaker opens after failure_threshold of them
+    server.down = True
+    pooled._client = client(args, failure_threshold=5, reset_seconds=60)
+    outage = run_searches("outbound, provider down", lambda query: pooled._make_api_request(query, "search"), server, args)
+    outage["breaker"] = pooled._client.breaker.state
+    results.append(outage)
+    server.shutdown()
+
+    print(f"{'client':<24} {'ok':>5} {'requests':>9} {'conns':>6} {'p50 s':>8} {'p99 s':>8} {'wall s':>7}")
+    for result in results:
+        print(
+            f"{result['label']:<24} {result['succeeded']:>5} {result['http_requests']:>9} {result['connections']:>6} "
+            f"{result['p50_seconds']:>8} {result['p99_seconds']:>8} {result['wall_seconds']:>7}"
+        )
+    print(
+        f"\nWith the provider down, {outage['http_requests']} of {outage['searches']} searches reached it "
+        f"before the circuit opened (breaker: {outage['breaker']})"
+    )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
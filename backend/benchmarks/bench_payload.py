@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Offline comparison of meal plan response payloads: size and serialization cost.
+
+Plans a meal with the fake LLM and fake Serper tool from fakes.py, then
+reports for the full response and a fields= selection the bytes on the wire
+uncompressed, gzipped and brotli-compressed, and the time to serialize the
+response with the standard json module against orjson and to compress it.
+
+Usage: python benchmarks/bench_payload.py [--meal "Chicken Stir Fry"] [--repeat 200] [--json results.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("TAXONOMY_LEARNED_PATH", ":memory:")
+os.environ.setdefault("CHECKPOINT_PATH", ":memory:")
+os.environ.setdefault("PRICE_REFRESH_INTERVAL", "0")
+
+from crew_service import AlexCrewService
+from fakes import FakeLLM, FakeSerperTool
+from models import MealPlanRequest
+from price_index import PriceIndex
+from responses import compress, dumps, select_fields
+
+# What the results page renders; the summary is not repeated under task_outputs
+PAGE_FIELDS = "summary,task_outputs.meal_planning,task_outputs.shopping,task_outputs.budget,task_outputs.leftover"
+
+
+def timed(fn, repeat):
+    """Mean milliseconds per call of fn"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def measure(label, payload, repeat):
+    body = dumps(payload)
+    return {
+        "label": label,
+        "bytes": len(body),
+        "gzip_bytes": len(compress(body, "gzip")),
+        "br_bytes": len(compress(body, "br")),
+        # What jsonify did before: sorted keys, standard json module
+        "json_ms": round(timed(lambda: json.dumps(payload, sort_keys=True).encode("utf-8"), repeat), 4),
+        "orjson_ms": round(timed(lambda: dumps(payload), repeat), 4),
+        "gzip_ms": round(timed(lambda: compress(body, "gzip"), repeat), 4),
+        "br_ms": round(timed(lambda: compress(body, "br"), repeat), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meal", default="Chicken Stir Fry")
+    parser.add_argument("--servings", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=200, help="Timed repetitions of each operation")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    service = AlexCrewService(
+        llm=FakeLLM(latency=0), search_tool=FakeSerperTool(latency=0), price_index=PriceIndex(":memory:")
+    )
+    result = service.generate_meal_plan(MealPlanRequest(meal_name=args.meal, servings=args.servings, budget="$30"))
+
+    results = [
+        measure("full response", {"status": "success", "data": result}, args.repeat),
+        measure("fields=<results page>", {"status": "success", "data": select_fields(result, PAGE_FIELDS)}, args.repeat),
+    ]
+
+    print(f"{'payload':<22} {'bytes':>7} {'gzip':>6} {'br':>6} {'json ms':>8} {'orjson ms':>10} {'gzip ms':>8} {'br ms':>7}")
+    for r in results:
+        print(
+            f"{r['label']:<22} {r['bytes']:>7} {r['gzip_bytes']:>6} {r['br_bytes']:>6} {r['json_ms']:>8} "
+            f"{r['orjson_ms']:>10} {r['gzip_ms']:>8} {r['br_ms']:>7}"
+        )
+    full, page = results
+    print(
+        f"\nThe results page needs {page['br_bytes']} brotli bytes instead of {full['bytes']} "
+        f"({full['bytes'] / page['br_bytes']:.1f}x smaller); orjson serializes "
+        f"{full['json_ms'] / full['orjson_ms']:.1f}x faster than json"
+    )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of semantic plan cache lookups.
+
+Fills a SemanticPlanIndex with synthetic cached requests and times find()
+for near-duplicate meal names (typos, punctuation, plurals) and for names
+that aren't cached at all.
+
+Usage: python benchmarks/bench_semantic_cache.py [--entries 100000] [--unique-names 100000] [--json results.json]
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from semantic_cache import SemanticPlanIndex
+
+STYLES = ["", "Spicy", "Smoky", "Creamy", "Crispy", "Garlic", "Honey", "Lemon", "Herb", "Sweet and Sour",
+          "Korean", "Thai", "Indian", "Mexican", "Italian", "Greek", "Cajun", "Teriyaki", "Sesame", "Coconut"]
+PROTEINS = ["Chicken", "Beef", "Pork", "Shrimp", "Salmon", "Tofu", "Paneer", "Lamb", "Turkey", "Chickpea",
+            "Mushroom", "Lentil", "Cod", "Tuna", "Duck", "Egg", "Bean", "Halloumi", "Tempeh", "Sausage"]
+DISHES = ["Stir Fry", "Tacos", "Curry", "Pasta", "Salad", "Bowl", "Soup", "Stew", "Burger", "Wrap",
+          "Fried Rice", "Noodles", "Pizza", "Casserole", "Skewers", "Sandwich", "Risotto", "Chili", "Pie", "Bake",
+          "Masala", "Tikka", "Kebab", "Quesadilla", "Burrito", "Ramen", "Pho", "Lasagna", "Gnocchi", "Frittata"]
+SIDES = ["", "with Rice", "with Naan", "with Salad", "with Fries", "with Quinoa", "with Couscous", "with Greens",
+         "with Potatoes", "with Slaw", "with Pita", "with Polenta", "with Noodles", "with Beans", "with Corn",
+         "with Avocado", "with Kimchi", "with Pickles", "with Chutney", "with Yogurt"]
+
+
+def meal_names(count):
+    names = (" ".join(part for part in combo if part) for combo in itertools.product(STYLES, PROTEINS, DISHES, SIDES))
+    return list(itertools.islice(names, count))
+
+
+def near_duplicate(name, rng):
+    """A plausible re-typing of a meal name"""
+    variant = rng.choice(["case", "punctuation", "plural", "typo"])
+    if variant == "case":
+        return name.lower()
+    if variant == "punctuation":
+        return name.replace(" ", "-", 1)
+    if variant == "plural":
+        return name + "s"
+    i = rng.randrange(1, len(name) - 1)
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+
+def request(meal_name, servings=4):
+    return SimpleNamespace(
+        meal_name=meal_name, servings=servings, budget="$30", dietary_restrictions=[], cooking_skill="beginner"
+    )
+
+
+def time_lookups(index, queries):
+    durations = []
+    found = 0
+    for query in queries:
+        started = time.perf_counter()
+        candidates = index.find(query)
+        durations.append(time.perf_counter() - started)
+        found += bool(candidates)
+    durations.sort()
+    return {
+        "queries": len(queries),
+        "found": found,
+        "mean_us": round(statistics.mean(durations) * 1e6, 1),
+        "p50_us": round(durations[len(durations) // 2] * 1e6, 1),
+        "p99_us": round(durations[int(len(durations) * 0.99)] * 1e6, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=100000, help="Cached requests in the index")
+    parser.add_argument("--unique-names", type=int, default=100000, help="Distinct meal names among them")
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    names = meal_names(min(args.unique_names, args.entries))
+    index = SemanticPlanIndex()
+
+    started = time.perf_counter()
+    for i in range(args.entries):
+        # Repeats of a name are cached for other servings, at the same budget per serving
+        servings = 4 + i // len(names) % 5
+        index.add(f"key-{i}", {
+            "meal_name": names[i % len(names)],
+            "servings": servings,
+            "budget": 7.5 * servings,
+            "dietary_restrictions": [],
+            "cooking_skill": "beginner",
+        })
+    build_seconds = time.perf_counter() - started
+
+    results = {
+        "entries": args.entries,
+        "unique_names": len(names),
+        "build_seconds": round(build_seconds, 2),
+        "near_duplicates": time_lookups(
+            index, [request(near_duplicate(rng.choice(names), rng)) for _ in range(args.queries)]
+        ),
+        "uncached": time_lookups(
+            index, [request(f"Grandma's Secret Recipe {i}") for i in range(args.queries)]
+        ),
+    }
+
+    print(f"{results['entries']} entries, {results['unique_names']} distinct meal names, built in {results['build_seconds']}s")
+    print(f"{'queries':<18} {'found':>8} {'mean us':>10} {'p50 us':>10} {'p99 us':>10}")
+    for label in ("near_duplicates", "uncached"):
+        row = results[label]
+        print(f"{label:<18} {row['found']:>8} {row['mean_us']:>10} {row['p50_us']:>10} {row['p99_us']:>10}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark for the Alex Meal Planner API.
+
+Each run starts a fresh interpreter and times importing app, the first
+/health response, and building the crew service (importing crewai and
+pre-building the crew pool), which now happens on first use. A -X importtime
+run breaks the total down by top-level package.
+
+Append runs to a history file to track startup time across revisions.
+
+Usage:
+    python benchmarks/bench_startup.py --runs 3 --history startup_history.jsonl
+    python benchmarks/bench_startup.py --output startup.json --compare baseline.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter; started is the parent's clock just before spawning it
+CHILD_SCRIPT = """
+import json, sys, time
+started = float(sys.argv[1])
+import app
+imported = time.time()
+response = app.app.test_client().get('/health')
+assert response.status_code == 200
+first_response = time.time()
+app.get_crew_service()
+service_ready = time.time()
+print(json.dumps({
+    "import_app": imported - started,
+    "first_health_response": first_response - started,
+    "crew_service_build": service_ready - first_response,
+    "total_to_first_plan_ready": service_ready - started,
+}))
+"""
+
+
+def child_env(cache_dir):
+    env = dict(os.environ)
+    # Keys only need to be present; nothing is called
+    env.setdefault("SERPER_API_KEY", "benchmark")
+    env.setdefault("GEMINI_API_KEY", "benchmark")
+    env.setdefault("OTEL_SDK_DISABLED", "true")
+    env.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+    env["CREW_SERVICE_PRELOAD"] = "lazy"
+    env["PRICE_REFRESH_INTERVAL"] = "0"
+    env["PLAN_CACHE_PATH"] = os.path.join(cache_dir, "plans.sqlite3")
+    env["SEARCH_CACHE_PATH"] = os.path.join(cache_dir, "search.sqlite3")
+    env["PRICE_INDEX_PATH"] = os.path.join(cache_dir, "prices.sqlite3")
+    env["TAXONOMY_LEARNED_PATH"] = os.path.join(cache_dir, "taxonomy.sqlite3")
+    return env
+
+
+def timed_run(env):
+    output = subprocess.check_output(
+        [sys.executable, "-c", CHILD_SCRIPT, repr(time.time())],
+        cwd=BACKEND_DIR, env=env, stderr=subprocess.DEVNULL, text=True
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def import_breakdown(env, top=15):
+    """Self import time per top-level package while importing app and building the crew service"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app; app.get_crew_service()"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+    ranked = sorted(packages.items(), key=lambda item: -item[1])
+    return {package: round(us / 1e6, 3) for package, us in ranked[:top]}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def run(args):
+    with tempfile.TemporaryDirectory(prefix="alex-startup-") as cache_dir:
+        env = child_env(cache_dir)
+        runs = [timed_run(env) for _ in range(args.runs)]
+        breakdown = import_breakdown(env)
+
+    return {
+        "label": args.label,
+        "revision": git_revision(),
+        "timestamp": time.time(),
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "results": {
+            metric: round(statistics.median(run[metric] for run in runs), 3)
+            for metric in runs[0]
+        },
+        "import_seconds_by_package": breakdown,
+    }
+
+
+def print_summary(summary, baseline=None):
+    print(f"\n=== {summary['label']} (median of {summary['runs']} runs, revision {summary['revision']}) ===")
+    for name, value in summary["results"].items():
+        line = f"  {name:<28} {value:>8.3f}s"
+        previous = baseline and baseline["results"].get(name)
+        if previous:
+            line += f"   (baseline {previous:.3f}s, {(value - previous) / previous * 100:+.1f}%)"
+        print(line)
+
+    print("\n  Import time by package (self time, app + crew service)")
+    for package, seconds in summary["import_seconds_by_package"].items():
+        print(f"    {package:<26} {seconds:>8.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to time")
+    parser.add_argument("--label", default="startup")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--history", help="Append the results as a JSON line to this file")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    args = parser.parse_args()
+
+    summary = run(args)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_summary(summary, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.history:
+        with open(args.history, "a") as f:
+            f.write(json.dumps(summary) + "\n")
+        print(f"\nResults appended to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
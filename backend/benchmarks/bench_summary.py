@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Offline comparison of the rendered summary against the LLM report compiler.
+
+Plans the same meals once with each summary mode, using the fake LLM and
+fake Serper tool from fakes.py, and reports end-to-end and summary step
+latency and the LLM calls and tokens each mode spends. The fake LLM's
+latency is per call, so the gap grows with --llm-latency.
+
+Usage: python benchmarks/bench_summary.py [--meals 5] [--llm-latency 0.5] [--json results.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("TAXONOMY_LEARNED_PATH", ":memory:")
+os.environ.setdefault("CHECKPOINT_PATH", ":memory:")
+os.environ.setdefault("PRICE_REFRESH_INTERVAL", "0")
+
+from crew_service import AlexCrewService
+from fakes import FakeLLM, FakeSerperTool
+from load_test import MEALS
+from models import MealPlanRequest
+from price_index import PriceIndex
+
+
+def measure(label, args, meals, llm_summary):
+    # Fresh in-memory caches per mode, so neither warms the other
+    service = AlexCrewService(
+        llm=FakeLLM(latency=args.llm_latency),
+        search_tool=FakeSerperTool(latency=args.search_latency),
+        price_index=PriceIndex(":memory:"),
+    )
+    before = service.llm.stats()
+    latencies, summary_latencies = [], []
+    for meal in meals:
+        started = time.perf_counter()
+        result = service.generate_meal_plan(
+            MealPlanRequest(meal_name=meal, servings=args.servings, budget="$30", llm_summary=llm_summary)
+        )
+        latencies.append(time.perf_counter() - started)
+        summary_latencies.append(result["timings"]["tasks"]["summary"]["duration_seconds"])
+    after = service.llm.stats()
+    return {
+        "label": label,
+        "plans": len(meals),
+        "p50_seconds": round(statistics.median(latencies), 3),
+        "summary_p50_seconds": round(statistics.median(summary_latencies), 4),
+        "llm_calls_per_plan": round((after["calls"] - before["calls"]) / len(meals), 2),
+        "prompt_tokens_per_plan": round((after["prompt_tokens"] - before["prompt_tokens"]) / len(meals)),
+        "completion_tokens_per_plan": round((after["completion_tokens"] - before["completion_tokens"]) / len(meals)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--meals", type=int, default=5, help="Number of meals to plan with each mode")
+    parser.add_argument("--servings", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds per fake LLM call")
+    parser.add_argument("--search-latency", type=float, default=0.1, help="Seconds per fake Serper call")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    meals = MEALS[:max(1, args.meals)]
+    results = [
+        measure("llm summary", args, meals, llm_summary=True),
+        measure("rendered summary", args, meals, llm_summary=False),
+    ]
+
+    print(f"{'summary':<18} {'p50 s':>8} {'summary s':>10} {'LLM calls':>10} {'prompt tok':>11} {'compl tok':>10}")
+    for result in results:
+        print(
+            f"{result['label']:<18} {result['p50_seconds']:>8} {result['summary_p50_seconds']:>10} "
+            f"{result['llm_calls_per_plan']:>10} {result['prompt_tokens_per_plan']:>11} "
+            f"{result['completion_tokens_per_plan']:>10}"
+        )
+    llm, rendered = results
+    print(
+        f"\nRendering saves {llm['p50_seconds'] - rendered['p50_seconds']:.3f}s per plan (p50) and "
+        f"{llm['prompt_tokens_per_plan'] - rendered['prompt_tokens_per_plan']} prompt tokens per plan"
+    )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
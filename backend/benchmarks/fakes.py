@@ -0,0 +1,241 @@
+"""
+Deterministic stand-ins for the Gemini LLM and the Serper search tool.
+
+They return canned MealPlan / GroceryShoppingPlan / BudgetAdvice JSON and text answers
+after a configurable artificial latency, so the crew pipeline can be
+benchmarked offline without API keys.
+"""
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any
+from crewai.llms.base_llm import BaseLLM
+from pydantic import PrivateAttr
+from search_cache import CachedSerperTool, is_price_query
+
+CANNED_INGREDIENTS = [
+    "1.5 lbs boneless chicken breast",
+    "2 cups broccoli florets",
+    "1 red bell pepper",
+    "3 tbsp soy sauce",
+    "2 cloves garlic",
+    "1 tbsp fresh ginger",
+    "2 cups jasmine rice",
+    "2 tbsp vegetable oil",
+    "1 tsp toasted sesame seeds",
+]
+
+CANNED_TEXT = {
+    "Budget Advisor": (
+        "## Budget Analysis\n\nEstimated total: $24-28, within budget.\n\n"
+        "- Buy chicken thighs instead of breast to save about $3\n"
+        "- Store-brand soy sauce and rice are just as good\n"
+    ),
+    "Leftover Management Specialist": (
+        "## Leftover Ideas\n\n1. Fried rice with leftover chicken and vegetables\n"
+        "2. Stir fry wraps for lunch\n\nStore cooked rice in an airtight container for up to 4 days."
+    ),
+    "Report Compiler": (
+        "# Your Meal Plan\n\nA complete guide combining the recipe, shopping list, "
+        "budget analysis and leftover suggestions."
+    ),
+}
+
+# crewai appends the upstream task outputs after this marker; the output
+# format instructions for the current task come before it
+CONTEXT_MARKER = "This is the context you're working with:"
+
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token)"""
+    return max(1, len(text) // 4)
+
+
+def canned_meal_plan(meal_name="Chicken Stir Fry", servings=4):
+    return {
+        "meal_name": meal_name,
+        "difficulty_level": "Easy",
+        "servings": servings,
+        "researched_ingredients": list(CANNED_INGREDIENTS),
+    }
+
+
+def canned_shopping_plan(meal_name="Chicken Stir Fry", servings=4, meal_names=None):
+    """Shopping plan for one meal; given several meal_names, every item is
+    listed once per meal, like an LLM that didn't merge the lists"""
+    meal_names = meal_names or [meal_name]
+    plan = {
+        "total_budget": "$30",
+        "meal_plans": [canned_meal_plan(name, servings) for name in meal_names],
+        "shopping_sections": [
+            {
+                "section_name": "Meat",
+                "items": [
+                    {"name": "Chicken breast", "quantity": "1.5 lbs", "estimated_price": "$6-8", "category": "Meat"},
+                ],
+                "estimated_total": "$6-8",
+            },
+            {
+                "section_name": "Produce",
+                "items": [
+                    {"name": "Broccoli", "quantity": "2 cups", "estimated_price": "$2-3", "category": "Produce"},
+                    {"name": "Red bell pepper", "quantity": "1", "estimated_price": "$1-2", "category": "Produce"},
+                    {"name": "Garlic", "quantity": "2 cloves", "estimated_price": "$0.50", "category": "Produce"},
+                    {"name": "Ginger", "quantity": "1 tbsp", "estimated_price": "$1", "category": "Produce"},
+                ],
+                "estimated_total": "$4.50-6.50",
+            },
+            {
+                "section_name": "Pantry",
+                "items": [
+                    {"name": "Soy sauce", "quantity": "3 tbsp", "estimated_price": "$3", "category": "Pantry"},
+                    {"name": "Jasmine rice", "quantity": "2 cups", "estimated_price": "$2-3", "category": "Pantry"},
+                    {"name": "Vegetable oil", "quantity": "2 tbsp", "estimated_price": "$3", "category": "Pantry"},
+                ],
+                "estimated_total": "$8-9",
+            },
+        ],
+        "shopping_tips": ["Buy rice in bulk", "Check the weekly specials for chicken"],
+    }
+    for section in plan["shopping_sections"]:
+        section["items"] = section["items"] * len(meal_names)
+    return plan
+
+
+def canned_budget_advice():
+    return {
+        "analysis": CANNED_TEXT["Budget Advisor"],
+        "money_saving_tips": ["Buy store-brand pantry staples", "Check the weekly specials for chicken"],
+    }
+
+
+def canned_search_results(search_query, search_type="search"):
+    """A Serper response with one organic result, quoting prices for price queries"""
+    if is_price_query(search_query):
+        snippet = "Prices this week: $3.99/lb at most stores, $4.49 per lb for organic."
+    else:
+        snippet = "Ingredients: " + ", ".join(CANNED_INGREDIENTS)
+    return {
+        "searchParameters": {"q": search_query, "type": search_type},
+        "organic": [
+            {
+                "title": f"Easy {search_query.title()}",
+                "link": "https://example.com/recipe",
+                "snippet": snippet,
+                "position": 1,
+            }
+        ],
+        "credits": 1,
+    }
+
+
+class FakeLLM(BaseLLM):
+    """LLM stub returning canned ReAct-formatted answers after an artificial latency"""
+
+    def __init__(self, latency=0.5, jitter=0.0, seed=0, search_first=True):
+        super().__init__(model="fake/benchmark-llm", temperature=0.0)
+        self.latency = latency
+        self.jitter = jitter
+        self.search_first = search_first
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, from_task=None, from_agent=None):
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        prompt = "\n".join(str(message.get("content", "")) for message in messages)
+
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+        started = time.time()
+        time.sleep(delay)
+
+        already_searched = any(message.get("role") == "assistant" for message in messages)
+        response = self._respond(prompt, already_searched)
+        prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(response)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+
+        # Report usage the way litellm does, so crew token metrics work offline
+        usage = SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, prompt_tokens_details=None)
+        for callback in callbacks or []:
+            if hasattr(callback, "log_success_event"):
+                callback.log_success_event(kwargs={}, response_obj={"usage": usage}, start_time=started, end_time=time.time())
+        return response
+
+    def stats(self):
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+            }
+
+    def _respond(self, prompt, already_searched):
+        # Agents with tools search once before answering, like the real crew
+        has_tools = "You ONLY have access to the following tools" in prompt
+        if self.search_first and has_tools and not already_searched:
+            query = self._meal_name(prompt) + " recipe"
+            return (
+                "Thought: I should research this first\n"
+                "Action: Search the internet with Serper\n"
+                f"Action Input: {json.dumps({'search_query': query})}"
+            )
+
+        task_prompt = prompt.split(CONTEXT_MARKER, 1)[0]
+        if "money_saving_tips" in task_prompt:
+            answer = json.dumps(canned_budget_advice())
+        elif "assignments" in task_prompt:
+            items = re.findall(r"^- (.+)$", task_prompt.split("Items:", 1)[-1], re.MULTILINE)
+            answer = json.dumps({"assignments": [{"name": item, "section": "Pantry"} for item in items]})
+        elif "shopping_sections" in task_prompt:
+            answer = json.dumps(canned_shopping_plan(self._meal_name(prompt), meal_names=self._meal_names(prompt)))
+        elif "researched_ingredients" in task_prompt:
+            answer = json.dumps(canned_meal_plan(self._meal_name(prompt)))
+        else:
+            role = next((role for role in CANNED_TEXT if role in prompt), "Report Compiler")
+            answer = CANNED_TEXT[role]
+
+        return f"Thought: I now can give a great answer\nFinal Answer: {answer}"
+
+    @staticmethod
+    def _meal_names(prompt):
+        # Batch tasks name every meal: "meal plans for 'A', 'B', 'C'"
+        match = re.search(r"meal plans for ((?:'[^']+'(?:, )?)+)", prompt)
+        return re.findall(r"'([^']+)'", match.group(1)) if match else None
+
+    @staticmethod
+    def _meal_name(prompt):
+        match = re.search(r"(?:best|the|for) '([^']+)'", prompt)
+        return match.group(1) if match else "Chicken Stir Fry"
+
+
+class FakeSerperTool(CachedSerperTool):
+    """Serper stub with canned results; the caching layer in front of it is the real one"""
+
+    _latency: float = PrivateAttr(default=0.2)
+    _calls: int = PrivateAttr(default=0)
+    _calls_lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def __init__(self, latency=0.2, cache_path=":memory:", **kwargs):
+        super().__init__(cache_path=cache_path, **kwargs)
+        self._latency = latency
+
+    def _make_api_request(self, search_query, search_type):
+        time.sleep(self._latency)
+        with self._calls_lock:
+            self._calls += 1
+        return canned_search_results(search_query, search_type)
+
+    @property
+    def external_calls(self):
+        with self._calls_lock:
+            return self._calls
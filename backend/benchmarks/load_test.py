@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Offline load test for the Alex Meal Planner API.
+
+Serves the Flask app on a local port with the crew wired to the fake LLM and
+fake Serper tool from fakes.py, drives POST /api/meal-plan at the configured
+concurrency and reports latency percentiles, throughput and peak RSS.
+
+Usage:
+    python benchmarks/load_test.py --requests 40 --concurrency 8 --output run.json
+    python benchmarks/load_test.py --compare run.json
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+MEALS = [
+    "Chicken Stir Fry",
+    "Paneer Butter Masala",
+    "Pasta Carbonara",
+    "Beef Tacos",
+    "Vegetarian Pizza",
+    "Salmon Teriyaki",
+    "Thai Green Curry",
+    "Mediterranean Bowl",
+    "Chicken Tikka Masala",
+    "Caesar Salad with Grilled Chicken",
+]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def peak_rss_mib():
+    # ru_maxrss is reported in KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def build_app(args):
+    """Import the Flask app with its crew service replaced by the offline fakes"""
+    # Keys only need to be present; the fakes never use them
+    os.environ.setdefault("SERPER_API_KEY", "benchmark")
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+    os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+    os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+    cache_dir = tempfile.mkdtemp(prefix="alex-bench-")
+    os.environ["PLAN_CACHE_PATH"] = os.path.join(cache_dir, "plans.sqlite3")
+    os.environ["PRICE_INDEX_PATH"] = os.path.join(cache_dir, "prices.sqlite3")
+    os.environ["PRICE_REFRESH_INTERVAL"] = "0"
+    os.environ["TAXONOMY_LEARNED_PATH"] = os.path.join(cache_dir, "taxonomy.sqlite3")
+    os.environ["CHECKPOINT_PATH"] = os.path.join(cache_dir, "checkpoints.sqlite3")
+    # Every simulated client shares one IP; measure the service, not its per-client quota
+    os.environ.setdefault("ADMISSION_RATE_PER_MINUTE", "0")
+    os.environ.setdefault("ADMISSION_MAX_CONCURRENT", str(args.concurrency))
+    # The fake service is installed below; don't let a real one be built in the background
+    os.environ["CREW_SERVICE_PRELOAD"] = "lazy"
+
+    import app as app_module
+    from crew_service import AlexCrewService
+    from fakes import FakeLLM, FakeSerperTool
+
+    llm = FakeLLM(latency=args.llm_latency, jitter=args.llm_jitter, seed=args.seed)
+    search_tool = FakeSerperTool(latency=args.search_latency)
+    app_module.crew_service = AlexCrewService(llm=llm, search_tool=search_tool)
+    return app_module.app, llm, search_tool
+
+
+def serve(app):
+    from werkzeug.serving import make_server
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def send_request(base_url, index, args):
+    body = {
+        "meal_name": MEALS[index % args.distinct_meals],
+        "servings": 4,
+        "budget": "$30",
+        "dietary_restrictions": [],
+        "cooking_skill": "beginner",
+        "cache": "default" if args.use_cache else "bypass",
+    }
+    request = urllib.request.Request(
+        f"{base_url}/api/meal-plan",
+        data=json.dumps(body).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=args.timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except Exception:
+        status = None
+    return time.perf_counter() - started, status
+
+
+def run(args):
+    app, llm, search_tool = build_app(args)
+    server, base_url = serve(app)
+
+    try:
+        # One warm-up request so lazy initialization isn't counted
+        send_request(base_url, 0, args)
+        llm_before = llm.stats()
+        search_before = search_tool.external_calls
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            results = list(executor.map(lambda i: send_request(base_url, i, args), range(args.requests)))
+        elapsed = time.perf_counter() - started
+    finally:
+        server.shutdown()
+
+    latencies = [latency for latency, status in results if status == 200]
+    errors = sum(1 for _, status in results if status != 200)
+    llm_after = llm.stats()
+
+    summary = {
+        "label": args.label,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_revision": git_revision(),
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "distinct_meals": args.distinct_meals,
+            "use_cache": args.use_cache,
+            "llm_latency": args.llm_latency,
+            "llm_jitter": args.llm_jitter,
+            "search_latency": args.search_latency,
+        },
+        "results": {
+            "successful": len(latencies),
+            "errors": errors,
+            "elapsed_seconds": round(elapsed, 3),
+            "requests_per_second": round(len(results) / elapsed, 3) if elapsed else 0.0,
+            "latency_seconds": {
+                "mean": round(statistics.mean(latencies), 3) if latencies else None,
+                "p50": round(percentile(latencies, 50), 3) if latencies else None,
+                "p95": round(percentile(latencies, 95), 3) if latencies else None,
+                "p99": round(percentile(latencies, 99), 3) if latencies else None,
+                "max": round(max(latencies), 3) if latencies else None,
+            },
+            "peak_rss_mib": peak_rss_mib(),
+            "llm_calls": llm_after["calls"] - llm_before["calls"],
+            "llm_prompt_tokens": llm_after["prompt_tokens"] - llm_before["prompt_tokens"],
+            "llm_completion_tokens": llm_after["completion_tokens"] - llm_before["completion_tokens"],
+            "search_calls": search_tool.external_calls - search_before,
+        },
+    }
+    return summary
+
+
+def print_summary(summary, baseline=None):
+    results = summary["results"]
+    latency = results["latency_seconds"]
+    rows = [
+        ("requests/sec", results["requests_per_second"], baseline and baseline["results"]["requests_per_second"]),
+        ("p50 latency (s)", latency["p50"], baseline and baseline["results"]["latency_seconds"]["p50"]),
+        ("p95 latency (s)", latency["p95"], baseline and baseline["results"]["latency_seconds"]["p95"]),
+        ("p99 latency (s)", latency["p99"], baseline and baseline["results"]["latency_seconds"]["p99"]),
+        ("peak RSS (MiB)", results["peak_rss_mib"], baseline and baseline["results"]["peak_rss_mib"]),
+        ("LLM calls", results["llm_calls"], baseline and baseline["results"]["llm_calls"]),
+        ("LLM prompt tokens", results["llm_prompt_tokens"], baseline and baseline["results"].get("llm_prompt_tokens")),
+        ("search calls", results["search_calls"], baseline and baseline["results"]["search_calls"]),
+        ("errors", results["errors"], baseline and baseline["results"]["errors"]),
+    ]
+
+    print(f"\n=== {summary['label']} ({summary['config']['requests']} requests, concurrency {summary['config']['concurrency']}) ===")
+    for name, value, previous in rows:
+        line = f"  {name:<20} {value!s:>12}"
+        if previous not in (None, 0) and value is not None:
+            change = (value - previous) / previous * 100
+            line += f"   (baseline {previous}, {change:+.1f}%)"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20, help="Number of timed requests")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent clients")
+    parser.add_argument("--distinct-meals", type=int, default=len(MEALS), help="How many different meals to cycle through")
+    parser.add_argument("--use-cache", action="store_true", help="Allow result cache hits (default: bypass the cache)")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds per fake LLM call")
+    parser.add_argument("--llm-jitter", type=float, default=0.0, help="Extra random seconds per fake LLM call")
+    parser.add_argument("--search-latency", type=float, default=0.2, help="Seconds per fake Serper call")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--label", default="load-test")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", help="Baseline results JSON to compare against")
+    args = parser.parse_args()
+    args.distinct_meals = max(1, min(args.distinct_meals, len(MEALS)))
+
+    summary = run(args)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_summary(summary, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Serper API, for exercising the outbound client offline.
+
+Answers POST /search and /news with the canned results from fakes.py after
+--latency seconds. A share of requests (--fail-rate) gets --fail-status, 429
+with a Retry-After header by default, and --down fails every request. Point
+the backend at it with SERPER_BASE_URL=http://127.0.0.1:<port>.
+
+Usage: python benchmarks/stub_serper.py [--port 8787] [--latency 0.05] [--fail-rate 0.2] [--fail-status 503] [--down]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fakes import canned_search_results
+
+
+class StubSerperHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; keep-alive clients would wait on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with server.lock:
+            server.requests += 1
+            server.connections.add(self.client_address)
+            failing = server.down or server.random.random() < server.fail_rate
+            if failing:
+                server.failures += 1
+        time.sleep(server.latency)
+
+        if failing:
+            self.reply(server.fail_status, {"message": "Stub failure"}, {"Retry-After": "0"} if server.fail_status == 429 else {})
+            return
+        query = json.loads(body or b"{}").get("q", "")
+        self.reply(200, canned_search_results(query, self.path.strip("/") or "search"))
+
+    def reply(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubSerperServer(ThreadingHTTPServer):
+    """Stub Serper server; counts requests, injected failures and distinct client connections"""
+
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.05, fail_rate=0.0, fail_status=429, down=False, seed=0):
+        super().__init__(("127.0.0.1", port), StubSerperHandler)
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.fail_status = fail_status
+        self.down = down
+        self.random = random.Random(seed)
+        self.requests = 0
+        self.failures = 0
+        self.connections = set()
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        """Serve from a background thread and return the base URL"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self.base_url
+
+    def reset(self):
+        with self.lock:
+            self.requests = 0
+            self.failures = 0
+            self.connections = set()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds before each response")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="Share of requests that fail")
+    parser.add_argument("--fail-status", type=int, default=429, help="Status code of failed requests")
+    parser.add_argument("--down", action="store_true", help="Fail every request")
+    args = parser.parse_args()
+
+    server = StubSerperServer(args.port, args.latency, args.fail_rate, args.fail_status, args.down)
+    print(f"Stub Serper API on {server.base_url} (SERPER_BASE_URL={server.base_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
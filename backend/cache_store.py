@@ -0,0 +1,109 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class SQLiteCache:
+    """Persistent key/value cache with per-entry TTL and LRU eviction, backed by SQLite"""
+
+    def __init__(self, path, table="cache", max_entries=1000, default_ttl=86400):
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table} ("
+            "key TEXT PRIMARY KEY, "
+            "value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {self.table}_accessed_idx ON {self.table} (accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, expires_at = row
+            if expires_at <= now:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+            self._conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+        return json.loads(value)
+
+    def contains(self, key):
+        """Whether an unexpired value is stored for key, without touching its access time"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT 1 FROM {self.table} WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return row is not None
+
+    def set(self, key, value, ttl=None):
+        """Store a JSON-serializable value, evicting least recently used entries past max_entries"""
+        now = time.time()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def values(self):
+        """Return every unexpired value, without touching access times"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT value FROM {self.table} WHERE expires_at > ?", (time.time(),)
+            ).fetchall()
+        return [json.loads(value) for (value,) in rows]
+
+    def __len__(self):
+        """Number of unexpired entries"""
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT COUNT(*) FROM {self.table} WHERE expires_at > ?", (time.time(),)
+            ).fetchone()[0]
+
+    def _evict(self, now):
+        # Expired entries go first, then the least recently used ones beyond the size limit
+        self._conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+        self._conn.execute(
+            f"DELETE FROM {self.table} WHERE key IN ("
+            f"SELECT key FROM {self.table} ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
@@ -0,0 +1,31 @@
+"""Meals, skill levels and dietary restrictions advertised by /api/meal-plans"""
+
+SUPPORTED_MEALS = [
+    "Chicken Stir Fry",
+    "Paneer Butter Masala",
+    "Pasta Carbonara",
+    "Beef Tacos",
+    "Vegetarian Pizza",
+    "Salmon Teriyaki",
+    "Thai Green Curry",
+    "Mediterranean Bowl",
+    "Chicken Tikka Masala",
+    "Caesar Salad with Grilled Chicken"
+]
+
+COOKING_SKILLS = ["beginner", "intermediate", "advance"]
+
+COMMON_DIETARY_RESTRICTIONS = [
+    "vegetarian",
+    "vegan",
+    "gluten-free",
+    "dairy-free",
+    "nut-free",
+    "low-carb",
+    "keto"
+]
+
+
+def restriction_sets():
+    """No restrictions, then each common restriction on its own"""
+    return [[]] + [[restriction] for restriction in COMMON_DIETARY_RESTRICTIONS]
@@ -0,0 +1,200 @@
+import os
+import numpy as np
+import yaml
+from ingredients import DESCRIPTORS, format_money, format_price_range, normalize_name, parse_currency, parse_price_range
+from models import PriceRange, Substitution
+
+DEFAULT_SUBSTITUTIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "substitutions.yaml")
+
+# Currency of the price index and of the search results it is built from
+PRICE_CURRENCY = "USD"
+
+
+def strip_descriptors(name):
+    return " ".join(word for word in normalize_name(name).split() if word not in DESCRIPTORS)
+
+
+class CostModel:
+    """Prices shopping plans and checks them against a budget without an LLM.
+
+    Item prices come from the price index, looked up for all items in one
+    query, falling back to the shopping plan's own estimates. Totals, the budget
+    check and the choice of substitutions are computed on arrays over all items.
+    Over-budget plans are rebalanced with cheaper swaps from
+    config/substitutions.yaml, biggest savings first.
+
+    Prices are in PRICE_CURRENCY. A budget in another currency is reported in
+    its own currency but not compared, as no exchange rate is known.
+    """
+
+    def __init__(self, price_index, substitutions_path=None):
+        with open(substitutions_path or DEFAULT_SUBSTITUTIONS_PATH) as f:
+            table = yaml.safe_load(f)
+        self.substitutions = {normalize_name(name): options for name, options in table.items()}
+        self.max_words = max(len(name.split()) for name in self.substitutions)
+        self.price_index = price_index
+
+    def estimate(self, plan, budget=None):
+        """Price every item of a GroceryShoppingPlan and fill in its numeric prices.
+
+        Returns per-item and per-section costs and the numeric total, as ranges in
+        PRICE_CURRENCY.
+        """
+        currency = PRICE_CURRENCY
+        budget_currency = parse_currency(budget)
+        sections = plan.shopping_sections
+        items = [(section.section_name, item) for section in sections for item in section.items]
+        low, high = np.zeros(len(items)), np.zeros(len(items))
+        sources = []
+        index_costs = self.price_index.price_quantities([(item.name, item.quantity) for _, item in items])
+        for i, ((_, item), cost) in enumerate(zip(items, index_costs)):
+            source = "index"
+            if cost is None:
+                cost = parse_price_range(item.estimated_price)
+                source = "estimate" if cost else "unpriced"
+            if cost:
+                low[i], high[i] = cost
+            sources.append(source)
+        self.price_index.set_sections([
+            (item.name, section_name) for (section_name, item), source in zip(items, sources) if source == "index"
+        ])
+
+        section_ids = np.repeat(np.arange(len(sections)), [len(section.items) for section in sections])
+        section_low = np.bincount(section_ids, weights=low, minlength=len(sections))
+        section_high = np.bincount(section_ids, weights=high, minlength=len(sections))
+        total_low, total_high = float(low.sum()), float(high.sum())
+        budget_range = parse_price_range(budget) if budget else None
+        budget_amount = budget_range[1] if budget_range else None
+
+        def price(low, high, currency=currency):
+            return PriceRange(low=round(float(low), 2), high=round(float(high), 2), currency=currency)
+
+        for (_, item), item_low, item_high, source in zip(items, low, high, sources):
+            item.price = price(item_low, item_high) if source != "unpriced" else None
+        for section, low_total, high_total in zip(sections, section_low, section_high):
+            section.total = price(low_total, high_total)
+        plan.total = price(total_low, total_high)
+        plan.budget = price(*budget_range, currency=budget_currency) if budget_range else None
+        comparable = budget_amount is not None and budget_currency == currency
+
+        return {
+            "currency": currency,
+            "budget_currency": budget_currency,
+            "items": [
+                {
+                    "name": item.name,
+                    "quantity": item.quantity,
+                    "section": section_name,
+                    "cost_low": round(float(item_low), 2),
+                    "cost_high": round(float(item_high), 2),
+                    "source": source,
+                }
+                for (section_name, item), item_low, item_high, source in zip(items, low, high, sources)
+            ],
+            "sections": {
+                section.section_name: {"low": round(float(low_total), 2), "high": round(float(high_total), 2)}
+                for section, low_total, high_total in zip(sections, section_low, section_high)
+            },
+            "total_low": round(total_low, 2),
+            "total_high": round(total_high, 2),
+            "budget": budget_amount,
+            "within_budget": total_high <= budget_amount if comparable else None,
+            "priced_from_index": sources.count("index"),
+            "unpriced_items": sources.count("unpriced"),
+        }
+
+    def analyze(self, cost):
+        """The numeric BudgetAnalysis fields for a cost estimate, with substitutions if it is over budget"""
+        currency = cost.get("currency", "USD")
+        total = PriceRange(low=cost["total_low"], high=cost["total_high"], currency=currency)
+        analysis = {
+            "total": total,
+            "budget": None,
+            "within_budget": cost["within_budget"],
+            "over_budget_by": 0.0,
+            "unpriced_items": cost["unpriced_items"],
+            "substitutions": [],
+            "rebalanced_total": None,
+        }
+        if cost["budget"] is None:
+            return analysis
+        budget_currency = cost.get("budget_currency", currency)
+        analysis["budget"] = PriceRange(low=cost["budget"], high=cost["budget"], currency=budget_currency)
+        if budget_currency != currency:
+            return analysis
+        over_by = round(cost["total_high"] - cost["budget"], 2)
+        if over_by <= 0:
+            return analysis
+        analysis["over_budget_by"] = over_by
+
+        candidates = [self.best_substitution(item) for item in cost["items"]]
+        candidates = [candidate for candidate in candidates if candidate]
+        if not candidates:
+            return analysis
+        savings_low = np.array([candidate[2] for candidate in candidates])
+        savings_high = np.array([candidate[3] for candidate in candidates])
+
+        # Fewest swaps, biggest savings first, that cover the overspend; all of them if none do
+        order = np.argsort(-savings_high, kind="stable")
+        covered = np.cumsum(savings_high[order])
+        count = min(int(np.searchsorted(covered, over_by)) + 1, len(order))
+        chosen = order[:count]
+
+        analysis["substitutions"] = [
+            Substitution(
+                item=candidates[i][0]["name"],
+                replacement=candidates[i][1],
+                quantity=candidates[i][0]["quantity"],
+                savings=PriceRange(low=round(float(savings_low[i]), 2), high=round(float(savings_high[i]), 2), currency=currency),
+            )
+            for i in chosen
+        ]
+        analysis["rebalanced_total"] = PriceRange(
+            low=round(cost["total_low"] - float(savings_low[chosen].sum()), 2),
+            high=round(cost["total_high"] - float(savings_high[chosen].sum()), 2),
+            currency=currency,
+        )
+        return analysis
+
+    def best_substitution(self, item):
+        """(item, replacement, savings low, savings high) for the swap saving the most on a priced item, or None"""
+        if not item["cost_high"]:
+            return None
+        best = None
+        for option in self.options(item["name"]):
+            cost = None
+            # The index strips descriptors, so it would price 'frozen broccoli' as broccoli
+            if strip_descriptors(option["name"]) != strip_descriptors(item["name"]):
+                cost = self.price_index.price_quantity(option["name"], item["quantity"])
+            if cost is None:
+                cost = (item["cost_low"] * option["price_ratio"], item["cost_high"] * option["price_ratio"])
+            savings = sorted((max(0.0, item["cost_low"] - cost[0]), item["cost_high"] - cost[1]))
+            if savings[1] > 0 and (best is None or savings[1] > best[3]):
+                best = (item, option["name"], *savings)
+        return best
+
+    def options(self, name):
+        """Substitutions for an ingredient name; the longest run of whole words in the table wins"""
+        words = normalize_name(name).split()
+        for size in range(min(len(words), self.max_words), 0, -1):
+            for start in range(len(words) - size, -1, -1):
+                options = self.substitutions.get(" ".join(words[start:start + size]))
+                if options:
+                    return options
+        return []
+
+
+def format_substitutions(analysis):
+    """Plain-text substitutions for the budget advisor's prompt"""
+    if not analysis["substitutions"]:
+        return ""
+    currency = analysis["total"].currency
+    lines = [f"Over budget by {format_money(analysis['over_budget_by'], currency)}. These swaps bring the list back within budget:"]
+    lines += [
+        f"- {swap.replacement} instead of {swap.item} "
+        f"(saves {format_price_range(swap.savings.low, swap.savings.high, swap.savings.currency)})"
+        for swap in analysis["substitutions"]
+    ]
+    total = analysis["rebalanced_total"]
+    lines.append(f"Total after swaps: {format_price_range(total.low, total.high, total.currency)}")
+    return "\n".join(lines)
@@ -0,0 +1,81 @@
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class CrewPool:
+    """Pool of pre-built crew templates.
+
+    A template is checked out by exactly one request at a time, so its agents
+    and tasks never see concurrent kickoffs. When every template is busy a new
+    one is built rather than blocking; at most `size` idle templates are kept.
+    Templates whose `reusable` flag is cleared during a run, or whose run
+    raises, are discarded.
+    """
+
+    def __init__(self, factory, size=2):
+        self.factory = factory
+        self.size = size
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self.in_use = 0
+        self.created = 0
+        self.reused = 0
+
+        for _ in range(size):
+            self._idle.put_nowait(self._create())
+
+    @contextmanager
+    def checkout(self):
+        try:
+            template = self._idle.get_nowait()
+            with self._lock:
+                self.reused += 1
+        except queue.Empty:
+            logger.info("All crew templates are busy, building another one")
+            template = self._create()
+
+        with self._lock:
+            self.in_use += 1
+        try:
+            yield template
+        except Exception:
+            # A failed run may leave sibling steps still running on the template's agents and tasks
+            template.reusable = False
+            raise
+        finally:
+            try:
+                if getattr(template, "reusable", True):
+                    self._idle.put_nowait(template)
+                else:
+                    logger.info("Discarding a crew template left busy by a timed out or failed run")
+            except queue.Full:
+                pass
+            with self._lock:
+                self.in_use -= 1
+                self._released.notify_all()
+
+    def wait_idle(self, timeout=None):
+        """Block until no template is checked out; False if timeout seconds passed first"""
+        with self._released:
+            return self._released.wait_for(lambda: self.in_use == 0, timeout)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": self._idle.qsize(),
+                "in_use": self.in_use,
+                "created": self.created,
+                "reused": self.reused,
+            }
+
+    def _create(self):
+        template = self.factory()
+        with self._lock:
+            self.created += 1
+        return template
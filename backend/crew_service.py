@@ -1,60 +1,123 @@
+import logging
 import os
-from crewai_tools import SerperDevTool
-from crewai import Agent, Task, Crew, Process, LLM
-from models import GroceryShoppingPlan, MealPlan, MealPlanRequest
+import time
+from crewai import Agent, Task, Crew, Process
+from crewai.tasks.output_format import OutputFormat
+from crewai.tasks.task_output import TaskOutput
+from pydantic import BaseModel
+from models import (
+    BatchMealPlanRequest, BudgetAdvice, BudgetAnalysis, GroceryShoppingPlan, MealPlan, MealPlanRequest, SectionAssignments
+)
+from ingredients import format_money, merge_shopping_plan, parse_currency, parse_price_range
 from leftover import LeftoversCrew
+from search_cache import CachedSerperTool
+from shopping_engine import ShoppingListEngine
+from price_index import PriceIndex, PriceLookupTool, PriceRefresher, format_cost_breakdown
+from cost_model import CostModel, format_substitutions
+from pipeline import Pipeline, PipelineStep, StepTimeoutError
+from llm_router import LLMRouter
+from summary_renderer import render_summary
+from crew_pool import CrewPool
+from cache_store import SQLiteCache
+from plan_cache import request_key
+from revision import REUSABLE_TASKS, restore_outputs
+import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "checkpoints.sqlite3")
+
+TASK_NAMES = ['meal_planning', 'shopping', 'budget', 'leftover', 'summary']
+
+# Budget totals are computed from the price index, not by the LLM
+COST_BREAKDOWN_INSTRUCTIONS = (
+    "Use this cost breakdown of the shopping list for all totals instead of recalculating them:\n"
+    "{cost_breakdown}\n"
+    "For items marked [estimate] or [no price], check the price index tool before searching the web."
+)
 
 class AlexCrewService:
-    def __init__(self):
-        # Initialize LLM
-        self.llm = LLM(
-            model="gemini/gemini-1.5-flash",
-            temperature=0.7
-        )
+    def __init__(self, llm=None, search_tool=None, price_index=None, router=None):
+        # Each task gets the LLM tier, timeout and token budget from config/models.yaml;
+        # a given llm replaces every tier
+        self.router = router or LLMRouter(llm=llm)
+        self.llm = self.router.default_llm()
         
-        # Initialize search tool
-        self.search_tool = SerperDevTool()
+        # Initialize search tool, memoized across agents and requests
+        self.search_tool = search_tool or CachedSerperTool()
         
-        # Initialize leftover crew
-        self.leftovers_crew = LeftoversCrew(llm=self.llm)
+        # Local ingredient price index, fed by price searches and refreshed in the background
+        self.price_index = price_index or PriceIndex()
+        if not len(self.price_index):
+            self.price_index.backfill(self.search_tool.cached_results())
+        self.search_tool.add_result_listener(self.price_index.ingest_search_results)
+        self.price_lookup_tool = PriceLookupTool(self.price_index)
+        self.price_refresher = PriceRefresher(self.price_index, self.search_tool)
+        self.price_refresher.start()
+        
+        # Shopping lists are aggregated in Python; the LLM only classifies unknown ingredients
+        self.shopping_engine = ShoppingListEngine(price_index=self.price_index)
+        
+        # Totals, the budget check and substitutions are computed, not asked of the LLM
+        self.cost_model = CostModel(self.price_index)
+        
+        # Outputs of the tasks that finished before a run failed, so retrying the request resumes it
+        self.checkpoints = SQLiteCache(
+            os.getenv('CHECKPOINT_PATH', DEFAULT_CHECKPOINT_PATH),
+            table="task_checkpoints",
+            max_entries=int(os.getenv('CHECKPOINT_MAX_ENTRIES', 500)),
+            default_ttl=int(os.getenv('CHECKPOINT_TTL', 3600))
+        )
         
-    def create_meal_planner_agent(self):
+        # Pre-build crews once; requests only bind their inputs
+        self.crew_pool = CrewPool(
+            lambda: CrewTemplate(self),
+            size=int(os.getenv('CREW_POOL_SIZE', 2))
+        )
+        
+    def create_meal_planner_agent(self, llm=None):
         return Agent(
             role="Meal Planner & Recipe Researcher",
             goal="Search for optimal recipes and create detailed meal plans",
             backstory="A skilled meal planner who researches the best recipes online, considering dietary needs, cooking skill levels, and budget constraints.",
             tools=[self.search_tool],
-            llm=self.llm,
+            llm=llm or self.llm,
+            # The search tool has its own persistent cache; CrewAI's per-agent
+            # cache would live as long as the pooled agent, without a TTL
+            cache=False,
             verbose=False
         )
     
-    def create_shopping_organizer_agent(self):
+    def create_shopping_organizer_agent(self, llm=None):
         return Agent(
             role="Shopping Organizer", 
             goal="Organize grocery lists by store sections efficiently",
             backstory="An experienced shopper who knows how to organize lists for quick store trips and considers dietary restrictions.",
             tools=[],
-            llm=self.llm,
+            llm=llm or self.llm,
             verbose=False
         )
     
-    def create_budget_advisor_agent(self):
+    def create_budget_advisor_agent(self, llm=None):
         return Agent(
             role="Budget Advisor",
             goal="Provide cost estimates and money-saving tips",
             backstory="A budget-conscious shopper who helps families save money on groceries while respecting dietary needs.",
-            tools=[self.search_tool],
-            llm=self.llm,
+            tools=[self.price_lookup_tool, self.search_tool],
+            llm=llm or self.llm,
+            # The search tool has its own persistent cache; CrewAI's per-agent
+            # cache would live as long as the pooled agent, without a TTL
+            cache=False,
             verbose=False
         )
     
-    def create_summary_agent(self):
+    def create_summary_agent(self, llm=None):
         return Agent(
             role="Report Compiler",
             goal="Compile comprehensive meal planning reports from all team outputs",
             backstory="A skilled coordinator who organizes information from multiple specialists into comprehensive, easy-to-follow reports.",
             tools=[],
-            llm=self.llm,
+            llm=llm or self.llm,
             verbose=False
         )
     
@@ -84,16 +147,60 @@ class AlexCrewService:
             output_pydantic=GroceryShoppingPlan
         )
     
+    def create_section_classification_task(self, agent):
+        return Task(
+            description=(
+                "Assign each of these grocery items to the store section where it is usually sold. "
+                "Choose from these sections: {sections}. Use 'Other' only if none of them fit.\n"
+                "Items:\n{items}"
+            ),
+            expected_output="The store section for every item, with item names exactly as given.",
+            agent=agent,
+            output_pydantic=SectionAssignments
+        )
+    
     def create_budget_task(self, agent, context_tasks):
         return Task(
             description=(
                 "Analyze the shopping plan for '{meal_name}' serving {servings} people. "
                 "Ensure total cost stays within {budget}. Consider dietary restrictions: {dietary_restrictions}. "
-                "Provide practical money-saving tips and alternative ingredients if needed to meet budget."
+                "Provide practical money-saving tips and alternative ingredients if needed to meet budget.\n"
+                + COST_BREAKDOWN_INSTRUCTIONS
             ),
-            expected_output="A complete shopping guide with detailed prices, budget analysis, and money-saving tips.",
+            expected_output="A budget analysis of the shopping plan with money-saving tips.",
             agent=agent,
-            context=context_tasks
+            context=context_tasks,
+            output_pydantic=BudgetAdvice
+        )
+    
+    def create_batch_shopping_task(self, agent, context_tasks):
+        return Task(
+            description=(
+                "Combine the ingredients from the meal plans for {meal_names} into a single grocery shopping list "
+                "for {servings} people per meal. List each ingredient only once, adding up the quantities needed "
+                "across all meals, and group items by store sections. "
+                "Consider dietary restrictions: {dietary_restrictions} and cooking skill: {cooking_skill}. "
+                "Stay within the total budget: {budget}."
+            ),
+            expected_output="One organized shopping list for all meals, grouped by store sections with combined quantities and prices.",
+            agent=agent,
+            context=context_tasks,
+            output_pydantic=GroceryShoppingPlan
+        )
+    
+    def create_batch_budget_task(self, agent, context_tasks):
+        return Task(
+            description=(
+                "Analyze the combined shopping plan for {meal_count} meals ({meal_names}), each serving {servings} people. "
+                "Ensure the total cost stays within {budget}. Consider dietary restrictions: {dietary_restrictions}. "
+                "Provide practical money-saving tips, including ingredients to buy in bulk for several meals, "
+                "and alternative ingredients if needed to meet budget.\n"
+                + COST_BREAKDOWN_INSTRUCTIONS
+            ),
+            expected_output="A budget analysis of the combined shopping plan with money-saving tips.",
+            agent=agent,
+            context=context_tasks,
+            output_pydantic=BudgetAdvice
         )
     
     def create_summary_task(self, agent, context_tasks):
@@ -111,69 +218,522 @@ class AlexCrewService:
             context=context_tasks
         )
     
-    def generate_meal_plan(self, request: MealPlanRequest):
-        """Generate a complete meal plan with shopping list and budget analysis"""
+    @staticmethod
+    def serialize_task_output(task_output):
+        """Convert a TaskOutput to a dict (pydantic outputs) or its raw string"""
+        if task_output is None or isinstance(task_output, dict):
+            return task_output
+        if hasattr(task_output, 'pydantic') and task_output.pydantic:
+            # Convert Pydantic model to dict
+            return task_output.pydantic.model_dump()
+        return str(task_output.raw) if hasattr(task_output, 'raw') else str(task_output)
+    
+    def generate_meal_plan(self, request: MealPlanRequest, on_task_complete=None, reuse=None):
+        """Generate a complete meal plan with shopping list and budget analysis.
         
-        # Create agents
-        meal_planner = self.create_meal_planner_agent()
-        shopping_organizer = self.create_shopping_organizer_agent()
-        budget_advisor = self.create_budget_advisor_agent()
-        summary_agent = self.create_summary_agent()
-        leftover_manager = self.leftovers_crew.leftover_manager()
+        If given, on_task_complete(task_name, output, timing) is called with each
+        task's serialized output as soon as that task finishes. reuse maps task
+        names to outputs of an earlier plan (a pydantic model or text) that stand
+        in for running those tasks.
         
-        # Create tasks
-        meal_planning_task = self.create_meal_planning_task(meal_planner)
-        shopping_task = self.create_shopping_task(shopping_organizer, [meal_planning_task])
-        budget_task = self.create_budget_task(budget_advisor, [meal_planning_task, shopping_task])
-        leftover_task = self.leftovers_crew.leftover_task()
-        summary_task = self.create_summary_task(summary_agent, [meal_planning_task, shopping_task, budget_task, leftover_task])
-        
-        # Create crew
-        crew = Crew(
-            agents=[meal_planner, shopping_organizer, budget_advisor, leftover_manager, summary_agent],
-            tasks=[meal_planning_task, shopping_task, budget_task, leftover_task, summary_task],
-            process=Process.sequential,
-            verbose=False
-        )
+        If the run fails, the outputs of the tasks that finished are checkpointed
+        and a retry of the same request starts from them, unless it bypasses the cache.
+        """
         
-        # Execute crew
-        crew_result = crew.kickoff(
-            inputs={
-                "meal_name": request.meal_name,
-                "servings": request.servings,
-                "budget": request.budget,
-                "dietary_restrictions": request.dietary_restrictions,
-                "cooking_skill": request.cooking_skill
-            }
-        )
+        inputs = {
+            "meal_name": request.meal_name,
+            "servings": request.servings,
+            "budget": request.budget,
+            "dietary_restrictions": request.dietary_restrictions,
+            "cooking_skill": request.cooking_skill
+        }
+        
+        checkpoint_key = request_key(request)
+        # A cache bypass asks for fresh outputs, checkpointed ones included
+        bypass = request.cache == "bypass"
+        checkpoint = {} if bypass else self.checkpoints.get(checkpoint_key) or {}
+        if checkpoint:
+            logger.info(f"Resuming meal plan for {request.meal_name} from checkpointed {', '.join(checkpoint)}")
+            for task_name in checkpoint:
+                metrics.record_checkpoint_resume(task_name)
+        reuse = {**restore_outputs(checkpoint), **(reuse or {})}
+        completed = {}
+        
+        def step_complete(task_name, task_output, timing):
+            if task_name in REUSABLE_TASKS and not timing.get("timed_out"):
+                completed[task_name] = self.serialize_task_output(task_output)
+            if on_task_complete:
+                on_task_complete(task_name, self.serialize_task_output(task_output), timing)
         
-        # Extract serializable data from CrewOutput
+        # Execute the task graph on a pooled crew template
+        try:
+            with self.crew_pool.checkout() as template:
+                pipeline_result = template.build_pipeline(inputs, request.llm_summary, reuse).run(
+                    on_step_complete=step_complete
+                )
+        except Exception:
+            if completed:
+                logger.warning(f"Meal plan for {request.meal_name} failed; checkpointed {', '.join(completed)}")
+                self.checkpoints.set(checkpoint_key, completed)
+            raise
+        if checkpoint or bypass:
+            self.checkpoints.delete(checkpoint_key)
+        outputs = pipeline_result.outputs
+        
+        # Extract serializable data from the task outputs
+        serialize_started = time.perf_counter()
         try:
             # Get the final result (summary task output)
-            final_result = str(crew_result.raw)
+            final_result = str(outputs["summary"].raw)
             
-            # Try to get individual task outputs if available
-            task_outputs = {}
-            if hasattr(crew_result, 'tasks_output') and crew_result.tasks_output:
-                for i, task_output in enumerate(crew_result.tasks_output):
-                    task_name = ['meal_planning', 'shopping', 'budget', 'leftover', 'summary'][i]
-                    if hasattr(task_output, 'pydantic') and task_output.pydantic:
-                        # Convert Pydantic model to dict
-                        task_outputs[task_name] = task_output.pydantic.model_dump()
-                    else:
-                        task_outputs[task_name] = str(task_output.raw) if hasattr(task_output, 'raw') else str(task_output)
+            task_outputs = {
+                task_name: self.serialize_task_output(outputs[task_name])
+                for task_name in TASK_NAMES
+            }
+            metrics.record_serialization(time.perf_counter() - serialize_started)
             
             return {
                 "summary": final_result,
                 "task_outputs": task_outputs,
+                "cost_estimate": outputs["cost_estimate"],
+                "timings": pipeline_result.timings_dict(),
+                "summary_source": summary_source(request, pipeline_result),
+                "degraded_tasks": pipeline_result.timed_out,
                 "status": "completed"
             }
             
         except Exception as e:
             # Fallback to string conversion
             return {
-                "summary": str(crew_result),
+                "summary": str(outputs.get("summary")),
                 "task_outputs": {},
+                "timings": pipeline_result.timings_dict(),
                 "status": "completed",
                 "note": f"Simplified output due to serialization: {str(e)}"
-            }
\ No newline at end of file
+            }
+
+
+    def generate_batch_meal_plan(self, request: BatchMealPlanRequest, on_task_complete=None):
+        """Plan several meals in one run: research each meal in parallel, then build
+        one merged shopping list and do a single budget, leftover and summary pass.
+        """
+        
+        meal_inputs = [
+            {
+                "meal_name": meal_name,
+                "servings": request.servings,
+                "budget": split_budget(request.budget, len(request.meals)),
+                "dietary_restrictions": request.dietary_restrictions,
+                "cooking_skill": request.cooking_skill
+            }
+            for meal_name in request.meals
+        ]
+        batch_inputs = {
+            "meal_names": ", ".join(f"'{meal_name}'" for meal_name in request.meals),
+            "meal_count": len(request.meals),
+            "servings": request.servings,
+            "budget": request.budget,
+            "dietary_restrictions": request.dietary_restrictions,
+            "cooking_skill": request.cooking_skill
+        }
+        
+        def step_complete(step_name, task_output, timing):
+            on_task_complete(step_name, self.serialize_task_output(task_output), timing)
+        
+        # Templates are sized by the number of meals, so batches build their own
+        template = BatchCrewTemplate(self, len(request.meals))
+        pipeline_result = template.build_pipeline(batch_inputs, meal_inputs, request.llm_summary).run(
+            on_step_complete=step_complete if on_task_complete else None
+        )
+        outputs = pipeline_result.outputs
+        
+        serialize_started = time.perf_counter()
+        task_outputs = {
+            "meal_planning": [
+                self.serialize_task_output(outputs[step_name])
+                for step_name in template.meal_step_names
+            ]
+        }
+        for task_name in TASK_NAMES[1:]:
+            task_outputs[task_name] = self.serialize_task_output(outputs[task_name])
+        metrics.record_serialization(time.perf_counter() - serialize_started)
+        
+        return {
+            "summary": str(outputs["summary"].raw),
+            "task_outputs": task_outputs,
+            "cost_estimate": outputs["cost_estimate"],
+            "timings": pipeline_result.timings_dict(),
+            "summary_source": summary_source(request, pipeline_result),
+            "degraded_tasks": pipeline_result.timed_out,
+            "status": "completed"
+        }
+
+
+def summary_source(request, pipeline_result):
+    """'llm' if the report compiler agent wrote the summary, 'template' if it was rendered"""
+    return "llm" if request.llm_summary and "summary" not in pipeline_result.timed_out else "template"
+
+
+def split_budget(budget, meal_count):
+    """Per-meal share of a total budget in the budget's own currency, for researching each meal on its own"""
+    price = parse_price_range(budget)
+    if price is None or meal_count <= 1:
+        return budget
+    return format_money(price[1] / meal_count, parse_currency(budget))
+
+
+class CrewTemplate:
+    """Agents, tasks and one-task crews for a single meal plan run.
+    
+    Built once and reused across requests; CrewAI re-interpolates task and
+    agent templates from their originals on every kickoff, so only the inputs
+    change between runs. A template must not be used by two requests at once.
+    
+    The summary is rendered from the other outputs unless a request opts in to
+    the LLM report compiler. A task that times out keeps running in the background on its agent, so
+    the template is then marked as not reusable and the pool drops it.
+    """
+    
+    meal_step_names = ["meal_planning"]
+    
+    def __init__(self, service):
+        self.price_index = service.price_index
+        self.shopping_engine = service.shopping_engine
+        self.cost_model = service.cost_model
+        self.reusable = True
+        # Task name -> llm_router.Route, filled in by build_tasks
+        self.routes = {}
+        
+        # Each task runs as a one-task crew. Upstream results reach a task through
+        # its context tasks, whose outputs are set by the time it is scheduled.
+        self.crews = {
+            task_name: Crew(
+                agents=[agent],
+                tasks=[task],
+                process=Process.sequential,
+                verbose=False
+            )
+            for task_name, agent, task in self.build_tasks(service)
+        }
+        
+        # Agents accumulate token usage across kickoffs, so per-run figures
+        # are deltas against what was seen after the previous run
+        self._usage_seen = {task_name: (0, 0, 0) for task_name in self.crews}
+    
+    def build_tasks(self, service):
+        """Create the agents and tasks, as (task_name, agent, task) tuples"""
+        routes = self.route_tasks(service, ["meal_planning", "leftover"])
+        
+        # Each template needs its own leftover crew, whose agent and task are memoized per instance
+        leftovers_crew = LeftoversCrew(llm=routes["leftover"].llm)
+        
+        # Create agents, each on the LLM routed for its task
+        meal_planner = service.create_meal_planner_agent(routes["meal_planning"].llm)
+        shopping_organizer = service.create_shopping_organizer_agent(routes["shopping"].llm)
+        section_classifier = service.create_shopping_organizer_agent(routes["shopping_classification"].llm)
+        budget_advisor = service.create_budget_advisor_agent(routes["budget"].llm)
+        summary_agent = service.create_summary_agent(routes["summary"].llm)
+        leftover_manager = leftovers_crew.leftover_manager()
+        
+        # Create tasks
+        meal_planning_task = service.create_meal_planning_task(meal_planner)
+        self.shopping_task = service.create_shopping_task(shopping_organizer, [meal_planning_task])
+        shopping_task = self.shopping_task
+        classification_task = service.create_section_classification_task(section_classifier)
+        budget_task = service.create_budget_task(budget_advisor, [meal_planning_task, shopping_task])
+        leftover_task = leftovers_crew.leftover_task()
+        summary_task = service.create_summary_task(summary_agent, [meal_planning_task, shopping_task, budget_task, leftover_task])
+        
+        return [
+            ("meal_planning", meal_planner, meal_planning_task),
+            ("shopping", shopping_organizer, shopping_task),
+            ("shopping_classification", section_classifier, classification_task),
+            ("budget", budget_advisor, budget_task),
+            ("leftover", leftover_manager, leftover_task),
+            ("summary", summary_agent, summary_task),
+        ]
+    
+    def route_tasks(self, service, step_names, route_names=None):
+        """Route every step to an LLM; route_names maps steps whose route has another name"""
+        route_names = route_names or {}
+        for step_name in step_names + ["shopping", "shopping_classification", "budget", "summary"]:
+            self.routes[step_name] = service.router.route(route_names.get(step_name, step_name))
+        return self.routes
+    
+    def run_task(self, task_name, inputs):
+        """Run a single task and return its TaskOutput, recording its metrics"""
+        crew = self.crews[task_name]
+        
+        # Retry counters are never reset by CrewAI; a reused agent would
+        # otherwise run out of retries after a few failed requests
+        for agent in crew.agents:
+            agent._times_executed = 0
+        for task in crew.tasks:
+            task.retry_count = 0
+        
+        started = time.perf_counter()
+        try:
+            with metrics.task_scope(task_name):
+                crew_result = crew.kickoff(inputs=inputs)
+        except Exception:
+            metrics.TASK_FAILURES.inc(task=task_name)
+            raise
+        duration = time.perf_counter() - started
+        
+        usage = crew_result.token_usage
+        usage_totals = (usage.prompt_tokens, usage.completion_tokens, usage.successful_requests) if usage else (0, 0, 0)
+        prompt_tokens, completion_tokens, llm_requests = (
+            max(0, now - before) for now, before in zip(usage_totals, self._usage_seen[task_name])
+        )
+        self._usage_seen[task_name] = usage_totals
+        
+        retries = sum(agent._times_executed for agent in crew.agents) + sum(task.retry_count for task in crew.tasks)
+        
+        route = self.routes[task_name]
+        metrics.record_task(
+            task_name, duration, prompt_tokens, completion_tokens, llm_requests, retries,
+            model=route.model, tier=route.tier, cost_usd=route.cost(prompt_tokens, completion_tokens)
+        )
+        return crew_result.tasks_output[0]
+    
+    def timed_step(self, name, run, depends_on=(), task_name=None, fallback=None):
+        """A pipeline step bounded by its task's timeout.
+        
+        On timeout, fallback(dependencies) gives the raw text that stands in for
+        the task's output; without a fallback the request fails.
+        """
+        task_name = task_name or name
+        
+        def on_timeout(dependencies):
+            self.reusable = False
+            metrics.record_timeout(task_name)
+            if fallback is None:
+                raise StepTimeoutError(f"The {task_name} task timed out after {self.routes[task_name].timeout_seconds}s")
+            return self.set_output(task_name, fallback(dependencies))
+        
+        return PipelineStep(name, run, depends_on, timeout=self.routes[task_name].timeout_seconds, on_timeout=on_timeout)
+    
+    def budget_fallback(self, dependencies):
+        cost_estimate = dependencies["cost_estimate"]
+        if not cost_estimate:
+            return BudgetAnalysis(analysis="Budget analysis unavailable: the budget advisor timed out.")
+        return BudgetAnalysis(
+            analysis="Budget analysis timed out; cost breakdown from the price index:\n" + format_cost_breakdown(cost_estimate),
+            **self.cost_model.analyze(cost_estimate)
+        )
+    
+    @staticmethod
+    def leftover_fallback(dependencies):
+        return "Leftover suggestions unavailable: the leftover task timed out."
+    
+    def set_output(self, task_name, output):
+        """Set a task's output (text or a pydantic model) without running it; downstream tasks read it through their context"""
+        task = self.crews[task_name].tasks[0]
+        structured = isinstance(output, BaseModel)
+        task.output = TaskOutput(
+            description=task.description,
+            agent=task.agent.role,
+            raw=output.model_dump_json() if structured else output,
+            pydantic=output if structured else None,
+            output_format=OutputFormat.PYDANTIC if structured else OutputFormat.RAW
+        )
+        return task.output
+    
+    def render_summary(self, dependencies):
+        """Summary rendered from the other outputs, in place of the report compiler agent"""
+        serialize = AlexCrewService.serialize_task_output
+        meal_plans = [serialize(dependencies[step_name]) for step_name in self.meal_step_names]
+        task_outputs = {
+            "meal_planning": meal_plans if len(self.meal_step_names) > 1 else meal_plans[0],
+            "shopping": serialize(dependencies["shopping"]),
+            "budget": serialize(dependencies["budget"]),
+            "leftover": serialize(dependencies["leftover"]),
+        }
+        return render_summary(task_outputs, dependencies["cost_estimate"])
+    
+    def summary_step(self, run_llm_summary, llm_summary):
+        depends_on = self.meal_step_names + ["shopping", "cost_estimate", "budget", "leftover"]
+        if not llm_summary:
+            return PipelineStep(
+                "summary",
+                lambda dependencies: self.set_output("summary", self.render_summary(dependencies)),
+                depends_on=depends_on
+            )
+        return self.timed_step("summary", run_llm_summary, depends_on=depends_on, fallback=self.render_summary)
+    
+    def run_shopping(self, inputs, meal_plan_outputs):
+        """Build the shopping list with the shopping engine and return it as the shopping task's output.
+        
+        The LLM is only asked to classify ingredients the engine doesn't know. If
+        no meal plan came back structured, the shopping task runs on the LLM instead.
+        """
+        meal_plans = [output.pydantic for output in meal_plan_outputs if output.pydantic]
+        if not meal_plans:
+            task_output = self.run_task("shopping", inputs)
+            if task_output.pydantic:
+                plan = merge_shopping_plan(task_output.pydantic)
+                task_output.pydantic = plan
+                task_output.raw = plan.model_dump_json()
+            return task_output
+        
+        def classify_unknown(names):
+            task_output = self.run_task("shopping_classification", {
+                "sections": ", ".join(self.shopping_engine.sections),
+                "items": "\n".join(f"- {name}" for name in names)
+            })
+            if task_output.pydantic is None:
+                return {}
+            return {assignment.name: assignment.section for assignment in task_output.pydantic.assignments}
+        
+        plan = self.shopping_engine.build_plan(meal_plans, inputs["servings"], inputs["budget"], classify_unknown)
+        
+        # Downstream tasks read this output through their context, as if the task had run
+        self.shopping_task.output = TaskOutput(
+            description=self.shopping_task.description,
+            agent=self.shopping_task.agent.role,
+            raw=plan.model_dump_json(),
+            pydantic=plan,
+            output_format=OutputFormat.PYDANTIC
+        )
+        return self.shopping_task.output
+    
+    def estimate_cost(self, inputs, shopping_output):
+        """Numeric cost of the shopping plan, or None if the shopping task gave no structured plan"""
+        if shopping_output.pydantic is None:
+            return None
+        return self.cost_model.estimate(shopping_output.pydantic, inputs["budget"])
+    
+    def run_budget(self, inputs, cost_estimate):
+        """Run the budget advisor and merge its advice with the cost model's budget check"""
+        budget_check = self.cost_model.analyze(cost_estimate) if cost_estimate else {}
+        cost_breakdown = (
+            "\n".join(filter(None, [format_cost_breakdown(cost_estimate), format_substitutions(budget_check)]))
+            if cost_estimate else "Not available; estimate the totals from the shopping plan."
+        )
+        task_output = self.run_task("budget", {**inputs, "cost_breakdown": cost_breakdown})
+        advice = task_output.pydantic or BudgetAdvice(analysis=str(task_output.raw))
+        task_output.pydantic = BudgetAnalysis(**advice.model_dump(), **budget_check)
+        task_output.output_format = OutputFormat.PYDANTIC
+        return task_output
+    
+    def reused_step(self, step, output):
+        """A step that sets a stored output in place of running its task"""
+        return PipelineStep(step.name, lambda dependencies: self.set_output(step.name, output), step.depends_on)
+    
+    def build_pipeline(self, inputs, llm_summary=False, reuse=None):
+        """Build the task dependency graph for one meal plan request.
+        
+        Steps named in reuse take their output from it instead of running.
+        """
+        reuse = reuse or {}
+        
+        def step(task_name):
+            return lambda dependencies: self.run_task(task_name, inputs)
+        
+        # The leftover task only needs the request inputs, so it overlaps
+        # with the meal planning -> shopping -> budget chain
+        steps = [
+            self.timed_step("meal_planning", step("meal_planning")),
+            self.timed_step("leftover", step("leftover"), fallback=self.leftover_fallback),
+            self.timed_step(
+                "shopping",
+                lambda dependencies: self.run_shopping(inputs, [dependencies["meal_planning"]]),
+                depends_on=["meal_planning"]
+            ),
+            PipelineStep(
+                "cost_estimate",
+                lambda dependencies: self.estimate_cost(inputs, dependencies["shopping"]),
+                depends_on=["shopping"]
+            ),
+            self.timed_step(
+                "budget",
+                lambda dependencies: self.run_budget(inputs, dependencies["cost_estimate"]),
+                depends_on=["meal_planning", "shopping", "cost_estimate"],
+                fallback=self.budget_fallback
+            ),
+            self.summary_step(step("summary"), llm_summary),
+        ]
+        return Pipeline([
+            self.reused_step(pipeline_step, reuse[pipeline_step.name]) if pipeline_step.name in reuse else pipeline_step
+            for pipeline_step in steps
+        ])
+
+
+
+class BatchCrewTemplate(CrewTemplate):
+    """Crews for planning several meals at once.
+    
+    Every meal gets its own meal planning task (meal_planning_0, meal_planning_1, ...);
+    shopping, budget, leftover and summary run once for the whole batch.
+    """
+    
+    def __init__(self, service, meal_count):
+        self.meal_step_names = [f"meal_planning_{i}" for i in range(meal_count)]
+        super().__init__(service)
+    
+    def build_tasks(self, service):
+        route_names = {step_name: "meal_planning" for step_name in self.meal_step_names}
+        route_names["leftover"] = "batch_leftover"
+        routes = self.route_tasks(service, self.meal_step_names + ["leftover"], route_names)
+        
+        leftovers_crew = LeftoversCrew(llm=routes["leftover"].llm)
+        
+        meal_planners = [service.create_meal_planner_agent(routes[step_name].llm) for step_name in self.meal_step_names]
+        shopping_organizer = service.create_shopping_organizer_agent(routes["shopping"].llm)
+        section_classifier = service.create_shopping_organizer_agent(routes["shopping_classification"].llm)
+        budget_advisor = service.create_budget_advisor_agent(routes["budget"].llm)
+        summary_agent = service.create_summary_agent(routes["summary"].llm)
+        leftover_manager = leftovers_crew.leftover_manager()
+        
+        meal_planning_tasks = [service.create_meal_planning_task(agent) for agent in meal_planners]
+        self.shopping_task = service.create_batch_shopping_task(shopping_organizer, meal_planning_tasks)
+        shopping_task = self.shopping_task
+        classification_task = service.create_section_classification_task(section_classifier)
+        # The merged shopping plan already carries every meal plan
+        budget_task = service.create_batch_budget_task(budget_advisor, [shopping_task])
+        leftover_task = leftovers_crew.batch_leftover_task()
+        summary_task = service.create_summary_task(summary_agent, meal_planning_tasks + [shopping_task, budget_task, leftover_task])
+        
+        return list(zip(self.meal_step_names, meal_planners, meal_planning_tasks)) + [
+            ("shopping", shopping_organizer, shopping_task),
+            ("shopping_classification", section_classifier, classification_task),
+            ("budget", budget_advisor, budget_task),
+            ("leftover", leftover_manager, leftover_task),
+            ("summary", summary_agent, summary_task),
+        ]
+    
+    def build_pipeline(self, batch_inputs, meal_inputs, llm_summary=False):
+        """Build the task dependency graph for a batch of meals"""
+        
+        def meal_step(step_name, inputs):
+            return lambda dependencies: self.run_task(step_name, inputs)
+        
+        def step(task_name):
+            return lambda dependencies: self.run_task(task_name, batch_inputs)
+        
+        steps = [
+            self.timed_step(step_name, meal_step(step_name, inputs))
+            for step_name, inputs in zip(self.meal_step_names, meal_inputs)
+        ]
+        return Pipeline(steps + [
+            self.timed_step("leftover", step("leftover"), fallback=self.leftover_fallback),
+            self.timed_step(
+                "shopping",
+                lambda dependencies: self.run_shopping(
+                    batch_inputs, [dependencies[name] for name in self.meal_step_names]
+                ),
+                depends_on=self.meal_step_names
+            ),
+            PipelineStep(
+                "cost_estimate",
+                lambda dependencies: self.estimate_cost(batch_inputs, dependencies["shopping"]),
+                depends_on=["shopping"]
+            ),
+            self.timed_step(
+                "budget",
+                lambda dependencies: self.run_budget(batch_inputs, dependencies["cost_estimate"]),
+                depends_on=["shopping", "cost_estimate"],
+                fallback=self.budget_fallback
+            ),
+            self.summary_step(step("summary"), llm_summary),
+        ])
@@ -0,0 +1,62 @@
+"""
+Gunicorn settings for the Alex Meal Planner API: gunicorn -c gunicorn.conf.py wsgi:app
+
+Crews spend most of their time waiting on the LLM and search APIs, so each
+worker serves requests from a thread pool. The master imports crewai and the
+crew service once before forking; each worker then builds its own service,
+caches and background threads, which don't survive a fork. Workers build the
+service in the background and report ready on /ready once it's done.
+
+On SIGTERM a worker stops accepting connections and fails /ready, finishes
+in-flight requests, then drains queued and running jobs before exiting.
+"""
+import os
+import signal
+import sys
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+workers = int(os.getenv("WEB_CONCURRENCY", 1))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 16))
+# Worker heartbeat timeout; gthread workers keep beating while requests run
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+# Time a stopping worker gets to finish in-flight crews before it is killed
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 300))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 0))
+accesslog = "-"
+
+
+def on_starting(server):
+    # Pay for the crewai import once; forked workers share the loaded modules
+    started = time.perf_counter()
+    import crew_service  # noqa: F401
+    server.log.info(f"Preloaded crew service modules in {time.perf_counter() - started:.1f}s")
+
+
+def post_worker_init(worker):
+    app_module = sys.modules["app"]
+    handle_exit = signal.getsignal(signal.SIGTERM)
+
+    def handle_term(signum, frame):
+        # Fail readiness right away so the load balancer stops routing here
+        app_module.draining.set()
+        worker.drain_deadline = time.monotonic() + worker.cfg.graceful_timeout
+        handle_exit(signum, frame)
+
+    signal.signal(signal.SIGTERM, handle_term)
+    worker.log.info(f"Worker {worker.pid} ready with {worker.cfg.threads} threads")
+
+
+def worker_exit(server, worker):
+    # Also called in the master when it reaps a worker; only the worker has work to drain
+    if os.getpid() != worker.pid or "app" not in sys.modules:
+        return
+    deadline = getattr(worker, "drain_deadline", time.monotonic() + worker.cfg.graceful_timeout)
+    # Leave a moment to exit before the master's kill
+    sys.modules["app"].drain(timeout=max(0.0, deadline - time.monotonic() - 1))
@@ -0,0 +1,309 @@
+import math
+import re
+from fractions import Fraction
+from models import GroceryItem, GroceryShoppingPlan, ShoppingCategory
+
+# Canonical unit -> (dimension, factor to the dimension's base unit)
+UNITS = {
+    "g": ("mass", 1.0),
+    "kg": ("mass", 1000.0),
+    "oz": ("mass", 28.3495),
+    "lb": ("mass", 453.592),
+    "ml": ("volume", 1.0),
+    "l": ("volume", 1000.0),
+    "tsp": ("volume", 4.92892),
+    "tbsp": ("volume", 14.7868),
+    "cup": ("volume", 236.588),
+    "fl oz": ("volume", 29.5735),
+    "pint": ("volume", 473.176),
+    "quart": ("volume", 946.353),
+    "gallon": ("volume", 3785.41),
+}
+
+UNIT_ALIASES = {
+    "gram": "g", "grams": "g", "g": "g",
+    "kilogram": "kg", "kilograms": "kg", "kg": "kg", "kgs": "kg",
+    "ounce": "oz", "ounces": "oz", "oz": "oz",
+    "pound": "lb", "pounds": "lb", "lb": "lb", "lbs": "lb",
+    "milliliter": "ml", "milliliters": "ml", "ml": "ml",
+    "liter": "l", "liters": "l", "litre": "l", "litres": "l", "l": "l",
+    "teaspoon": "tsp", "teaspoons": "tsp", "tsp": "tsp", "tsps": "tsp",
+    "tablespoon": "tbsp", "tablespoons": "tbsp", "tbsp": "tbsp", "tbsps": "tbsp", "tbs": "tbsp",
+    "cup": "cup", "cups": "cup", "c": "cup",
+    "fl oz": "fl oz", "fluid ounce": "fl oz", "fluid ounces": "fl oz",
+    "pint": "pint", "pints": "pint", "pt": "pint",
+    "quart": "quart", "quarts": "quart", "qt": "quart",
+    "gallon": "gallon", "gallons": "gallon", "gal": "gallon",
+    # Count-like units are kept as-is (singular) and only combine with themselves
+    "clove": "clove", "cloves": "clove",
+    "can": "can", "cans": "can",
+    "bunch": "bunch", "bunches": "bunch",
+    "head": "head", "heads": "head",
+    "slice": "slice", "slices": "slice",
+    "piece": "piece", "pieces": "piece", "pc": "piece", "pcs": "piece",
+    "package": "package", "packages": "package", "pkg": "package",
+    "bag": "bag", "bags": "bag",
+    "jar": "jar", "jars": "jar",
+    "bottle": "bottle", "bottles": "bottle",
+    "dozen": "dozen",
+    "pinch": "pinch", "pinches": "pinch",
+    "stalk": "stalk", "stalks": "stalk",
+    "sprig": "sprig", "sprigs": "sprig",
+}
+
+# Preparation and quality words that don't change what is bought
+DESCRIPTORS = {
+    "fresh", "frozen", "boneless", "skinless", "large", "small", "medium", "chopped", "diced",
+    "minced", "sliced", "grated", "shredded", "organic", "raw", "whole", "dried", "extra", "virgin",
+    "finely", "roughly", "thinly", "freshly", "crushed", "peeled", "cubed", "halved", "ripe",
+}
+
+# Currency symbols and codes in budgets and prices -> ISO 4217 code
+CURRENCIES = {
+    "$": "USD", "usd": "USD", "€": "EUR", "eur": "EUR", "£": "GBP", "gbp": "GBP",
+    "₹": "INR", "inr": "INR", "rs": "INR",
+}
+DEFAULT_CURRENCY = "USD"
+CURRENCY_SYMBOLS = {"USD": "$", "EUR": "€", "GBP": "£", "INR": "₹"}
+
+UNICODE_FRACTIONS = {"½": "1/2", "⅓": "1/3", "⅔": "2/3", "¼": "1/4", "¾": "3/4", "⅛": "1/8"}
+
+_NUMBER = r"\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?|\.\d+"
+_QUANTITY_PATTERN = re.compile(
+    rf"^\s*(?P<amount>{_NUMBER})(?:\s*(?:-|to)\s*(?P<upper>{_NUMBER}))?\s*(?P<rest>.*)$",
+    re.IGNORECASE,
+)
+_UNIT_PATTERN = re.compile(
+    r"^(?P<unit>" + "|".join(sorted((re.escape(alias) for alias in UNIT_ALIASES), key=len, reverse=True)) + r")(?:\.|\b)\s*(?:of\s+)?",
+    re.IGNORECASE,
+)
+
+
+def _to_number(text):
+    text = text.strip()
+    if " " in text:
+        whole, fraction = text.split(None, 1)
+        return float(int(whole) + Fraction(fraction))
+    return float(Fraction(text)) if "/" in text else float(text)
+
+
+def normalize_unit(unit):
+    """Map a unit spelling ('Tablespoons', 'lbs') to its canonical form, or None"""
+    if not unit:
+        return None
+    return UNIT_ALIASES.get(unit.strip().lower().rstrip("."))
+
+
+def parse_quantity(text):
+    """Split '1 1/2 cups flour' into (1.5, 'cup', 'flour').
+
+    Ranges ('2-3 lbs') use their upper bound. Returns (None, None, text)
+    when the string does not start with an amount.
+    """
+    text = str(text).strip()
+    for symbol, fraction in UNICODE_FRACTIONS.items():
+        text = text.replace(symbol, f" {fraction}")
+
+    match = _QUANTITY_PATTERN.match(text)
+    if not match:
+        return None, None, text
+
+    amount = _to_number(match.group("upper") or match.group("amount"))
+    rest = match.group("rest").strip()
+
+    unit_match = _UNIT_PATTERN.match(rest)
+    unit = None
+    if unit_match:
+        unit = normalize_unit(unit_match.group("unit"))
+        rest = rest[unit_match.end():].strip()
+
+    return amount, unit, rest
+
+
+def singularize(word):
+    if len(word) <= 3 or word.endswith(("ss", "us", "is")):
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("oes", "ches", "shes", "xes")):
+        return word[:-2]
+    return word[:-1] if word.endswith("s") else word
+
+
+def normalize_name(name):
+    """Comparable ingredient name: lower-case, singular words, no punctuation"""
+    words = re.sub(r"[^a-z0-9\s]", " ", str(name).lower()).split()
+    return " ".join(singularize(word) for word in words)
+
+
+def format_amount(amount):
+    if abs(amount - round(amount)) < 0.01:
+        return str(int(round(amount)))
+    return f"{amount:.2f}".rstrip("0").rstrip(".")
+
+
+def format_quantity(amount, unit):
+    if amount is None:
+        return ""
+    if unit is None:
+        return format_amount(amount)
+    plural = unit not in ("g", "kg", "oz", "lb", "ml", "l", "tsp", "tbsp", "fl oz", "dozen") and amount > 1
+    return f"{format_amount(amount)} {unit}{'s' if plural else ''}"
+
+
+def scale_quantity(text, factor, round_counts=False):
+    """Multiply the leading amount of a quantity or ingredient string ('1.5 lbs chicken') by factor.
+
+    With round_counts, counted items are rounded up to whole ones.
+    """
+    amount, unit, rest = parse_quantity(text)
+    if amount is None or factor == 1:
+        return text
+    amount *= factor
+    if round_counts and unit not in UNITS:
+        amount = math.ceil(amount - 1e-9)
+    return " ".join(part for part in (format_quantity(amount, unit), rest) if part)
+
+
+def to_base_amount(amount, unit):
+    """Convert an amount to kilograms, liters or a count, as (amount, base_unit).
+
+    Mass and volume units become 'kg' and 'l'; count-like units keep their own
+    name and bare numbers count as 'each'.
+    """
+    if unit is None:
+        return amount, "each"
+    if unit not in UNITS:
+        return amount, unit
+    dimension, factor = UNITS[unit]
+    return amount * factor / 1000, "kg" if dimension == "mass" else "l"
+
+
+def combine_quantities(quantities):
+    """Add up quantity strings ('1 lb', '8 oz', '2 cups').
+
+    Amounts in the same dimension are converted to the unit of the first one;
+    anything that can't be combined is kept and joined with ' + '.
+    """
+    totals = []  # [amount, unit, dimension]
+    leftovers = []
+    for quantity in quantities:
+        amount, unit, rest = parse_quantity(quantity)
+        if amount is None or rest:
+            if str(quantity).strip():
+                leftovers.append(str(quantity).strip())
+            continue
+
+        dimension, factor = UNITS.get(unit, (unit, 1.0))
+        for total in totals:
+            if total[2] == dimension:
+                total_factor = UNITS.get(total[1], (total[1], 1.0))[1]
+                total[0] += amount * factor / total_factor
+                break
+        else:
+            totals.append([amount, unit, dimension])
+
+    parts = [format_quantity(amount, unit) for amount, unit, _ in totals] + leftovers
+    return " + ".join(parts)
+
+
+def parse_price_range(text):
+    """Parse '$3-5', '$4.50' or 'about $3 to $4' into (low, high), or None"""
+    numbers = re.findall(r"\d+(?:\.\d+)?", str(text).replace(",", ""))
+    if not numbers:
+        return None
+    values = [float(number) for number in numbers[:2]]
+    return min(values), max(values)
+
+
+def parse_currency(text):
+    """ISO 4217 code of the currency in a price or budget ('€25' -> 'EUR'), or USD if none is given"""
+    for token in re.findall(r"[$€£₹]|[a-z]+", str(text).casefold()):
+        if token in CURRENCIES:
+            return CURRENCIES[token]
+    return DEFAULT_CURRENCY
+
+
+def format_money(amount, currency=DEFAULT_CURRENCY):
+    """'$12.50' for USD, '€12.50' for EUR; codes without a symbol are written after the amount"""
+    symbol = CURRENCY_SYMBOLS.get(currency)
+    return f"{symbol}{amount:.2f}" if symbol else f"{amount:.2f} {currency}"
+
+
+def format_price_range(low, high, currency=DEFAULT_CURRENCY):
+    if abs(high - low) < 0.005:
+        return format_money(low, currency)
+    symbol = CURRENCY_SYMBOLS.get(currency)
+    return f"{symbol}{low:.2f}-{high:.2f}" if symbol else f"{low:.2f}-{high:.2f} {currency}"
+
+
+def scale_price_range(text, factor):
+    """Multiply a plain price or price range ('$3-5') by factor; other text is returned unchanged"""
+    if factor == 1 or not re.fullmatch(r"\$?\s?\d+(?:\.\d+)?(?:\s*-\s*\$?\d+(?:\.\d+)?)?", str(text).strip()):
+        return text
+    low, high = parse_price_range(text)
+    return format_price_range(low * factor, high * factor)
+
+
+def sum_price_ranges(prices):
+    """Add up price strings, or return None if any of them can't be parsed"""
+    low = high = 0.0
+    for price in prices:
+        parsed = parse_price_range(price)
+        if parsed is None:
+            return None
+        low += parsed[0]
+        high += parsed[1]
+    return format_price_range(low, high)
+
+
+def merge_shopping_plan(plan, meal_plans=None):
+    """Merge a GroceryShoppingPlan's duplicate items into one GroceryItem each.
+
+    Items are matched by normalized name across all sections and stay in the
+    section where they first appear; their quantities and prices are added
+    up. If given, meal_plans replaces the plan's meal_plans.
+    """
+    merged = {}  # normalized name -> (section name, [items])
+    section_order = []
+    for section in plan.shopping_sections:
+        for item in section.items:
+            key = normalize_name(item.name)
+            if key not in merged:
+                merged[key] = (section.section_name, [])
+                if section.section_name not in section_order:
+                    section_order.append(section.section_name)
+            merged[key][1].append(item)
+
+    original_totals = {section.section_name: section.estimated_total for section in plan.shopping_sections}
+    sections = []
+    for section_name in section_order:
+        items = []
+        for item_section, duplicates in merged.values():
+            if item_section != section_name:
+                continue
+            first = duplicates[0]
+            if len(duplicates) == 1:
+                items.append(first)
+                continue
+            prices = [item.estimated_price for item in duplicates]
+            items.append(GroceryItem(
+                name=first.name,
+                quantity=combine_quantities([item.quantity for item in duplicates]),
+                estimated_price=sum_price_ranges(prices) or " + ".join(dict.fromkeys(prices)),
+                category=first.category,
+            ))
+
+        estimated_total = sum_price_ranges([item.estimated_price for item in items])
+        sections.append(ShoppingCategory(
+            section_name=section_name,
+            items=items,
+            estimated_total=estimated_total or original_totals[section_name],
+        ))
+
+    return GroceryShoppingPlan(
+        total_budget=plan.total_budget,
+        meal_plans=list(meal_plans) if meal_plans is not None else plan.meal_plans,
+        shopping_sections=sections,
+        shopping_tips=plan.shopping_tips,
+    )
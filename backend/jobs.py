@@ -0,0 +1,134 @@
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another job"""
+
+
+class Job:
+    """A single queued meal plan generation"""
+
+    def __init__(self, key):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in ("completed", "failed")
+
+    def to_dict(self):
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.status == "completed":
+            data["result"] = self.result
+        if self.status == "failed":
+            data["error"] = self.error
+        return data
+
+
+class JobManager:
+    """Runs jobs on a bounded worker pool, coalescing identical in-flight submissions"""
+
+    def __init__(self, max_workers=2, max_queue_depth=16, retention_seconds=3600):
+        self.max_queue_depth = max_queue_depth
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="meal-plan-job")
+        self._jobs = {}
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+        self._closed = False
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Queue fn(*args, **kwargs) under key.
+
+        Returns the job and whether it was newly created; an identical
+        in-flight job is returned instead of starting a duplicate.
+        Raises QueueFullError when max_queue_depth jobs are already in flight
+        or the manager is draining.
+        """
+        with self._lock:
+            if self._closed:
+                raise QueueFullError("Server is shutting down; retry on another instance")
+            self._prune()
+
+            existing = self._in_flight.get(key)
+            if existing is not None:
+                return existing, False
+
+            if len(self._in_flight) >= self.max_queue_depth:
+                raise QueueFullError(f"Job queue is full ({self.max_queue_depth} jobs in flight)")
+
+            job = Job(key)
+            self._jobs[job.id] = job
+            self._in_flight[key] = job
+
+        self._executor.submit(self._run, job, fn, args, kwargs)
+        return job, True
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        with self._lock:
+            queued = sum(1 for job in self._in_flight.values() if job.status == "queued")
+            return {
+                "queued": queued,
+                "running": len(self._in_flight) - queued,
+                "max_queue_depth": self.max_queue_depth,
+                "tracked_jobs": len(self._jobs),
+            }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+    def drain(self, timeout=None):
+        """Stop accepting jobs and wait for in-flight ones; False if timeout seconds passed first"""
+        with self._finished:
+            self._closed = True
+            return self._finished.wait_for(lambda: not self._in_flight, timeout)
+
+    def _run(self, job, fn, args, kwargs):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            job.result = fn(*args, **kwargs)
+            job.status = "completed"
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {str(e)}")
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                if self._in_flight.get(job.key) is job:
+                    del self._in_flight[job.key]
+                self._finished.notify_all()
+
+    def _prune(self):
+        # Forget finished jobs once clients have had time to collect them
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
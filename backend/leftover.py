@@ -22,3 +22,10 @@ class LeftoversCrew:
             config=self.tasks_config["leftover_task"],
             agent=self.leftover_manager()
         )
+
+    @task
+    def batch_leftover_task(self) -> Task:
+        return Task(
+            config=self.tasks_config["batch_leftover_task"],
+            agent=self.leftover_manager()
+        )
@@ -0,0 +1,124 @@
+import os
+import threading
+import yaml
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config")
+DEFAULT_MODELS_PATH = os.path.join(CONFIG_DIR, "models.yaml")
+DEFAULT_TASKS_PATH = os.path.join(CONFIG_DIR, "tasks.yaml")
+
+ROUTING_KEYS = ("model_tier", "timeout_seconds", "max_tokens")
+PRICE_KEYS = ("prompt_cost_per_million", "completion_cost_per_million")
+
+
+class Route:
+    """The tier, model, limits and LLM chosen for one task"""
+
+    def __init__(self, task_name, tier, model, timeout_seconds, max_tokens, prompt_cost, completion_cost, llm=None):
+        self.task_name = task_name
+        self.tier = tier
+        self.model = model
+        self.timeout_seconds = timeout_seconds
+        self.max_tokens = max_tokens
+        self.prompt_cost = prompt_cost
+        self.completion_cost = completion_cost
+        self.llm = llm
+
+    def cost(self, prompt_tokens, completion_tokens):
+        """USD cost of the given token usage on this route's model"""
+        return (prompt_tokens * self.prompt_cost + completion_tokens * self.completion_cost) / 1e6
+
+    def to_dict(self):
+        return {
+            "tier": self.tier,
+            "model": self.model,
+            "timeout_seconds": self.timeout_seconds,
+            "max_tokens": self.max_tokens,
+        }
+
+
+class LLMRouter:
+    """Routes each crew task to an LLM tier.
+
+    Tiers and the routing of tasks built in crew_service.py live in
+    config/models.yaml; tasks defined in config/tasks.yaml carry model_tier,
+    timeout_seconds and max_tokens next to their description, under their
+    name without the '_task' suffix. One LLM is built per tier and limits,
+    calling its provider through the shared outbound client (outbound.py).
+    """
+
+    def __init__(self, models_path=None, tasks_path=None, llm=None):
+        with open(models_path or DEFAULT_MODELS_PATH) as f:
+            config = yaml.safe_load(f)
+        with open(tasks_path or DEFAULT_TASKS_PATH) as f:
+            yaml_tasks = yaml.safe_load(f) or {}
+
+        self.tiers = config["tiers"]
+        for tier_name, tier in self.tiers.items():
+            model = os.getenv(f"LLM_{tier_name.upper()}_MODEL")
+            if model:
+                tier["model"] = model
+        self.default_tier = config.get("default_tier") or next(iter(self.tiers))
+        self.force_tier = os.getenv("LLM_FORCE_TIER") or None
+        self.defaults = config.get("defaults", {})
+
+        self.tasks = dict(config.get("tasks") or {})
+        for name, task in yaml_tasks.items():
+            routing = {key: task[key] for key in ROUTING_KEYS if key in task}
+            if routing:
+                self.tasks[name.removesuffix("_task")] = routing
+
+        for tier_name in [self.default_tier, self.force_tier] + [t.get("model_tier") for t in self.tasks.values()]:
+            if tier_name and tier_name not in self.tiers:
+                raise ValueError(f"Unknown model tier '{tier_name}'; expected one of: {', '.join(self.tiers)}")
+
+        # Replaces every tier's LLM, e.g. with the offline benchmark fake
+        self.llm = llm
+        self._llms = {}
+        self._lock = threading.Lock()
+
+    def route(self, task_name, build_llm=True):
+        """The Route for task_name; unknown tasks get the default tier and limits"""
+        settings = {**self.defaults, **self.tasks.get(task_name, {})}
+        tier_name = self.force_tier or settings.get("model_tier") or self.default_tier
+        tier = self.tiers[tier_name]
+        timeout_seconds = settings.get("timeout_seconds")
+        max_tokens = settings.get("max_tokens")
+
+        llm = None
+        if build_llm:
+            llm = self.llm or self._tier_llm(tier_name, timeout_seconds, max_tokens)
+        return Route(
+            task_name,
+            tier_name,
+            self.llm.model if self.llm else tier["model"],
+            timeout_seconds,
+            max_tokens,
+            0.0 if self.llm else tier.get("prompt_cost_per_million", 0.0),
+            0.0 if self.llm else tier.get("completion_cost_per_million", 0.0),
+            llm,
+        )
+
+    def default_llm(self):
+        return self.route(None).llm
+
+    def describe(self):
+        """Tiers and per-task routes, without building any LLM"""
+        return {
+            "default_tier": self.default_tier,
+            "forced_tier": self.force_tier,
+            "tiers": {tier_name: tier["model"] for tier_name, tier in self.tiers.items()},
+            "tasks": {task_name: self.route(task_name, build_llm=False).to_dict() for task_name in self.tasks},
+        }
+
+    def _tier_llm(self, tier_name, timeout_seconds, max_tokens):
+        key = (tier_name, timeout_seconds, max_tokens)
+        with self._lock:
+            if key not in self._llms:
+                # Imported here so the router can describe routes without loading crewai
+                from resilient_llm import ResilientLLM, provider_name
+
+                options = {k: v for k, v in self.tiers[tier_name].items() if k not in PRICE_KEYS}
+                self._llms[key] = ResilientLLM(
+                    provider_name(options["model"]), **options, timeout=timeout_seconds, max_tokens=max_tokens
+                )
+            return self._llms[key]
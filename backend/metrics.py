@@ -0,0 +1,343 @@
+import contextvars
+import copy
+import threading
+import time
+from contextlib import contextmanager
+
+DURATION_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+FAST_DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with optional labels"""
+
+    type_name = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name + "_total", _format_labels(self.labelnames, key), value) for key, value in items]
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels"""
+
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        samples = []
+        for key, (counts, total) in items:
+            for bound, count in zip(self.buckets, counts):
+                labels = _format_labels(self.labelnames, key, [("le", _format_value(bound))])
+                samples.append((self.name + "_bucket", labels, count))
+            labels = _format_labels(self.labelnames, key)
+            samples.append((self.name + "_sum", labels, total))
+            samples.append((self.name + "_count", labels, counts[-1]))
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    "alex_http_request_duration_seconds", "HTTP request latency", ["method", "endpoint", "status"]
+))
+TASK_DURATION = REGISTRY.register(Histogram(
+    "alex_task_duration_seconds", "Wall-clock duration of each crew task", ["task"]
+))
+TOOL_CALL_DURATION = REGISTRY.register(Histogram(
+    "alex_tool_call_duration_seconds", "Duration of agent tool calls", ["tool", "task", "cache"],
+    buckets=FAST_DURATION_BUCKETS
+))
+SERIALIZATION_DURATION = REGISTRY.register(Histogram(
+    "alex_serialization_duration_seconds", "Time spent converting task outputs to JSON-ready data",
+    buckets=FAST_DURATION_BUCKETS
+))
+LLM_TOKENS = REGISTRY.register(Counter(
+    "alex_llm_tokens", "LLM tokens used per task", ["task", "type"]
+))
+LLM_REQUESTS = REGISTRY.register(Counter(
+    "alex_llm_requests", "Successful LLM requests per task", ["task"]
+))
+TASK_RETRIES = REGISTRY.register(Counter(
+    "alex_task_retries", "Agent execution and guardrail retries per task", ["task"]
+))
+TASK_FAILURES = REGISTRY.register(Counter(
+    "alex_task_failures", "Crew tasks that raised an error", ["task"]
+))
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "alex_cache_lookups", "Cache lookups by cache and result", ["cache", "result"]
+))
+MODEL_TASK_DURATION = REGISTRY.register(Histogram(
+    "alex_model_task_duration_seconds", "Wall-clock duration of crew tasks by the model they were routed to", ["model", "tier"]
+))
+MODEL_TOKENS = REGISTRY.register(Counter(
+    "alex_model_tokens", "LLM tokens used per model", ["model", "type"]
+))
+LLM_COST = REGISTRY.register(Counter(
+    "alex_llm_cost_usd", "Estimated LLM spend in USD, from the token prices in config/models.yaml", ["model", "task"]
+))
+TASK_TIMEOUTS = REGISTRY.register(Counter(
+    "alex_task_timeouts", "Crew tasks that ran past their timeout", ["task"]
+))
+OUTBOUND_CALLS = REGISTRY.register(Counter(
+    "alex_outbound_calls", "Calls to external providers by outcome (success, retried, failed, error, rejected)", ["provider", "outcome"]
+))
+OUTBOUND_THROTTLE = REGISTRY.register(Histogram(
+    "alex_outbound_throttle_seconds", "Time outbound calls waited for their provider's rate limit", ["provider"],
+    buckets=FAST_DURATION_BUCKETS
+))
+ADMISSIONS = REGISTRY.register(Counter(
+    "alex_admissions", "Admission decisions for crew runs by outcome", ["outcome"]
+))
+ADMISSION_WAIT = REGISTRY.register(Histogram(
+    "alex_admission_wait_seconds", "Time admitted requests waited in the queue for a free crew slot"
+))
+CHECKPOINT_RESUMES = REGISTRY.register(Counter(
+    "alex_checkpoint_resumes", "Task outputs restored from the checkpoint of a failed run", ["task"]
+))
+WARMUP_PLANS = REGISTRY.register(Counter(
+    "alex_warmup_plans", "Catalog plans visited by the warm-up job, by outcome", ["outcome"]
+))
+
+
+_current_trace = contextvars.ContextVar("alex_request_trace", default=None)
+_current_task = contextvars.ContextVar("alex_current_task", default=None)
+
+
+class RequestTrace:
+    """Per-request timing breakdown, filled in by the service, tools and caches"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.tasks = {}
+        self.cache_lookups = {}
+        self.serialization_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _task(self, task_name):
+        return self.tasks.setdefault(task_name or "unknown", {
+            "duration_seconds": 0.0,
+            "llm_tokens": {"prompt": 0, "completion": 0},
+            "llm_requests": 0,
+            "retries": 0,
+            "model": None,
+            "cost_usd": 0.0,
+            "tool_calls": {"count": 0, "seconds": 0.0, "cache_hits": 0},
+        })
+
+    def record_task(self, task_name, duration, prompt_tokens=0, completion_tokens=0, llm_requests=0, retries=0,
+                    model=None, cost_usd=0.0):
+        with self._lock:
+            task = self._task(task_name)
+            task["duration_seconds"] = round(task["duration_seconds"] + duration, 3)
+            task["llm_tokens"]["prompt"] += prompt_tokens
+            task["llm_tokens"]["completion"] += completion_tokens
+            task["llm_requests"] += llm_requests
+            task["retries"] += retries
+            task["model"] = model or task["model"]
+            task["cost_usd"] = round(task["cost_usd"] + cost_usd, 6)
+
+    def record_timeout(self, task_name):
+        with self._lock:
+            self._task(task_name)["timed_out"] = True
+
+    def record_tool_call(self, task_name, duration, cache_hit):
+        with self._lock:
+            calls = self._task(task_name)["tool_calls"]
+            calls["count"] += 1
+            calls["seconds"] = round(calls["seconds"] + duration, 4)
+            calls["cache_hits"] += int(cache_hit)
+
+    def record_cache_lookup(self, cache, result):
+        with self._lock:
+            self.cache_lookups[cache] = result
+
+    def record_serialization(self, duration):
+        with self._lock:
+            self.serialization_seconds += duration
+
+    def to_dict(self):
+        finished = self.finished or time.perf_counter()
+        with self._lock:
+            models = {}
+            for task in self.tasks.values():
+                if not task["model"]:
+                    continue
+                model = models.setdefault(task["model"], {"tasks": 0, "duration_seconds": 0.0, "cost_usd": 0.0})
+                model["tasks"] += 1
+                model["duration_seconds"] = round(model["duration_seconds"] + task["duration_seconds"], 3)
+                model["cost_usd"] = round(model["cost_usd"] + task["cost_usd"], 6)
+            return {
+                "total_seconds": round(finished - self.started, 3),
+                "tasks": copy.deepcopy(self.tasks),
+                "models": models,
+                "llm_cost_usd": round(sum(model["cost_usd"] for model in models.values()), 6),
+                "serialization_seconds": round(self.serialization_seconds, 4),
+                "cache_lookups": dict(self.cache_lookups),
+            }
+
+
+@contextmanager
+def trace_request():
+    """Collect a RequestTrace for everything run in this context, including pipeline steps"""
+    trace = RequestTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        trace.finished = time.perf_counter()
+        _current_trace.reset(token)
+
+
+@contextmanager
+def task_scope(task_name):
+    """Attribute tool calls made in this context to task_name"""
+    token = _current_task.set(task_name)
+    try:
+        yield
+    finally:
+        _current_task.reset(token)
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def record_task(task_name, duration, prompt_tokens=0, completion_tokens=0, llm_requests=0, retries=0,
+                model=None, tier=None, cost_usd=0.0):
+    TASK_DURATION.observe(duration, task=task_name)
+    LLM_TOKENS.inc(prompt_tokens, task=task_name, type="prompt")
+    LLM_TOKENS.inc(completion_tokens, task=task_name, type="completion")
+    LLM_REQUESTS.inc(llm_requests, task=task_name)
+    if retries:
+        TASK_RETRIES.inc(retries, task=task_name)
+    if model:
+        MODEL_TASK_DURATION.observe(duration, model=model, tier=tier or "")
+        MODEL_TOKENS.inc(prompt_tokens, model=model, type="prompt")
+        MODEL_TOKENS.inc(completion_tokens, model=model, type="completion")
+        LLM_COST.inc(cost_usd, model=model, task=task_name)
+    trace = _current_trace.get()
+    if trace:
+        trace.record_task(task_name, duration, prompt_tokens, completion_tokens, llm_requests, retries, model, cost_usd)
+
+
+def record_timeout(task_name):
+    TASK_TIMEOUTS.inc(task=task_name)
+    trace = _current_trace.get()
+    if trace:
+        trace.record_timeout(task_name)
+
+
+def record_tool_call(tool, duration, cache_hit):
+    task_name = _current_task.get()
+    cache_result = "hit" if cache_hit else "miss"
+    TOOL_CALL_DURATION.observe(duration, tool=tool, task=task_name or "unknown", cache=cache_result)
+    CACHE_LOOKUPS.inc(cache=tool, result=cache_result)
+    trace = _current_trace.get()
+    if trace:
+        trace.record_tool_call(task_name, duration, cache_hit)
+
+
+def record_cache_lookup(cache, hit):
+    result = "hit" if hit else "miss"
+    CACHE_LOOKUPS.inc(cache=cache, result=result)
+    trace = _current_trace.get()
+    if trace:
+        trace.record_cache_lookup(cache, result)
+
+
+def record_serialization(duration):
+    SERIALIZATION_DURATION.observe(duration)
+    trace = _current_trace.get()
+    if trace:
+        trace.record_serialization(duration)
+
+
+def record_outbound_call(provider, outcome):
+    OUTBOUND_CALLS.inc(provider=provider, outcome=outcome)
+
+
+def record_outbound_throttle(provider, waited):
+    OUTBOUND_THROTTLE.observe(waited, provider=provider)
+
+
+def record_admission(outcome, waited=None):
+    ADMISSIONS.inc(outcome=outcome)
+    if waited is not None:
+        ADMISSION_WAIT.observe(waited)
+
+
+def record_checkpoint_resume(task_name):
+    CHECKPOINT_RESUMES.inc(task=task_name)
+
+
+def record_warmup(outcome):
+    WARMUP_PLANS.inc(outcome=outcome)
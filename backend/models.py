@@ -1,5 +1,11 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Literal, Optional
+
+class PriceRange(BaseModel):
+    """Numeric price range"""
+    low: float = Field(..., description="Lowest expected price")
+    high: float = Field(..., description="Highest expected price")
+    currency: str = Field(default="USD", description="ISO 4217 currency code (default: USD)")
 
 class GroceryItem(BaseModel):
     """Individual grocery item"""
@@ -7,6 +13,7 @@ class GroceryItem(BaseModel):
     quantity: str = Field(..., description="Quantity needed (for example, '2 lbs', '1 gallon')")
     estimated_price: str = Field(..., description="Estimated price (for example, '$3-5')")
     category: str = Field(..., description="Store section (for example, 'Produce', 'Dairy')")
+    price: Optional[PriceRange] = Field(default=None, description="Leave empty; filled in by the cost model")
 
 class MealPlan(BaseModel):
     """Simple meal plan"""
@@ -20,6 +27,7 @@ class ShoppingCategory(BaseModel):
     section_name: str = Field(..., description="Store section (for example, 'Produce', 'Dairy')")
     items: List[GroceryItem] = Field(default_factory=list, description="Items in this section")
     estimated_total: str = Field(..., description="Estimated cost for this section")
+    total: Optional[PriceRange] = Field(default=None, description="Leave empty; filled in by the cost model")
 
 class GroceryShoppingPlan(BaseModel):
     """Complete simplified shopping plan"""
@@ -27,6 +35,39 @@ class GroceryShoppingPlan(BaseModel):
     meal_plans: List[MealPlan] = Field(default_factory=list, description="Planned meals")
     shopping_sections: List[ShoppingCategory] = Field(default_factory=list, description="Organized by store sections")
     shopping_tips: List[str] = Field(default_factory=list, description="Money-saving and efficiency tips")
+    total: Optional[PriceRange] = Field(default=None, description="Leave empty; filled in by the cost model")
+    budget: Optional[PriceRange] = Field(default=None, description="Leave empty; filled in by the cost model")
+
+class Substitution(BaseModel):
+    """Cheaper ingredient proposed to bring a shopping plan within budget"""
+    item: str = Field(..., description="Name of the grocery item to replace")
+    replacement: str = Field(..., description="Cheaper ingredient to buy instead")
+    quantity: str = Field(..., description="Quantity of the replacement")
+    savings: PriceRange = Field(..., description="Expected savings")
+
+class BudgetAdvice(BaseModel):
+    """Budget advisor's analysis of a shopping plan"""
+    analysis: str = Field(..., description="Budget analysis in Markdown, based on the given cost breakdown")
+    money_saving_tips: List[str] = Field(default_factory=list, description="Practical money-saving tips")
+
+class BudgetAnalysis(BudgetAdvice):
+    """Budget advice plus the numeric budget check computed by the cost model"""
+    total: Optional[PriceRange] = Field(default=None, description="Estimated cost of the shopping plan")
+    budget: Optional[PriceRange] = Field(default=None, description="Requested budget")
+    within_budget: Optional[bool] = Field(default=None, description="Whether the highest estimate fits the budget")
+    over_budget_by: float = Field(default=0.0, description="Amount the highest estimate exceeds the budget by")
+    unpriced_items: int = Field(default=0, description="Items with no known price")
+    substitutions: List[Substitution] = Field(default_factory=list, description="Swaps that bring the plan within budget")
+    rebalanced_total: Optional[PriceRange] = Field(default=None, description="Estimated cost after the substitutions")
+
+class SectionAssignment(BaseModel):
+    """Store section chosen for one grocery item"""
+    name: str = Field(..., description="Name of the grocery item, exactly as given")
+    section: str = Field(..., description="Store section (for example, 'Produce', 'Dairy & Eggs')")
+
+class SectionAssignments(BaseModel):
+    """Store sections for grocery items the shopping engine couldn't classify"""
+    assignments: List[SectionAssignment] = Field(default_factory=list, description="One assignment per item")
 
 class MealPlanRequest(BaseModel):
     """Request model for meal planning"""
@@ -35,3 +76,14 @@ class MealPlanRequest(BaseModel):
     budget: str = Field(..., description="Budget for the meal plan")
     dietary_restrictions: List[str] = Field(default_factory=list, description="Dietary restrictions if any")
     cooking_skill: str = Field(default="beginner", description="Cooking skill level (default: beginner)")
+    cache: Literal["default", "bypass"] = Field(default="default", description="Result cache behaviour: 'default' or 'bypass' (default: default)")
+    llm_summary: bool = Field(default=False, description="Have an LLM write the summary instead of rendering it from the other outputs (default: false)")
+
+class BatchMealPlanRequest(BaseModel):
+    """Request model for planning several meals with one shared shopping list"""
+    meals: List[str] = Field(..., min_length=1, max_length=7, description="Names of the meals to plan (1-7)")
+    servings: int = Field(..., description="Number of servings per meal")
+    budget: str = Field(..., description="Total budget for all meals")
+    dietary_restrictions: List[str] = Field(default_factory=list, description="Dietary restrictions if any")
+    cooking_skill: str = Field(default="beginner", description="Cooking skill level (default: beginner)")
+    llm_summary: bool = Field(default=False, description="Have an LLM write the summary instead of rendering it from the other outputs (default: false)")
@@ -0,0 +1,250 @@
+import logging
+import os
+import random
+import threading
+import time
+import requests
+import yaml
+from requests.adapters import HTTPAdapter
+import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "outbound.yaml")
+
+# Rate limits, timeouts and server errors; anything else (bad requests, auth
+# errors) means the provider answered and a retry would fail the same way
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit breaker is open"""
+
+    def __init__(self, provider, retry_after):
+        super().__init__(f"{provider} is unavailable after repeated failures; retry in {retry_after:.0f}s")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+def status_code(error):
+    """HTTP status of a failed call: requests errors carry a response, litellm errors a status_code"""
+    response = getattr(error, "response", None)
+    if isinstance(response, requests.Response):
+        return response.status_code
+    return getattr(error, "status_code", None)
+
+
+def is_retryable(error):
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    return status_code(error) in RETRYABLE_STATUS
+
+
+def retry_after(error):
+    """Seconds from a Retry-After header on the failed response, if any"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Rate limiter allowing bursts of up to capacity calls, refilled at rate calls per second.
+
+    Callers reserve a token in arrival order and sleep until it is theirs, so
+    waiting callers are served first come, first served. A rate of 0 disables the limit.
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, sleeping until it is available; returns the seconds waited"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate) - 1
+            self._updated = now
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class CircuitBreaker:
+    """Stops calling a provider after failure_threshold consecutive failures.
+
+    While open, calls are rejected for reset_seconds; then one trial call is let
+    through (half-open), which closes the circuit on success or reopens it.
+    """
+
+    def __init__(self, provider, failure_threshold=5, reset_seconds=30):
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half_open" if time.monotonic() - self.opened_at >= self.reset_seconds else "open"
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go through now"""
+        with self._lock:
+            if self.opened_at is None:
+                return
+            remaining = self.opened_at + self.reset_seconds - time.monotonic()
+            if remaining > 0 or self._trial_running:
+                raise CircuitOpenError(self.provider, max(remaining, 1.0))
+            self._trial_running = True
+
+    def record_success(self):
+        with self._lock:
+            if self.opened_at is not None:
+                logger.info(f"Circuit for {self.provider} closed")
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or (self.opened_at is None and self.failures >= self.failure_threshold):
+                logger.warning(f"Circuit for {self.provider} opened after {self.failures} failures")
+                self.opened_at = time.monotonic()
+            self._trial_running = False
+
+
+class OutboundClient:
+    """Calls to one provider, shared by every request and thread.
+
+    HTTP requests reuse keep-alive connections from a pooled session. Every
+    call waits for the provider's rate limit, is retried on rate limits,
+    timeouts and server errors with exponential backoff and full jitter
+    (honouring Retry-After), and fails fast while the circuit breaker is open.
+    """
+
+    def __init__(self, provider, rate_per_second=0, burst=1, max_attempts=3, backoff_base_seconds=0.5,
+                 backoff_max_seconds=8, failure_threshold=5, reset_seconds=30, timeout_seconds=10, pool_size=10):
+        self.provider = provider
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_base = backoff_base_seconds
+        self.backoff_max = backoff_max_seconds
+        self.timeout = timeout_seconds
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.breaker = CircuitBreaker(provider, failure_threshold, reset_seconds)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def call(self, fn, *args, **kwargs):
+        """fn(*args, **kwargs) behind the rate limiter, retries and circuit breaker"""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                metrics.record_outbound_call(self.provider, "rejected")
+                raise
+            waited = self.bucket.acquire()
+            if waited:
+                metrics.record_outbound_throttle(self.provider, waited)
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable(e):
+                    # The provider answered; the request itself is at fault
+                    self.breaker.record_success()
+                    metrics.record_outbound_call(self.provider, "error")
+                    raise
+                self.breaker.record_failure()
+                if attempt == self.max_attempts:
+                    metrics.record_outbound_call(self.provider, "failed")
+                    raise
+                delay = self.backoff(attempt, e)
+                logger.warning(
+                    f"{self.provider} call failed ({status_code(e) or type(e).__name__}), "
+                    f"retrying in {delay:.2f}s (attempt {attempt}/{self.max_attempts})"
+                )
+                metrics.record_outbound_call(self.provider, "retried")
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            metrics.record_outbound_call(self.provider, "success")
+            return result
+
+    def request(self, method, url, **kwargs):
+        """An HTTP request on the pooled session; error statuses raise requests.HTTPError"""
+        kwargs.setdefault("timeout", self.timeout)
+
+        def send():
+            response = self.session.request(method, url, **kwargs)
+            response.raise_for_status()
+            return response
+
+        return self.call(send)
+
+    def backoff(self, attempt, error):
+        """Full-jitter exponential backoff, or the provider's Retry-After if that is longer"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+        return min(self.backoff_max, max(delay, retry_after(error) or 0.0))
+
+    def stats(self):
+        return {
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "rate_per_second": self.bucket.rate,
+            "burst": self.bucket.capacity,
+            "max_attempts": self.max_attempts,
+        }
+
+
+def load_config(path=None):
+    """Per-provider client settings from config/outbound.yaml, with OUTBOUND_<PROVIDER>_<SETTING> overrides"""
+    with open(path or os.getenv("OUTBOUND_CONFIG_PATH", DEFAULT_CONFIG_PATH)) as f:
+        config = yaml.safe_load(f)
+    defaults = config.get("defaults", {})
+    providers = {}
+    for provider, settings in (config.get("providers") or {}).items():
+        providers[provider] = {**defaults, **(settings or {})}
+    return defaults, providers
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(provider):
+    """The shared OutboundClient for a provider; providers missing from the config get the defaults"""
+    with _clients_lock:
+        if provider not in _clients:
+            defaults, providers = load_config()
+            settings = dict(providers.get(provider, defaults))
+            for setting, value in settings.items():
+                override = os.getenv(f"OUTBOUND_{provider.upper()}_{setting.upper()}")
+                if override is not None:
+                    number = float(override)
+                    settings[setting] = int(number) if isinstance(value, int) and number.is_integer() else number
+            _clients[provider] = OutboundClient(provider, **settings)
+        return _clients[provider]
+
+
+def stats():
+    """Circuit breaker and limit settings of every client created so far"""
+    with _clients_lock:
+        clients = dict(_clients)
+    return {provider: client.stats() for provider, client in clients.items()}
@@ -0,0 +1,134 @@
+import contextvars
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class StepTimeoutError(Exception):
+    """A pipeline step ran past its timeout and had no fallback"""
+
+
+class PipelineStep:
+    """A named unit of work that runs once all of its dependencies have finished.
+
+    run receives a dict of the outputs of the steps it depends on. If the step
+    is still running after timeout seconds, the pipeline stops waiting for it and
+    uses on_timeout(dependencies) as its output, or fails without on_timeout.
+    """
+
+    def __init__(self, name, run, depends_on=(), timeout=None, on_timeout=None):
+        self.name = name
+        self.run = run
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout
+        self.on_timeout = on_timeout
+
+
+class PipelineResult:
+    """Outputs and wall-clock timings of a pipeline run"""
+
+    def __init__(self):
+        self.outputs = {}
+        self.timings = {}
+        self.timed_out = []
+        self.total_seconds = 0.0
+
+    def timings_dict(self):
+        return {
+            "total_seconds": round(self.total_seconds, 3),
+            "tasks": self.timings,
+        }
+
+
+class Pipeline:
+    """Dependency DAG of steps; every step whose dependencies are met runs concurrently"""
+
+    def __init__(self, steps, max_workers=None):
+        self.steps = {step.name: step for step in steps}
+        self.max_workers = max_workers or len(self.steps)
+        self._validate()
+
+    def run(self, on_step_complete=None):
+        """Run every step, calling on_step_complete(name, output, timing) as each one finishes"""
+        result = PipelineResult()
+        pending = dict(self.steps)
+        running = {}
+        deadlines = {}
+        started = time.perf_counter()
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pipeline-step")
+        try:
+            while pending or running:
+                for name, step in list(pending.items()):
+                    if all(dep in result.outputs for dep in step.depends_on):
+                        del pending[name]
+                        dependencies = {dep: result.outputs[dep] for dep in step.depends_on}
+                        # Steps see the caller's context variables (e.g. the request trace)
+                        future = executor.submit(contextvars.copy_context().run, self._timed, step, dependencies)
+                        running[future] = name
+                        if step.timeout:
+                            deadlines[future] = (time.perf_counter() + step.timeout, dependencies)
+
+                wait_timeout = None
+                if deadlines:
+                    wait_timeout = max(0.0, min(deadline for deadline, _ in deadlines.values()) - time.perf_counter())
+                done, _ = wait(running, timeout=wait_timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    deadlines.pop(future, None)
+                    name = running.pop(future)
+                    output, step_started, step_finished = future.result()
+                    result.outputs[name] = output
+                    result.timings[name] = {
+                        "started_at": round(step_started - started, 3),
+                        "duration_seconds": round(step_finished - step_started, 3),
+                    }
+                    if on_step_complete:
+                        on_step_complete(name, output, result.timings[name])
+
+                now = time.perf_counter()
+                for future, (deadline, dependencies) in list(deadlines.items()):
+                    if now < deadline:
+                        continue
+                    # The step's thread can't be stopped; it finishes in the background, unused
+                    name = running.pop(future)
+                    del deadlines[future]
+                    step = self.steps[name]
+                    if step.on_timeout is None:
+                        raise StepTimeoutError(f"Step '{name}' timed out after {step.timeout}s")
+                    result.outputs[name] = step.on_timeout(dependencies)
+                    result.timed_out.append(name)
+                    result.timings[name] = {
+                        "started_at": round(deadline - step.timeout - started, 3),
+                        "duration_seconds": round(step.timeout, 3),
+                        "timed_out": True,
+                    }
+                    if on_step_complete:
+                        on_step_complete(name, result.outputs[name], result.timings[name])
+        finally:
+            # On failure, don't start anything else and don't wait for stragglers
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        result.total_seconds = time.perf_counter() - started
+        return result
+
+    @staticmethod
+    def _timed(step, dependencies):
+        step_started = time.perf_counter()
+        output = step.run(dependencies)
+        return output, step_started, time.perf_counter()
+
+    def _validate(self):
+        for step in self.steps.values():
+            for dep in step.depends_on:
+                if dep not in self.steps:
+                    raise ValueError(f"Step '{step.name}' depends on unknown step '{dep}'")
+
+        # Kahn's algorithm: if not every step can be ordered, there is a cycle
+        remaining = {name: set(step.depends_on) for name, step in self.steps.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Pipeline has a dependency cycle among: {', '.join(sorted(remaining))}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import threading
+from cache_store import SQLiteCache
+from ingredients import DEFAULT_CURRENCY, parse_currency, parse_price_range
+from semantic_cache import SemanticPlanIndex, describe_request, rescale_result
+import metrics
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "plans.sqlite3")
+
+
+def normalize_text(value):
+    """Case-fold and collapse whitespace"""
+    return " ".join(str(value).casefold().split())
+
+
+def normalize_budget(budget):
+    """Normalize a budget string such as '$30', '30 dollars' or 'USD 30.00' to '30.00'.
+
+    Ranges keep both ends ('$20-30' -> '20.00-30.00') and currencies other
+    than USD are appended ('€30' -> '30.00 EUR').
+    """
+    price_range = parse_price_range(budget)
+    if not price_range:
+        return normalize_text(budget)
+    low, high = price_range
+    normalized = f"{high:.2f}" if low == high else f"{low:.2f}-{high:.2f}"
+    currency = parse_currency(budget)
+    return normalized if currency == DEFAULT_CURRENCY else f"{normalized} {currency}"
+
+
+def request_key(request):
+    """Content-addressed key for a MealPlanRequest"""
+    canonical = {
+        "meal_name": normalize_text(request.meal_name),
+        "servings": request.servings,
+        "budget": normalize_budget(request.budget),
+        "dietary_restrictions": sorted({normalize_text(r) for r in request.dietary_restrictions}),
+        "cooking_skill": normalize_text(request.cooking_skill),
+    }
+    if request.llm_summary:
+        # Kept apart from rendered summaries; absent otherwise so existing keys still match
+        canonical["llm_summary"] = True
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def is_cacheable(result):
+    """Only fully serialized results are cached, not the simplified or timed out fallbacks"""
+    return result.get("status") == "completed" and "note" not in result and not result.get("degraded_tasks")
+
+
+class PlanCache:
+    """Persistent cache of generated meal plans keyed on the normalized request.
+
+    Exact misses fall back to the semantic index, which serves a stored plan
+    for a near-identical meal name, rescaled to the requested servings.
+    Served near matches carry a "cache_match" entry describing the stored plan
+    and a summary rendered from the rescaled outputs.
+
+    Each plan's request is stored beside it, so a plan can be looked up by its
+    key (the plan id) and revised.
+    """
+
+    def __init__(self, path=None, ttl=None, max_entries=None, semantic=None):
+        path = path or os.getenv("PLAN_CACHE_PATH", DEFAULT_CACHE_PATH)
+        max_entries = max_entries or int(os.getenv("PLAN_CACHE_MAX_ENTRIES", 1000))
+        ttl = ttl or int(os.getenv("PLAN_CACHE_TTL", 86400))
+        self.store = SQLiteCache(path, table="meal_plans", max_entries=max_entries, default_ttl=ttl)
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if semantic is None:
+            semantic = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+        # Request descriptions live beside the plans so the index can be rebuilt on startup
+        self.requests = SQLiteCache(path, table="meal_plan_requests", max_entries=max_entries, default_ttl=ttl)
+        self.semantic = None
+        if semantic:
+            self.semantic = SemanticPlanIndex()
+            for entry in self.requests.values():
+                if entry.get("indexed", True):
+                    self.semantic.add(entry["key"], entry["request"])
+
+    def get(self, request):
+        result = self.store.get(request_key(request))
+        # Rescaled plans get a rendered summary, so LLM summaries are only served exactly
+        if result is None and self.semantic and not request.llm_summary:
+            result = self.get_similar(request)
+            metrics.record_cache_lookup("plan_semantic", hit=result is not None)
+            if result is not None:
+                with self._lock:
+                    self.similar_hits += 1
+                return result
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def contains(self, request):
+        """Whether an exact plan for request is cached, without counting a lookup or refreshing its LRU position"""
+        return self.store.contains(request_key(request))
+
+    def get_similar(self, request):
+        """The best compatible plan stored for a near-identical request, rescaled, or None"""
+        matches = self.semantic.find(request, limit=1)
+        if not matches:
+            return None
+        key, similarity, stored = matches[0]
+        result = self.store.get(key)
+        if result is None:
+            # Expired or evicted from the plan store; the next lookup finds the runner-up
+            self.semantic.remove(key)
+            return None
+        result = rescale_result(result, stored["servings"], request.servings, request.budget)
+        result["cache_match"] = {
+            "meal_name": stored["meal_name"],
+            "servings": stored["servings"],
+            "similarity": round(similarity, 4),
+        }
+        return result
+
+    def get_plan(self, plan_id):
+        """The stored (request fields, result) for a plan id, or None"""
+        result = self.store.get(plan_id)
+        entry = self.requests.get(plan_id)
+        if result is None or entry is None or "params" not in entry:
+            return None
+        return entry["params"], result
+
+    def set(self, request, result):
+        key = request_key(request)
+        self.store.set(key, result)
+        description = describe_request(request)
+        # Rescaled plans are not indexed, so near matches are always scaled from a generated plan
+        indexed = "cache_match" not in result
+        self.requests.set(key, {
+            "key": key,
+            "request": description,
+            "params": request.model_dump(exclude={"cache"}),
+            "indexed": indexed,
+        })
+        if self.semantic and indexed:
+            self.semantic.add(key, description)
+
+    def stats(self):
+        with self._lock:
+            hits, similar_hits, misses = self.hits, self.similar_hits, self.misses
+        lookups = hits + similar_hits + misses
+        return {
+            "hits": hits,
+            "similar_hits": similar_hits,
+            "misses": misses,
+            "hit_rate": round((hits + similar_hits) / lookups, 4) if lookups else 0.0,
+            "entries": len(self.store),
+            "max_entries": self.store.max_entries,
+            "ttl_seconds": self.store.default_ttl,
+            "semantic": self.semantic.stats() if self.semantic else None,
+        }
@@ -0,0 +1,361 @@
+import logging
+import os
+import re
+import sqlite3
+import statistics
+import threading
+import time
+from typing import Any, Type
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field, PrivateAttr
+from ingredients import (
+    DEFAULT_CURRENCY, DESCRIPTORS, UNIT_ALIASES, format_money, format_price_range, normalize_name, normalize_unit,
+    parse_price_range, parse_quantity, to_base_amount
+)
+from search_cache import is_price_query
+import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "prices.sqlite3")
+
+# "$3.99/lb", "$2.50 per pound", "$4 a dozen", "$1.29 each"
+PRICE_PER_UNIT_PATTERN = re.compile(
+    r"\$\s?(?P<price>\d+(?:\.\d{1,2})?)\s*(?:/|per|a|an)\s*(?P<unit>" +
+    "|".join(sorted((re.escape(alias) for alias in UNIT_ALIASES), key=len, reverse=True)) +
+    r")\b|\$\s?(?P<each_price>\d+(?:\.\d{1,2})?)\s*(?:each|ea)\b",
+    re.IGNORECASE,
+)
+
+# Words in a price search query that aren't part of the ingredient name
+QUERY_STOP_WORDS = {
+    "price", "prices", "pricing", "cost", "costs", "cheap", "cheapest", "sale", "deal", "deals",
+    "per", "how", "much", "is", "are", "does", "do", "a", "an", "the", "of", "for", "in", "at",
+    "average", "grocery", "store", "stores", "supermarket", "buy", "today", "current", "near", "me",
+    "each", "item", "items", "us", "usa", "online",
+}
+
+def ingredient_from_query(query):
+    """Pull the ingredient out of a price search query ('chicken breast price per lb' -> 'chicken breast')"""
+    words = re.sub(r"[^a-z\s]", " ", str(query).casefold()).split()
+    words = [word for word in words if word not in QUERY_STOP_WORDS and word not in UNIT_ALIASES]
+    return normalize_name(" ".join(words))
+
+
+def extract_unit_prices(text):
+    """Find per-unit prices in text, as (price per base unit, base unit) pairs"""
+    prices = []
+    for match in PRICE_PER_UNIT_PATTERN.finditer(str(text)):
+        if match.group("each_price"):
+            prices.append((float(match.group("each_price")), "each"))
+            continue
+        amount, base_unit = to_base_amount(1.0, normalize_unit(match.group("unit")))
+        if amount:
+            prices.append((float(match.group("price")) / amount, base_unit))
+    return prices
+
+
+def prices_by_unit(results):
+    """Per-unit prices in the snippets of Serper results, grouped by base unit"""
+    by_unit = {}
+    for result in results.get("organic", []) + results.get("shopping", []):
+        text = " ".join(str(result.get(field, "")) for field in ("title", "snippet", "price"))
+        for price, unit in extract_unit_prices(text):
+            by_unit.setdefault(unit, []).append(price)
+    return by_unit
+
+
+class PriceIndex:
+    """Unit-normalized ingredient prices, keyed by ingredient name and base unit, backed by SQLite.
+
+    Prices are per kilogram, per liter, or per counted unit ('each', 'clove', ...).
+    """
+
+    def __init__(self, path=None, stale_after=None):
+        self.path = path or os.getenv("PRICE_INDEX_PATH", DEFAULT_INDEX_PATH)
+        self.stale_after = stale_after or int(os.getenv("PRICE_INDEX_STALE_AFTER", 7 * 86400))
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ingredient_prices ("
+            "name TEXT NOT NULL, "
+            "unit TEXT NOT NULL, "
+            "section TEXT, "
+            "price REAL NOT NULL, "
+            "price_low REAL NOT NULL, "
+            "price_high REAL NOT NULL, "
+            "observations INTEGER NOT NULL, "
+            "source TEXT, "
+            "updated_at REAL NOT NULL, "
+            "PRIMARY KEY (name, unit))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ingredient_prices_section_idx ON ingredient_prices (section)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ingredient_prices_updated_idx ON ingredient_prices (updated_at)")
+        self._conn.commit()
+
+    def record(self, name, unit, prices, section=None, source=None):
+        """Store the observed prices (per base unit) for an ingredient, replacing older ones"""
+        name = normalize_name(name)
+        if not name or not prices:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO ingredient_prices "
+                "(name, unit, section, price, price_low, price_high, observations, source, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (name, unit) DO UPDATE SET "
+                "section = COALESCE(excluded.section, section), price = excluded.price, "
+                "price_low = excluded.price_low, price_high = excluded.price_high, "
+                "observations = excluded.observations, source = excluded.source, updated_at = excluded.updated_at",
+                (name, unit, section, statistics.median(prices), min(prices), max(prices), len(prices), source, time.time()),
+            )
+            self._conn.commit()
+
+    def ingest_search_results(self, query, results):
+        """Index the per-unit prices found in the snippets of a price search"""
+        if not is_price_query(query) or not isinstance(results, dict):
+            return 0
+        name = ingredient_from_query(query)
+        if not name:
+            return 0
+
+        by_unit = prices_by_unit(results)
+        for unit, prices in by_unit.items():
+            self.record(name, unit, prices, source=query)
+        return sum(len(prices) for prices in by_unit.values())
+
+    def backfill(self, search_results):
+        """Index past search results, e.g. the values of the search cache"""
+        indexed = 0
+        for results in search_results:
+            query = (results.get("searchParameters") or {}).get("q") if isinstance(results, dict) else None
+            if query:
+                indexed += self.ingest_search_results(query, results)
+        return indexed
+
+    def touch(self, name, unit):
+        """Mark an entry as refreshed without changing its prices"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE ingredient_prices SET updated_at = ? WHERE name = ? AND unit = ?", (time.time(), name, unit)
+            )
+            self._conn.commit()
+
+    def set_section(self, name, section):
+        self.set_sections([(name, section)])
+
+    def set_sections(self, assignments):
+        """Record the store section of several ingredients, given as (name, section) pairs"""
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE ingredient_prices SET section = ? WHERE name = ?",
+                [(section, normalize_name(name)) for name, section in assignments]
+            )
+            self._conn.commit()
+
+    def lookup(self, name):
+        """Return the indexed prices for an ingredient as a list of dicts (one per unit)"""
+        return self.lookup_many([name])[name]
+
+    def lookup_many(self, names):
+        """lookup() for several ingredients with a single query, as {name: [entry, ...]}"""
+        candidates = {}
+        for name in names:
+            normalized = normalize_name(name)
+            stripped = " ".join(word for word in normalized.split() if word not in DESCRIPTORS)
+            candidates[name] = [normalized] + ([stripped] if stripped and stripped != normalized else [])
+        wanted = sorted({candidate for options in candidates.values() for candidate in options})
+
+        columns = ("name", "unit", "section", "price", "price_low", "price_high", "observations", "updated_at")
+        by_name = {}
+        with self._lock:
+            # Chunked to stay under SQLite's limit on query parameters
+            for i in range(0, len(wanted), 500):
+                chunk = wanted[i:i + 500]
+                rows = self._conn.execute(
+                    "SELECT name, unit, section, price, price_low, price_high, observations, updated_at "
+                    f"FROM ingredient_prices WHERE name IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                for row in rows:
+                    by_name.setdefault(row[0], []).append(dict(zip(columns, row)))
+
+            results = {}
+            for name, options in candidates.items():
+                results[name] = next((by_name[option] for option in options if option in by_name), [])
+                if results[name]:
+                    self._hits += 1
+                else:
+                    self._misses += 1
+
+        for entries in results.values():
+            metrics.record_cache_lookup("price_index", hit=bool(entries))
+        return results
+
+    def price_quantity(self, name, quantity):
+        """Estimate what a quantity of an ingredient costs, as (low, high), or None if it can't be priced"""
+        return self.price_quantities([(name, quantity)])[0]
+
+    def price_quantities(self, items):
+        """price_quantity() for several (name, quantity) pairs with a single index query"""
+        entries = self.lookup_many([name for name, _ in items])
+        costs = []
+        for name, quantity in items:
+            amount, unit, _ = parse_quantity(quantity)
+            if amount is None:
+                amount, unit = 1.0, None
+            base_amount, base_unit = to_base_amount(amount, unit)
+            costs.append(next(
+                (
+                    (base_amount * entry["price_low"], base_amount * entry["price_high"])
+                    for entry in entries[name] if entry["unit"] == base_unit
+                ),
+                None
+            ))
+        return costs
+
+    def stale(self, limit=10):
+        """Names and units of the entries that are due for a refresh, oldest first"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT name, unit FROM ingredient_prices WHERE updated_at <= ? ORDER BY updated_at LIMIT ?",
+                (time.time() - self.stale_after, limit),
+            ).fetchall()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM ingredient_prices").fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self._hits, self._misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self),
+            "stale_entries": len(self.stale(limit=-1)),
+            "stale_after_seconds": self.stale_after,
+        }
+
+
+def format_cost_breakdown(cost):
+    """Plain-text cost breakdown for the budget advisor's prompt"""
+    currency = cost.get("currency", DEFAULT_CURRENCY)
+    budget_currency = cost.get("budget_currency", currency)
+    lines = [
+        f"- {item['name']} ({item['quantity']}): {format_price_range(item['cost_low'], item['cost_high'], currency)}"
+        + (" [price index]" if item["source"] == "index" else " [estimate]" if item["source"] == "estimate" else " [no price]")
+        for item in cost["items"]
+    ]
+    total = f"Total: {format_price_range(cost['total_low'], cost['total_high'], currency)}"
+    if cost["unpriced_items"]:
+        total += f" plus {cost['unpriced_items']} items with no price"
+    lines.append(total)
+    if cost["budget"] is not None and cost["within_budget"] is None:
+        lines.append(f"Budget: {format_money(cost['budget'], budget_currency)} (not compared; prices are in {currency})")
+    elif cost["budget"] is not None:
+        lines.append(f"Budget: {format_money(cost['budget'], budget_currency)} ({'within' if cost['within_budget'] else 'over'} budget)")
+    return "\n".join(lines)
+
+
+class PriceLookupInput(BaseModel):
+    """Input schema for PriceLookupTool"""
+    ingredients: str = Field(..., description="Comma-separated ingredients, optionally with quantities (for example, '2 lbs chicken breast, 1 dozen eggs')")
+
+
+class PriceLookupTool(BaseTool):
+    """Looks ingredient prices up in the local price index, with no network round trip"""
+
+    name: str = "Look up ingredient prices"
+    description: str = (
+        "Look up current prices for ingredients in the local price index. Use this before searching the web; "
+        "only search for ingredients it has no price for."
+    )
+    args_schema: Type[BaseModel] = PriceLookupInput
+    _index: Any = PrivateAttr()
+
+    def __init__(self, price_index, **kwargs):
+        super().__init__(**kwargs)
+        self._index = price_index
+
+    def _run(self, ingredients: str) -> str:
+        started = time.perf_counter()
+        lines = []
+        found = False
+        for entry in (part.strip() for part in ingredients.split(",")):
+            if not entry:
+                continue
+            amount, unit, name = parse_quantity(entry)
+            name = name or entry
+            prices = self._index.lookup(name)
+            if not prices:
+                lines.append(f"{name}: no indexed price")
+                continue
+            found = True
+            unit_prices = ", ".join(
+                f"{format_price_range(price['price_low'], price['price_high'])} per {price['unit']}" for price in prices
+            )
+            line = f"{name}: {unit_prices}"
+            if amount is not None:
+                cost = self._index.price_quantity(name, entry)
+                if cost:
+                    line += f"; {entry} costs about {format_price_range(*cost)}"
+            lines.append(line)
+        metrics.record_tool_call("price_index", time.perf_counter() - started, cache_hit=found)
+        return "\n".join(lines) or "No ingredients given"
+
+
+class PriceRefresher:
+    """Background thread that re-searches stale price index entries"""
+
+    def __init__(self, price_index, search_tool, interval=None, batch_size=None):
+        self.price_index = price_index
+        self.search_tool = search_tool
+        self.interval = interval if interval is not None else int(os.getenv("PRICE_REFRESH_INTERVAL", 6 * 3600))
+        self.batch_size = batch_size or int(os.getenv("PRICE_REFRESH_BATCH", 10))
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start refreshing every interval seconds; an interval of 0 disables the refresher"""
+        if self.interval <= 0 or self._thread:
+            return
+        self._thread = threading.Thread(target=self._loop, name="price-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def refresh_once(self):
+        """Re-search up to batch_size stale entries, returning how many were refreshed"""
+        refreshed = 0
+        for name, unit in self.price_index.stale(limit=self.batch_size):
+            query = f"{name} price per {'item' if unit == 'each' else unit}"
+            try:
+                results = self.search_tool._run(search_query=query)
+            except Exception as e:
+                logger.warning(f"Price refresh failed for {name}: {str(e)}")
+                continue
+            # Recorded under the entry's own name and unit; the search tool's listener
+            # has already indexed fetched results, but not ones served from its cache
+            prices = prices_by_unit(results).get(unit) if isinstance(results, dict) else None
+            if prices:
+                self.price_index.record(name, unit, prices, source=query)
+                refreshed += 1
+            else:
+                # Keep the old prices, but don't retry this entry on every pass
+                self.price_index.touch(name, unit)
+        return refreshed
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            refreshed = self.refresh_once()
+            if refreshed:
+                logger.info(f"Refreshed {refreshed} ingredient prices")
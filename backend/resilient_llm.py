@@ -0,0 +1,24 @@
+from crewai import LLM
+from outbound import get_client
+
+
+class ResilientLLM(LLM):
+    """crewai LLM whose calls go through its provider's shared OutboundClient.
+
+    Calls are rate limited per provider, retried with backoff on rate limits
+    and server errors, and fail fast with CircuitOpenError while the provider
+    is down. litellm keeps its own pooled HTTP clients for the requests themselves.
+    """
+
+    def __init__(self, provider, **kwargs):
+        super().__init__(**kwargs)
+        self.provider = provider
+        self.outbound = get_client(provider)
+
+    def call(self, *args, **kwargs):
+        return self.outbound.call(super().call, *args, **kwargs)
+
+
+def provider_name(model):
+    """The provider prefix of a litellm model name ('gemini/gemini-1.5-flash' -> 'gemini')"""
+    return model.split("/", 1)[0] if "/" in model else model
@@ -0,0 +1,149 @@
+import decimal
+import gzip
+import os
+import threading
+import brotli
+import orjson
+from flask import current_app, request
+from flask.json.provider import JSONProvider
+from werkzeug.http import generate_etag
+
+# Smaller bodies barely shrink, so they aren't worth the CPU
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", 1024))
+
+# Preferred first when the client accepts both equally
+ENCODINGS = ["br", "gzip"]
+
+# Fast settings for responses compressed per request; static documents are
+# compressed once, so they get the smallest output
+DYNAMIC_LEVELS = {"br": 5, "gzip": 6}
+STATIC_LEVELS = {"br": 11, "gzip": 9}
+
+
+def default(obj):
+    """Serialize the types orjson doesn't handle natively"""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj):
+    """JSON bytes for obj"""
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider that serializes with orjson, used by jsonify and request.get_json"""
+
+    def dumps(self, obj, **kwargs):
+        return dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Skips the decode/encode round trip of the base class
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype="application/json")
+
+
+def select_fields(data, fields):
+    """Only the comma-separated dotted paths in fields of data ('summary,task_outputs.budget').
+
+    Paths that don't exist are skipped; without fields all of data is returned.
+    """
+    if not fields:
+        return data
+
+    selected = {}
+    for path in fields.split(","):
+        keys = [key.strip() for key in path.split(".") if key.strip()]
+        if not keys:
+            continue
+        value = data
+        for key in keys:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            target = selected
+            for key in keys[:-1]:
+                target = target.setdefault(key, {})
+            target[keys[-1]] = value
+    return selected
+
+
+def compress(data, encoding, levels=DYNAMIC_LEVELS):
+    if encoding == "br":
+        return brotli.compress(data, quality=levels["br"])
+    return gzip.compress(data, compresslevel=levels["gzip"])
+
+
+def negotiate_encoding():
+    """The best content coding the client accepts, or None for an uncompressed body"""
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def finalize_json_response(response):
+    """Add a content-hash ETag to GET responses, answering 304 when the client's copy
+    matches, and compress the body with the client's preferred encoding.
+
+    The ETag is weak because it names the content, not the encoded bytes.
+    """
+    if (response.mimetype != "application/json" or response.status_code != 200
+            or response.direct_passthrough or response.content_encoding):
+        return response
+
+    data = response.get_data()
+    if request.method in ("GET", "HEAD"):
+        if not response.get_etag()[0]:
+            response.set_etag(generate_etag(data), weak=True)
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+
+    response.vary.add("Accept-Encoding")
+    if len(data) >= COMPRESS_MIN_BYTES:
+        encoding = negotiate_encoding()
+        if encoding:
+            response.set_data(compress(data, encoding))
+            response.content_encoding = encoding
+    return response
+
+
+class StaticJSON:
+    """A JSON document that doesn't change while the process runs.
+
+    build() is called on first use. The body, its ETag and each compressed
+    encoding are computed once, and responses carry a public Cache-Control
+    so browsers and proxies can keep them for max_age seconds.
+    """
+
+    def __init__(self, build, max_age):
+        self.build = build
+        self.max_age = max_age
+        self._bodies = None
+        self._etag = None
+        self._lock = threading.Lock()
+
+    def response(self):
+        encoding = negotiate_encoding()
+        with self._lock:
+            if self._bodies is None:
+                body = dumps(self.build())
+                self._bodies = {None: body}
+                self._etag = generate_etag(body)
+            if encoding not in self._bodies:
+                self._bodies[encoding] = compress(self._bodies[None], encoding, STATIC_LEVELS)
+            body = self._bodies[encoding]
+
+        response = current_app.response_class(body, mimetype="application/json")
+        response.set_etag(self._etag, weak=True)
+        response.cache_control.public = True
+        response.cache_control.max_age = self.max_age
+        response.vary.add("Accept-Encoding")
+        if encoding:
+            response.content_encoding = encoding
+        return response.make_conditional(request)
@@ -0,0 +1,68 @@
+from ingredients import scale_quantity
+from models import BudgetAnalysis, MealPlan, MealPlanRequest
+
+# Request fields each reusable task's output depends on. Meal plans don't list
+# servings: a plan for another number of people is the same recipe with its
+# quantities scaled. Shopping and the cost estimate are not listed as they are
+# rebuilt locally on every revision.
+TASK_INPUTS = {
+    "meal_planning": {"meal_name", "dietary_restrictions", "cooking_skill"},
+    "leftover": {"meal_name", "servings", "dietary_restrictions", "cooking_skill"},
+    "budget": {"meal_name", "servings", "budget", "dietary_restrictions", "cooking_skill"},
+}
+
+# Tasks whose outputs can stand in for running them again
+REUSABLE_TASKS = list(TASK_INPUTS)
+
+# Fields that don't change what is planned
+IGNORED_FIELDS = {"cache"}
+
+
+def changed_fields(previous, revised):
+    """Names of the request fields that differ between a stored request (a dict) and revised"""
+    previous = MealPlanRequest(**previous)
+    return sorted(
+        field for field in MealPlanRequest.model_fields
+        if field not in IGNORED_FIELDS and getattr(previous, field) != getattr(revised, field)
+    )
+
+
+def reusable_outputs(previous, revised, result):
+    """Task outputs of a stored plan that still hold for revised, to use instead of running those tasks.
+
+    Returns task name -> MealPlan, BudgetAnalysis or text. Nothing is reused
+    when the stored meal plan is unstructured, since every other task builds on it.
+    """
+    outputs = restore_outputs(result.get("task_outputs") or {})
+    changed = set(changed_fields(previous, revised))
+    if "meal_planning" not in outputs or changed & TASK_INPUTS["meal_planning"]:
+        return {}
+
+    reuse = {"meal_planning": scale_meal_plan(outputs["meal_planning"], revised.servings)}
+    for task_name in ("leftover", "budget"):
+        if task_name in outputs and not changed & TASK_INPUTS[task_name]:
+            reuse[task_name] = outputs[task_name]
+    return reuse
+
+
+def restore_outputs(task_outputs):
+    """The serialized outputs of the tasks in TASK_INPUTS as the MealPlan, BudgetAnalysis or text to reuse"""
+    restored = {}
+    if isinstance(task_outputs.get("meal_planning"), dict):
+        restored["meal_planning"] = MealPlan(**task_outputs["meal_planning"])
+    if isinstance(task_outputs.get("leftover"), str) and task_outputs["leftover"]:
+        restored["leftover"] = task_outputs["leftover"]
+    if isinstance(task_outputs.get("budget"), dict):
+        restored["budget"] = BudgetAnalysis(**task_outputs["budget"])
+    return restored
+
+
+def scale_meal_plan(meal_plan, servings):
+    """Copy of a MealPlan with its ingredient quantities scaled to servings"""
+    factor = servings / meal_plan.servings if meal_plan.servings else 1.0
+    if factor == 1.0:
+        return meal_plan
+    return meal_plan.model_copy(update={
+        "servings": servings,
+        "researched_ingredients": [scale_quantity(ingredient, factor) for ingredient in meal_plan.researched_ingredients],
+    })
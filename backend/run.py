@@ -1,10 +1,21 @@
 #!/usr/bin/env python3
 """
 Startup script for the Alex Meal Planner API
+
+Usage:
+  python run.py                        Start the development server
+  python run.py serve --production     Start gunicorn with gunicorn.conf.py
+  python run.py warmup [...]           Pre-generate cached plans for the supported meals catalog
 """
+import argparse
+import importlib.util
+import json
+import logging
 import os
 import sys
-from app import app, logger
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
 def setup_environment():
     """Setup environment variables from .env file"""
@@ -17,28 +28,17 @@ def setup_environment():
 
 def check_dependencies():
     """Check if required dependencies are available"""
-    try:
-        import crewai
-        import flask
-        import pydantic
-        logger.info("All required dependencies are available")
-        return True
-    except ImportError as e:
-        logger.error(f"Missing dependency: {e}")
+    # Located, not imported: importing crewai takes seconds and the app defers it until first use
+    missing = [name for name in ("crewai", "flask", "pydantic") if importlib.util.find_spec(name) is None]
+    if missing:
+        logger.error(f"Missing dependency: {', '.join(missing)}")
         logger.error("Please install dependencies using: pip install -r requirements.txt")
         return False
+    logger.info("All required dependencies are available")
+    return True
 
-if __name__ == '__main__':
-    logger.info("Starting Alex Meal Planner API...")
-    
-    # Setup environment
-    setup_environment()
-    
-    # Check dependencies
-    if not check_dependencies():
-        sys.exit(1)
-    
-    # Check API keys
+def check_api_keys():
+    """Warn about API keys that aren't configured"""
     missing_keys = []
     if not os.getenv('SERPER_API_KEY'):
         missing_keys.append('SERPER_API_KEY')
@@ -48,8 +48,11 @@ if __name__ == '__main__':
     if missing_keys:
         logger.warning(f"Missing API keys: {', '.join(missing_keys)}")
         logger.warning("Some functionality may not work properly")
-    
-    # Start the application
+
+def serve():
+    """Start the development server"""
+    from app import app
+
     port = int(os.environ.get('PORT', 5000))
     debug = os.environ.get('FLASK_ENV') == 'development'
     
@@ -59,5 +62,88 @@ if __name__ == '__main__':
     logger.info("  POST /api/meal-plan - Generate meal plan")
     logger.info("  GET  /api/meal-plans - Get supported meals")
     logger.info("  GET  /api/config - Get API configuration")
+    logger.info("  GET  /api/warmup - Catalog warm-up status")
+    
+    app.run(host='0.0.0.0', port=port, debug=debug)
+
+def serve_production():
+    """Replace this process with gunicorn, configured by gunicorn.conf.py"""
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    os.chdir(backend_dir)
+    logger.info("Starting gunicorn with gunicorn.conf.py")
+    os.execvp(sys.executable, [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"])
+
+def warmup(args):
+    """Pre-generate plans for the catalog x cooking skill x common restriction grid"""
+    from app import get_crew_service, plan_cache, plan_warmer
+    from warmup import PlanWarmer, catalog_requests
+
+    # The CLI run replaces any scheduled warm-up in this process
+    plan_warmer.stop()
+    warmer = PlanWarmer(
+        get_crew_service, plan_cache, concurrency=args.concurrency, rate_per_minute=args.rate, interval=0
+    )
+    requests = catalog_requests(meals=args.meal, servings=args.servings, budget_per_serving=args.budget_per_serving)
+
+    if args.status:
+        print(json.dumps(warmer.coverage(requests), indent=2))
+        return
+
+    def on_progress(meal_request, outcome, report):
+        restrictions = ", ".join(meal_request.dietary_restrictions) or "no restrictions"
+        print(
+            f"[{report.done}/{report.total}] {outcome:<9} {meal_request.meal_name} "
+            f"({meal_request.cooking_skill}, {restrictions}, serves {meal_request.servings})",
+            flush=True
+        )
+
+    print(f"Warming {len(requests)} plans with {warmer.concurrency} workers")
+    report = warmer.run(requests, refresh=args.refresh, on_progress=on_progress)
+    print(json.dumps(report.to_dict(), indent=2))
+    coverage = warmer.coverage(requests)
+    print(f"Catalog coverage: {coverage['cached']}/{coverage['plans']} plans cached ({coverage['coverage']:.0%})")
+    if report.failed:
+        sys.exit(1)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Alex Meal Planner API")
+    subcommands = parser.add_subparsers(dest="command")
+    serve_parser = subcommands.add_parser("serve", help="Start the API server (default)")
+    serve_parser.add_argument("--production", action="store_true",
+                              help="Serve with gunicorn instead of the Flask development server")
+
+    warmup_parser = subcommands.add_parser("warmup", help="Pre-generate cached plans for the supported meals catalog")
+    warmup_parser.add_argument("--meal", action="append", help="Only warm this catalog meal (repeatable)")
+    warmup_parser.add_argument("--servings", type=int, action="append",
+                               help="Servings to warm (repeatable, default WARMUP_SERVINGS or 4)")
+    warmup_parser.add_argument("--budget-per-serving", type=float,
+                               help="Budget per serving in dollars (default WARMUP_BUDGET_PER_SERVING or 5)")
+    warmup_parser.add_argument("--concurrency", type=int, help="Plans generated at once (default WARMUP_CONCURRENCY or 2)")
+    warmup_parser.add_argument("--rate", type=float,
+                               help="Plans started per minute, 0 for no limit (default WARMUP_RATE_PER_MINUTE or 6)")
+    warmup_parser.add_argument("--refresh", action="store_true", help="Regenerate plans that are already cached")
+    warmup_parser.add_argument("--status", action="store_true", help="Only report catalog coverage")
+    return parser.parse_args()
+
+if __name__ == '__main__':
+    args = parse_args()
+    logger.info("Starting Alex Meal Planner API...")
+    
+    # Setup environment
+    setup_environment()
+    
+    # Check API keys
+    check_api_keys()
+    
+    if args.command == "serve" and args.production:
+        # gunicorn imports everything in its master process; don't pay for it twice
+        serve_production()
     
-    app.run(host='0.0.0.0', port=port, debug=debug)
\ No newline at end of file
+    # Check dependencies
+    if not check_dependencies():
+        sys.exit(1)
+    
+    if args.command == "warmup":
+        warmup(args)
+    else:
+        serve()
@@ -0,0 +1,116 @@
+import os
+import re
+import threading
+import time
+from typing import Any
+from pydantic import PrivateAttr
+from crewai_tools import SerperDevTool
+from cache_store import SQLiteCache
+from outbound import get_client
+import metrics
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "search.sqlite3")
+
+# Queries about prices go stale much faster than recipe research
+PRICE_QUERY_PATTERN = re.compile(
+    r"\$|\b(price|prices|pricing|cost|costs|cheap|cheapest|sale|deal|deals|per (lb|pound|kg|oz|ounce|dozen))\b"
+)
+
+
+def normalize_query(query):
+    """Case-fold, drop punctuation and order-normalize the words of a search query"""
+    words = re.sub(r"[^\w$]+", " ", str(query).casefold()).split()
+    return " ".join(sorted(words))
+
+
+def is_price_query(query):
+    return bool(PRICE_QUERY_PATTERN.search(str(query).casefold()))
+
+
+class CachedSerperTool(SerperDevTool):
+    """SerperDevTool that memoizes results in a persistent, size-bounded LRU cache.
+
+    Drop-in replacement for SerperDevTool: same name, description and arguments.
+    Cache misses go to SERPER_BASE_URL through the shared outbound client.
+    """
+
+    _store: SQLiteCache = PrivateAttr()
+    _ttl: int = PrivateAttr()
+    _price_ttl: int = PrivateAttr()
+    _hits: int = PrivateAttr(default=0)
+    _misses: int = PrivateAttr(default=0)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _result_listeners: list = PrivateAttr(default_factory=list)
+    _client: Any = PrivateAttr()
+
+    def __init__(self, cache_path=None, ttl=None, price_ttl=None, max_entries=None, **kwargs):
+        kwargs.setdefault("base_url", os.getenv("SERPER_BASE_URL", "https://google.serper.dev"))
+        super().__init__(**kwargs)
+        self._client = get_client("serper")
+        self._ttl = ttl or int(os.getenv("SEARCH_CACHE_TTL", 7 * 86400))
+        self._price_ttl = price_ttl or int(os.getenv("SEARCH_CACHE_PRICE_TTL", 6 * 3600))
+        self._store = SQLiteCache(
+            cache_path or os.getenv("SEARCH_CACHE_PATH", DEFAULT_CACHE_PATH),
+            table="search_results",
+            max_entries=max_entries or int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", 5000)),
+            default_ttl=self._ttl,
+        )
+
+    def add_result_listener(self, listener):
+        """Call listener(query, results) with every result fetched from Serper (not cache hits)"""
+        self._result_listeners.append(listener)
+
+    def _run(self, **kwargs: Any) -> Any:
+        search_query = kwargs.get("search_query") or kwargs.get("query")
+        search_type = kwargs.get("search_type", self.search_type)
+        key = f"{search_type}:{self.n_results}:{normalize_query(search_query)}"
+        started = time.perf_counter()
+
+        cached = self._store.get(key)
+        if cached is not None:
+            with self._lock:
+                self._hits += 1
+            metrics.record_tool_call("search", time.perf_counter() - started, cache_hit=True)
+            return cached
+
+        with self._lock:
+            self._misses += 1
+
+        results = super()._run(**kwargs)
+        self._store.set(key, results, ttl=self._price_ttl if is_price_query(search_query) else self._ttl)
+        metrics.record_tool_call("search", time.perf_counter() - started, cache_hit=False)
+        for listener in self._result_listeners:
+            listener(search_query, results)
+        return results
+
+    def _make_api_request(self, search_query: str, search_type: str) -> dict:
+        payload = {"q": search_query, "num": self.n_results}
+        for key, value in (("gl", self.country), ("location", self.location), ("hl", self.locale)):
+            if value:
+                payload[key] = value
+        headers = {"X-API-KEY": os.environ["SERPER_API_KEY"], "content-type": "application/json"}
+
+        response = self._client.request("POST", self._get_search_url(search_type), headers=headers, json=payload)
+        results = response.json()
+        if not results:
+            raise ValueError("Empty response from Serper API")
+        return results
+
+    def cached_results(self):
+        """Every unexpired cached search result"""
+        return self._store.values()
+
+    def stats(self):
+        with self._lock:
+            hits, misses = self._hits, self._misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "external_calls_saved": hits,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._store),
+            "max_entries": self._store.max_entries,
+            "ttl_seconds": self._ttl,
+            "price_ttl_seconds": self._price_ttl,
+        }
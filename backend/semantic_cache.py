@@ -0,0 +1,314 @@
+import copy
+import os
+import re
+import threading
+import zlib
+import numpy as np
+from ingredients import normalize_name, parse_currency, parse_price_range, scale_price_range, scale_quantity
+from summary_renderer import render_summary
+
+NGRAM_SIZE = 3
+DEFAULT_BUCKETS = 4096
+# Share of the threshold left to the unscanned query n-grams during a search
+PREFIX_NORM_RATIO = 0.75
+# Postings a search walks at most; when the exact bound needs more, only rows
+# scoring at least CAPPED_SCORE_RATIO of the best partial score are kept
+MAX_WALKED_POSTINGS = 12000
+CAPPED_SCORE_RATIO = 0.5
+
+SKILL_LEVELS = {"beginner": 0, "intermediate": 1, "advance": 2, "advanced": 2}
+
+
+def compact_meal_name(name):
+    """Singular, lower-case meal name without spaces or punctuation ('Chicken Stir-Fries' -> 'chickenstirfry')"""
+    return re.sub(r"[^a-z0-9]", "", normalize_name(name))
+
+
+def ngram_vector(name, buckets=DEFAULT_BUCKETS):
+    """L2-normalized hashed character n-gram vector of a meal name, as (bucket ids, weights)"""
+    text = f"#{compact_meal_name(name)}#"
+    ids = np.array(
+        [zlib.crc32(text[i:i + NGRAM_SIZE].encode("utf-8")) % buckets for i in range(len(text) - NGRAM_SIZE + 1)],
+        dtype=np.int64,
+    )
+    ids, counts = np.unique(ids, return_counts=True)
+    weights = counts.astype(np.float32)
+    return ids, weights / np.linalg.norm(weights)
+
+
+class NGramIndex:
+    """Sparse index of unit n-gram vectors with exact cosine scoring.
+
+    Rows are kept in CSR arrays plus a weighted inverted list per bucket. A
+    search walks the postings of the query's rarest n-grams until the rest of the
+    query has a norm below PREFIX_NORM_RATIO * threshold. A row (a unit vector)
+    can gain at most that norm from the remaining n-grams, so rows whose partial
+    score from the walked postings can't reach the threshold are dropped before
+    the survivors are scored exactly.
+
+    When names share so many n-grams that the walk would pass
+    MAX_WALKED_POSTINGS, it stops there and only the rows closest to the best
+    partial score are scored. Such searches are approximate: they still find the
+    best match in practice, but can miss weaker ones.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._postings = [np.empty(0, dtype=np.int64) for _ in range(buckets)]
+        self._posting_weights = [np.empty(0, dtype=np.float32) for _ in range(buckets)]
+        self._sizes = np.zeros(buckets, dtype=np.int64)
+        self._indptr = np.zeros(1025, dtype=np.int64)
+        self._indices = np.empty(16384, dtype=np.int64)
+        self._data = np.empty(16384, dtype=np.float32)
+        self._count = 0
+
+    def add(self, vector):
+        """Add a vector and return its row number"""
+        ids, weights = vector
+        row = self._count
+        start = self._indptr[row]
+        end = start + len(ids)
+
+        # Grow arrays geometrically so adds stay amortized O(1)
+        if row + 2 > len(self._indptr):
+            self._indptr = np.resize(self._indptr, len(self._indptr) * 2)
+        if end > len(self._indices):
+            capacity = max(end, len(self._indices) * 2)
+            self._indices = np.resize(self._indices, capacity)
+            self._data = np.resize(self._data, capacity)
+        self._indices[start:end] = ids
+        self._data[start:end] = weights
+        self._indptr[row + 1] = end
+
+        for bucket, weight in zip(ids, weights):
+            size = self._sizes[bucket]
+            if size == len(self._postings[bucket]):
+                self._postings[bucket] = np.resize(self._postings[bucket], max(8, size * 2))
+                self._posting_weights[bucket] = np.resize(self._posting_weights[bucket], max(8, size * 2))
+            self._postings[bucket][size] = row
+            self._posting_weights[bucket][size] = weight
+            self._sizes[bucket] = size + 1
+
+        self._count += 1
+        return row
+
+    def search(self, vector, threshold):
+        """Rows with cosine similarity >= threshold, as (row, similarity) pairs, best first"""
+        ids, weights = vector
+        if not self._count or not len(ids):
+            return []
+
+        # Rarest n-grams first, until the rest of the query has a small enough norm
+        order = np.argsort(self._sizes[ids], kind="stable")
+        remaining_norms = np.append(np.sqrt(np.cumsum((weights[order] ** 2)[::-1])[::-1]), 0.0)
+        walked = int(np.count_nonzero(remaining_norms[:-1] >= PREFIX_NORM_RATIO * threshold))
+        capped = int(np.searchsorted(np.cumsum(self._sizes[ids[order]]), MAX_WALKED_POSTINGS, side="right"))
+        capped = max(1, min(walked, capped))
+        rows = [self._postings[ids[i]][:self._sizes[ids[i]]] for i in order[:capped]]
+        if not rows:
+            return []
+        contributions = [
+            self._posting_weights[ids[i]][:self._sizes[ids[i]]] * weights[i] for i in order[:capped]
+        ]
+        # Dense accumulation: one pass over the postings, no sort of the candidate rows
+        partial_scores = np.bincount(np.concatenate(rows), weights=np.concatenate(contributions), minlength=self._count)
+        minimum = threshold - remaining_norms[capped]
+        if capped < walked:
+            minimum = max(minimum, CAPPED_SCORE_RATIO * partial_scores.max())
+        candidates = np.flatnonzero(partial_scores >= minimum)
+        if not len(candidates):
+            return []
+
+        # Exact dot products of the query with every candidate row
+        query = np.zeros(self.buckets, dtype=np.float32)
+        query[ids] = weights
+        starts = self._indptr[candidates]
+        lengths = self._indptr[candidates + 1] - starts
+        offsets = np.cumsum(lengths) - lengths
+        positions = np.repeat(starts - offsets, lengths) + np.arange(lengths.sum())
+        scores = np.add.reduceat(query[self._indices[positions]] * self._data[positions], offsets)
+
+        keep = scores >= threshold
+        candidates, scores = candidates[keep], scores[keep]
+        order = np.argsort(-scores, kind="stable")
+        return [(int(candidates[i]), float(scores[i])) for i in order]
+
+    def __len__(self):
+        return self._count
+
+
+def describe_request(request):
+    """The parts of a MealPlanRequest that decide whether a stored plan can serve it"""
+    budget = parse_price_range(request.budget)
+    return {
+        "meal_name": request.meal_name,
+        "servings": request.servings,
+        "budget": budget[1] if budget else None,
+        "budget_currency": parse_currency(request.budget),
+        "dietary_restrictions": sorted({" ".join(r.casefold().split()) for r in request.dietary_restrictions}),
+        "cooking_skill": " ".join(request.cooking_skill.casefold().split()),
+    }
+
+
+class SemanticPlanIndex:
+    """Finds stored meal plans for requests whose meal name is close to, not exactly, a cached one.
+
+    A plan is only served when its dietary restrictions match exactly, it needs
+    no more cooking skill than requested, its servings are within
+    max_servings_ratio of the request and its per-serving budget, in the same
+    currency, is no higher.
+    """
+
+    def __init__(self, threshold=None, max_servings_ratio=None, buckets=None):
+        self.threshold = threshold or float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.8))
+        self.max_servings_ratio = max_servings_ratio or float(os.getenv("SEMANTIC_CACHE_MAX_SERVINGS_RATIO", 2.0))
+        self._index = NGramIndex(buckets or DEFAULT_BUCKETS)
+        self._names = {}  # compact meal name -> row
+        self._entries = []  # row -> {key: description}
+        self._rows = {}  # key -> row
+        self._lock = threading.Lock()
+
+    def add(self, key, description):
+        name = compact_meal_name(description["meal_name"])
+        with self._lock:
+            row = self._names.get(name)
+            if row is None:
+                row = self._index.add(ngram_vector(name, self._index.buckets))
+                self._names[name] = row
+                self._entries.append({})
+            self._entries[row][key] = description
+            self._rows[key] = row
+
+    def remove(self, key):
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is not None:
+                self._entries[row].pop(key, None)
+
+    def find(self, request, limit=None):
+        """Compatible stored plans as (key, similarity, description), most similar first, at most limit of them"""
+        wanted = describe_request(request)
+        name = compact_meal_name(request.meal_name)
+        with self._lock:
+            row = self._names.get(name)
+            candidates = self._compatible(row, 1.0, wanted) if row is not None else []
+            if candidates:
+                # Identical compact names skip the vector search altogether
+                return candidates[:limit]
+            for match_row, similarity in self._index.search(ngram_vector(name, self._index.buckets), self.threshold):
+                if match_row != row:
+                    candidates.extend(self._compatible(match_row, similarity, wanted))
+                    if limit is not None and len(candidates) >= limit:
+                        break
+        return candidates[:limit]
+
+    def _compatible(self, row, similarity, wanted):
+        entries = sorted(self._entries[row].items(), key=lambda item: abs(item[1]["servings"] - wanted["servings"]))
+        return [
+            (key, similarity, description) for key, description in entries
+            if self.is_compatible(description, wanted)
+        ]
+
+    def is_compatible(self, stored, wanted):
+        if stored["dietary_restrictions"] != wanted["dietary_restrictions"]:
+            return False
+        if SKILL_LEVELS.get(stored["cooking_skill"], 0) > SKILL_LEVELS.get(wanted["cooking_skill"], 0):
+            return False
+        if not stored["servings"] or not wanted["servings"]:
+            return False
+        ratio = wanted["servings"] / stored["servings"]
+        if not 1 / self.max_servings_ratio <= ratio <= self.max_servings_ratio:
+            return False
+        if stored.get("budget_currency", "USD") != wanted["budget_currency"]:
+            return False
+        if stored["budget"] is not None and wanted["budget"] is not None:
+            return stored["budget"] / stored["servings"] <= wanted["budget"] / wanted["servings"]
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                "meal_names": len(self._names),
+                "entries": len(self._rows),
+                "threshold": self.threshold,
+                "max_servings_ratio": self.max_servings_ratio,
+            }
+
+
+def scale_price(price, factor):
+    """Scale a serialized PriceRange in place; None is left as is"""
+    if price:
+        price["low"] = round(price["low"] * factor, 2)
+        price["high"] = round(price["high"] * factor, 2)
+
+
+def rescale_result(result, from_servings, to_servings, budget=None):
+    """Copy of a stored meal plan result with quantities and prices scaled to to_servings"""
+    result = copy.deepcopy(result)
+    factor = to_servings / from_servings if from_servings else 1.0
+    task_outputs = result.get("task_outputs", {})
+    budget_range = parse_price_range(budget) if budget else None
+
+    def scale_meal_plan(meal_plan):
+        if isinstance(meal_plan, dict):
+            meal_plan["servings"] = to_servings
+            meal_plan["researched_ingredients"] = [
+                scale_quantity(ingredient, factor) for ingredient in meal_plan.get("researched_ingredients", [])
+            ]
+
+    scale_meal_plan(task_outputs.get("meal_planning"))
+
+    shopping = task_outputs.get("shopping")
+    if isinstance(shopping, dict):
+        for meal_plan in shopping.get("meal_plans", []):
+            scale_meal_plan(meal_plan)
+        for section in shopping.get("shopping_sections", []):
+            for item in section.get("items", []):
+                item["quantity"] = scale_quantity(item["quantity"], factor, round_counts=True)
+                item["estimated_price"] = scale_price_range(item["estimated_price"], factor)
+                scale_price(item.get("price"), factor)
+            section["estimated_total"] = scale_price_range(section["estimated_total"], factor)
+            scale_price(section.get("total"), factor)
+        scale_price(shopping.get("total"), factor)
+        if budget:
+            shopping["total_budget"] = budget
+        if budget_range and shopping.get("budget"):
+            shopping["budget"].update(low=budget_range[0], high=budget_range[1])
+
+    analysis = task_outputs.get("budget")
+    if isinstance(analysis, dict) and analysis.get("total"):
+        scale_price(analysis["total"], factor)
+        scale_price(analysis.get("rebalanced_total"), factor)
+        for swap in analysis.get("substitutions", []):
+            scale_price(swap["savings"], factor)
+        if budget_range and analysis.get("budget"):
+            analysis["budget"].update(low=budget_range[0], high=budget_range[1])
+        if analysis.get("budget") and analysis["budget"].get("currency") == analysis["total"].get("currency"):
+            over_by = round(analysis["total"]["high"] - analysis["budget"]["high"], 2)
+            analysis["within_budget"] = over_by <= 0
+            analysis["over_budget_by"] = max(0.0, over_by)
+            if over_by <= 0:
+                analysis["substitutions"], analysis["rebalanced_total"] = [], None
+
+    cost = result.get("cost_estimate")
+    if isinstance(cost, dict):
+        for item in cost.get("items", []):
+            item["quantity"] = scale_quantity(item["quantity"], factor, round_counts=True)
+            item["cost_low"] = round(item["cost_low"] * factor, 2)
+            item["cost_high"] = round(item["cost_high"] * factor, 2)
+        for totals in cost.get("sections", {}).values():
+            totals["low"] = round(totals["low"] * factor, 2)
+            totals["high"] = round(totals["high"] * factor, 2)
+        cost["total_low"] = round(cost["total_low"] * factor, 2)
+        cost["total_high"] = round(cost["total_high"] * factor, 2)
+        if budget_range:
+            cost["budget"] = budget_range[1]
+            if cost.get("budget_currency", "USD") == cost.get("currency", "USD"):
+                cost["within_budget"] = cost["total_high"] <= budget_range[1]
+
+    # The stored summary quotes the old quantities
+    if task_outputs:
+        result["summary"] = render_summary(task_outputs, cost if isinstance(cost, dict) else None)
+        result["summary_source"] = "template"
+
+    return result
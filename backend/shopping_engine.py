@@ -0,0 +1,183 @@
+import math
+import os
+import re
+import yaml
+from cache_store import SQLiteCache
+from ingredients import (
+    DESCRIPTORS, UNITS, combine_quantities, format_price_range, format_quantity,
+    normalize_name, parse_quantity, sum_price_ranges
+)
+from models import GroceryItem, GroceryShoppingPlan, ShoppingCategory
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config", "taxonomy.yaml")
+DEFAULT_LEARNED_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cache", "taxonomy.sqlite3")
+
+FALLBACK_SECTION = "Other"
+
+# Amounts that aren't quantities to buy
+UNMEASURED_PATTERN = re.compile(r"\b(to taste|as needed|for garnish|for serving|optional)\b", re.IGNORECASE)
+
+
+class ParsedIngredient:
+    """An ingredient string split into amount, unit and name"""
+
+    def __init__(self, text, amount, unit, name, key):
+        self.text = text
+        self.amount = amount
+        self.unit = unit
+        self.name = name
+        self.key = key
+
+    def scaled(self, factor):
+        """Amount times factor; counted items are rounded up to whole ones"""
+        if self.amount is None:
+            return None
+        amount = self.amount * factor
+        if self.unit not in UNITS:
+            amount = math.ceil(amount - 1e-9)
+        return amount
+
+
+def parse_ingredient(text):
+    """Parse '2 cloves garlic, minced' into ParsedIngredient(2.0, 'clove', 'garlic')"""
+    text = str(text).strip()
+    unmeasured = bool(UNMEASURED_PATTERN.search(text))
+    cleaned = UNMEASURED_PATTERN.sub("", text)
+    # Notes after a comma and in parentheses are preparation details
+    cleaned = re.sub(r"\([^)]*\)", " ", cleaned).split(",")[0]
+
+    amount, unit, name = parse_quantity(cleaned)
+    if not name and unit:
+        # '4 cloves' on its own is the spice, not a unit
+        name, unit = unit, None
+    words = [word for word in name.split() if word.lower() not in DESCRIPTORS] or name.split()
+    name = " ".join(words).strip(" .-")
+    if unmeasured:
+        amount = None
+    return ParsedIngredient(text, amount, unit, name[:1].upper() + name[1:], normalize_name(name))
+
+
+class ShoppingListEngine:
+    """Builds a GroceryShoppingPlan from meal plans without an LLM.
+
+    Ingredients are mapped to store sections through the taxonomy in
+    config/taxonomy.yaml plus any sections learned from earlier classifications.
+    """
+
+    def __init__(self, taxonomy_path=None, learned_path=None, price_index=None):
+        with open(taxonomy_path or DEFAULT_TAXONOMY_PATH) as f:
+            taxonomy = yaml.safe_load(f)
+
+        self.sections = list(taxonomy) + [FALLBACK_SECTION]
+        self.taxonomy = {}
+        for section, names in taxonomy.items():
+            for name in names:
+                self.taxonomy[normalize_name(name)] = section
+        self.max_words = max(len(name.split()) for name in self.taxonomy)
+
+        self.learned = SQLiteCache(
+            learned_path or os.getenv("TAXONOMY_LEARNED_PATH", DEFAULT_LEARNED_PATH),
+            table="section_assignments",
+            max_entries=int(os.getenv("TAXONOMY_LEARNED_MAX_ENTRIES", 10000)),
+            default_ttl=365 * 86400,
+        )
+        self.price_index = price_index
+
+    def classify(self, name):
+        """Store section for an ingredient name, or None if it isn't known"""
+        key = normalize_name(name)
+        learned = self.learned.get(key)
+        if learned:
+            return learned
+
+        # Longest run of whole words wins; the last words are usually the noun
+        words = key.split()
+        for size in range(min(len(words), self.max_words), 0, -1):
+            for start in range(len(words) - size, -1, -1):
+                section = self.taxonomy.get(" ".join(words[start:start + size]))
+                if section:
+                    return section
+        return None
+
+    def learn(self, assignments):
+        """Remember {name: section} classifications for next time"""
+        for name, section in assignments.items():
+            if section in self.sections:
+                self.learned.set(normalize_name(name), section)
+
+    def build_plan(self, meal_plans, servings, budget, classify_unknown=None):
+        """Aggregate the researched ingredients of meal_plans into one shopping plan.
+
+        Quantities are scaled from each recipe's servings to servings and summed
+        per ingredient. Names the taxonomy can't place are passed, as a list, to
+        classify_unknown, which returns {name: section}; without it they go to 'Other'.
+        """
+        items = {}  # key -> (display name, [quantity strings])
+        for meal_plan in meal_plans:
+            factor = servings / meal_plan.servings if meal_plan.servings else 1.0
+            for text in meal_plan.researched_ingredients:
+                ingredient = parse_ingredient(text)
+                if not ingredient.key:
+                    continue
+                amount = ingredient.scaled(factor)
+                quantity = format_quantity(amount, ingredient.unit) if amount is not None else "as needed"
+                items.setdefault(ingredient.key, (ingredient.name, []))[1].append(quantity)
+
+        sections = {key: self.classify(key) for key in items}
+        unknown = [items[key][0] for key, section in sections.items() if section is None]
+        if unknown and classify_unknown:
+            assignments = classify_unknown(unknown)
+            self.learn(assignments)
+            by_key = {normalize_name(name): section for name, section in assignments.items()}
+            for key in sections:
+                if sections[key] is None and by_key.get(key) in self.sections:
+                    sections[key] = by_key[key]
+
+        grouped = {section: [] for section in self.sections}
+        for key, (name, quantities) in items.items():
+            quantity = combine_quantities([q for q in quantities if q != "as needed"]) or "as needed"
+            section = sections[key] or FALLBACK_SECTION
+            grouped[section].append(GroceryItem(
+                name=name,
+                quantity=quantity,
+                estimated_price=self.estimate_price(name, quantity),
+                category=section,
+            ))
+
+        return GroceryShoppingPlan(
+            total_budget=budget,
+            meal_plans=list(meal_plans),
+            shopping_sections=[
+                ShoppingCategory(
+                    section_name=section,
+                    items=section_items,
+                    estimated_total=self.estimate_total(section_items),
+                )
+                for section, section_items in grouped.items() if section_items
+            ],
+            shopping_tips=self.shopping_tips(items, len(meal_plans)),
+        )
+
+    def estimate_price(self, name, quantity):
+        cost = self.price_index.price_quantity(name, quantity) if self.price_index else None
+        return format_price_range(*cost) if cost else "unknown"
+
+    @staticmethod
+    def estimate_total(items):
+        priced = [item.estimated_price for item in items if item.estimated_price != "unknown"]
+        total = sum_price_ranges(priced) if priced else None
+        unpriced = len(items) - len(priced)
+        if total is None:
+            return "unknown"
+        return total if not unpriced else f"{total} + {unpriced} unpriced item{'s' if unpriced > 1 else ''}"
+
+    @staticmethod
+    def shopping_tips(items, meal_count):
+        tips = []
+        shared = [name for name, quantities in items.values() if len(quantities) > 1]
+        if meal_count > 1 and shared:
+            tips.append(f"Buy larger packs of ingredients used in several meals: {', '.join(shared[:5])}")
+        unmeasured = [name for name, quantities in items.values() if quantities == ["as needed"] * len(quantities)]
+        if unmeasured:
+            tips.append(f"Check your pantry before buying: {', '.join(unmeasured[:5])}")
+        return tips
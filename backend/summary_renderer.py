@@ -0,0 +1,100 @@
+from ingredients import DEFAULT_CURRENCY, format_money, format_price_range
+
+
+def render_summary(task_outputs, cost_estimate=None):
+    """Markdown meal plan report built from the serialized task outputs, with no LLM call.
+
+    task_outputs holds the meal plan (or a list of them for a batch), the
+    shopping plan as dicts and the budget and leftover texts; cost_estimate is
+    the price index breakdown, used for section and overall totals when given.
+    """
+    meal_plans = task_outputs.get("meal_planning")
+    if not isinstance(meal_plans, list):
+        meal_plans = [meal_plans]
+    meal_plans = [plan for plan in meal_plans if plan]
+    shopping = task_outputs.get("shopping")
+    if not isinstance(shopping, dict):
+        shopping = None
+
+    lines = [f"# Meal Plan: {', '.join(meal_plan_title(plan) for plan in meal_plans) or 'Your Meals'}"]
+
+    for plan in meal_plans:
+        if not isinstance(plan, dict):
+            # The meal planner gave no structured plan; show its answer as is
+            lines += ["", str(plan)]
+            continue
+        lines += ["", f"## {plan['meal_name']}", "", f"*{plan['difficulty_level']} · serves {plan['servings']}*"]
+        if plan.get("researched_ingredients"):
+            lines += ["", "### Ingredients"] + [f"- {ingredient}" for ingredient in plan["researched_ingredients"]]
+
+    if shopping:
+        lines += ["", "## Shopping List"]
+        section_costs = (cost_estimate or {}).get("sections", {})
+        currency = (cost_estimate or {}).get("currency", DEFAULT_CURRENCY)
+        for section in shopping.get("shopping_sections", []):
+            cost = section_costs.get(section["section_name"])
+            # A section with no priced items keeps the shopping plan's estimate
+            total = format_price_range(cost["low"], cost["high"], currency) if cost and cost["high"] else section["estimated_total"]
+            lines += ["", f"### {section['section_name']} ({total})"]
+            lines += [f"- {item['name']} ({item['quantity']}) - {item['estimated_price']}" for item in section["items"]]
+        lines += ["", cost_line(shopping, cost_estimate)]
+
+    budget = task_outputs.get("budget")
+    if isinstance(budget, dict):
+        lines += ["", "## Budget Analysis", ""] + budget_lines(budget)
+    elif budget:
+        lines += ["", "## Budget Analysis", "", nest_markdown(budget, "Budget Analysis")]
+
+    if task_outputs.get("leftover"):
+        lines += ["", "## Leftovers", "", nest_markdown(task_outputs["leftover"], "Leftovers")]
+
+    if shopping and shopping.get("shopping_tips"):
+        lines += ["", "## Shopping Tips"] + [f"- {tip}" for tip in shopping["shopping_tips"]]
+
+    return "\n".join(lines) + "\n"
+
+
+def meal_plan_title(plan):
+    return plan["meal_name"] if isinstance(plan, dict) else "Your Meal"
+
+
+def budget_lines(budget):
+    """Markdown lines for a serialized BudgetAnalysis"""
+    lines = [nest_markdown(budget["analysis"], "Budget Analysis")]
+    if budget.get("substitutions"):
+        currency = (budget.get("total") or {}).get("currency", DEFAULT_CURRENCY)
+        lines += ["", f"### Swaps to Save {format_money(budget['over_budget_by'], currency)}"]
+        lines += [
+            f"- {swap['replacement']} instead of {swap['item']} "
+            f"(saves {format_price_range(swap['savings']['low'], swap['savings']['high'], swap['savings'].get('currency', currency))})"
+            for swap in budget["substitutions"]
+        ]
+        total = budget.get("rebalanced_total")
+        if total:
+            lines += ["", f"**Total after swaps:** {format_price_range(total['low'], total['high'], total.get('currency', currency))}"]
+    if budget.get("money_saving_tips"):
+        lines += ["", "### Money-Saving Tips"] + [f"- {tip}" for tip in budget["money_saving_tips"]]
+    return lines
+
+
+def nest_markdown(text, title):
+    """Agent Markdown demoted under a level two heading, dropping a leading heading that repeats title"""
+    lines = str(text).strip().splitlines()
+    if lines and lines[0].startswith("#") and lines[0].lstrip("#").strip().casefold() == title.casefold():
+        lines = lines[1:]
+    return "\n".join("#" + line if line.startswith("#") else line for line in lines).strip()
+
+
+def cost_line(shopping, cost_estimate):
+    if not cost_estimate or not cost_estimate["total_high"]:
+        return f"**Budget:** {shopping['total_budget']}"
+    currency = cost_estimate.get("currency", DEFAULT_CURRENCY)
+    budget_currency = cost_estimate.get("budget_currency", currency)
+    line = f"**Estimated total:** {format_price_range(cost_estimate['total_low'], cost_estimate['total_high'], currency)}"
+    if cost_estimate.get("unpriced_items"):
+        line += f" plus {cost_estimate['unpriced_items']} items with no price"
+    if cost_estimate.get("budget") is not None and cost_estimate.get("within_budget") is None:
+        line += f" (prices in {currency}; budget of {format_money(cost_estimate['budget'], budget_currency)} not compared)"
+    elif cost_estimate.get("budget") is not None:
+        line += f" ({'within' if cost_estimate['within_budget'] else 'over'} the {format_money(cost_estimate['budget'], budget_currency)} budget)"
+    return line
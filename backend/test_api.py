@@ -5,6 +5,7 @@ Test script for the Alex Meal Planner API
 import requests
 import json
 import os
+import time
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -24,6 +25,23 @@ def test_health_check():
         print(f"Error: {e}")
         return False
 
+def test_readiness_check():
+    """Test the readiness endpoint"""
+    print("\nTesting readiness endpoint...")
+    try:
+        response = requests.get(f"{BASE_URL}/ready")
+        print(f"Status: {response.status_code}")
+        print(f"Response: {response.json()}")
+        for provider, client in response.json().get("providers", {}).items():
+            print(f"  {provider}: circuit {client['state']}, {client['consecutive_failures']} consecutive failures")
+        admission = response.json().get("admission", {})
+        if admission:
+            print(f"  admission: {admission['in_use']}/{admission['max_concurrent']} crew slots in use, {admission['waiting']} waiting")
+        return response.status_code in (200, 503) and "checks" in response.json()
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
 def test_config_endpoint():
     """Test the configuration endpoint"""
     print("\nTesting configuration endpoint...")
@@ -31,7 +49,10 @@ def test_config_endpoint():
         response = requests.get(f"{BASE_URL}/api/config")
         print(f"Status: {response.status_code}")
         print(f"Response: {json.dumps(response.json(), indent=2)}")
-        return response.status_code == 200
+        routing = response.json()["data"].get("llm_routing", {})
+        for task_name, route in routing.get("tasks", {}).items():
+            print(f"  {task_name}: {route['model']} ({route['tier']}), timeout {route['timeout_seconds']}s")
+        return response.status_code == 200 and bool(routing.get("tasks"))
     except Exception as e:
         print(f"Error: {e}")
         return False
@@ -51,6 +72,46 @@ def test_supported_meals():
         print(f"Error: {e}")
         return False
 
+def test_cache_stats():
+    """Test the meal plan cache, search cache and price index statistics endpoint"""
+    print("\nTesting cache statistics endpoint...")
+    try:
+        response = requests.get(f"{BASE_URL}/api/cache")
+        print(f"Status: {response.status_code}")
+        print(f"Response: {json.dumps(response.json(), indent=2)}")
+        # Search and price stats appear once the crew service has been built
+        return response.status_code == 200 and "plans" in response.json()["data"]
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_warmup_status():
+    """Test the catalog warm-up status endpoint"""
+    print("\nTesting warm-up status endpoint...")
+    try:
+        response = requests.get(f"{BASE_URL}/api/warmup")
+        print(f"Status: {response.status_code}")
+        data = response.json()
+        print(f"Catalog coverage: {data['data']['catalog']['coverage']}")
+        print(f"Last run: {data['data']['last_run']}")
+        return response.status_code == 200 and "catalog" in data["data"]
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_metrics_endpoint():
+    """Test the Prometheus metrics endpoint"""
+    print("\nTesting metrics endpoint...")
+    try:
+        response = requests.get(f"{BASE_URL}/metrics")
+        print(f"Status: {response.status_code}")
+        metric_names = {line.split()[2] for line in response.text.splitlines() if line.startswith("# TYPE")}
+        print(f"Metrics exposed: {sorted(metric_names)}")
+        return response.status_code == 200
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
 def test_meal_plan_generation():
     """Test meal plan generation (requires API keys)"""
     print("\nTesting meal plan generation...")
@@ -83,6 +144,9 @@ def test_meal_plan_generation():
             data = response.json()
             print("✅ Meal plan generated successfully!")
             print(f"Request info: {data.get('request_info')}")
+            print(f"Summary source: {data['data'].get('summary_source')}")
+            budget = data['data'].get('task_outputs', {}).get('budget') or {}
+            print(f"Within budget: {budget.get('within_budget')}, substitutions: {len(budget.get('substitutions', []))}")
             # Don't print the full result as it might be very long
             print("Response contains meal plan data")
         else:
@@ -94,15 +158,267 @@ def test_meal_plan_generation():
         print(f"Error: {e}")
         return False
 
+def test_similar_meal_plan():
+    """Test that a near-identical request is served from the plan cache (run after meal plan generation)"""
+    print("\nTesting similar meal plan cache...")
+
+    if not os.getenv('SERPER_API_KEY') or not os.getenv('ANTHROPIC_API_KEY'):
+        print("Skipping similar meal plan test - API keys not configured")
+        return True
+
+    try:
+        test_request = {
+            "meal_name": "chicken stir-fry",
+            "servings": 6,
+            "budget": "$40",
+            "dietary_restrictions": [],
+            "cooking_skill": "beginner"
+        }
+        response = requests.post(f"{BASE_URL}/api/meal-plan", json=test_request, timeout=120)
+        print(f"Status: {response.status_code}")
+        if response.status_code != 200:
+            print(f"Error response: {response.json()}")
+            return False
+
+        data = response.json()
+        print(f"Cache: {data['request_info'].get('cache')}")
+        print(f"Cache match: {data['data'].get('cache_match')}")
+        return data['request_info'].get('cache') == "similar"
+
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_meal_plan_revision():
+    """Test revising a cached meal plan's servings and budget (requires API keys)"""
+    print("\nTesting meal plan revision...")
+
+    if not os.getenv('SERPER_API_KEY') or not os.getenv('GEMINI_API_KEY'):
+        print("Skipping meal plan revision test - API keys not configured")
+        return True
+
+    try:
+        test_request = {
+            "meal_name": "Chicken Stir Fry",
+            "servings": 4,
+            "budget": "$25",
+            "dietary_restrictions": [],
+            "cooking_skill": "beginner"
+        }
+        response = requests.post(f"{BASE_URL}/api/meal-plan", json=test_request, timeout=120)
+        plan_id = response.json()['request_info'].get('plan_id')
+        print(f"Plan id: {plan_id}")
+        if not plan_id:
+            return False
+
+        response = requests.post(f"{BASE_URL}/api/meal-plan/{plan_id}/revise", json={"servings": 8, "budget": "$50"}, timeout=120)
+        print(f"Status: {response.status_code}")
+        if response.status_code != 200:
+            print(f"Error response: {response.json()}")
+            return False
+
+        data = response.json()
+        revision = data['request_info']['revision']
+        print(f"Changed fields: {revision['changed_fields']}")
+        print(f"Reused tasks: {revision['reused_tasks']}")
+        return data['request_info']['servings'] == 8 and data['data']['task_outputs']['meal_planning']['servings'] == 8
+
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_meal_plan_refetch():
+    """Test re-fetching a stored meal plan with a field selection and its ETag (requires API keys)"""
+    print("\nTesting meal plan re-fetch...")
+
+    if not os.getenv('SERPER_API_KEY') or not os.getenv('GEMINI_API_KEY'):
+        print("Skipping meal plan re-fetch test - API keys not configured")
+        return True
+
+    try:
+        test_request = {
+            "meal_name": "Chicken Stir Fry",
+            "servings": 4,
+            "budget": "$25",
+            "dietary_restrictions": [],
+            "cooking_skill": "beginner"
+        }
+        response = requests.post(f"{BASE_URL}/api/meal-plan", json=test_request, timeout=120)
+        plan_id = response.json()['request_info'].get('plan_id')
+        if not plan_id:
+            return False
+
+        response = requests.get(f"{BASE_URL}/api/meal-plan/{plan_id}", params={"fields": "summary,task_outputs.budget"})
+        etag = response.headers.get('ETag')
+        print(f"Status: {response.status_code}, Content-Encoding: {response.headers.get('Content-Encoding')}, ETag: {etag}")
+        print(f"Fields returned: {list(response.json()['data'])}")
+        if response.status_code != 200 or not etag:
+            return False
+
+        response = requests.get(
+            f"{BASE_URL}/api/meal-plan/{plan_id}",
+            params={"fields": "summary,task_outputs.budget"},
+            headers={"If-None-Match": etag}
+        )
+        print(f"Re-fetch status: {response.status_code}")
+        return response.status_code == 304
+
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_meal_plan_job():
+    """Test asynchronous meal plan generation via the job API (requires API keys)"""
+    print("\nTesting meal plan job submission...")
+    
+    if not os.getenv('SERPER_API_KEY') or not os.getenv('GEMINI_API_KEY'):
+        print("Skipping meal plan job test - API keys not configured")
+        return True
+    
+    try:
+        test_request = {
+            "meal_name": "Chicken Stir Fry",
+            "servings": 4,
+            "budget": "$25",
+            "dietary_restrictions": [],
+            "cooking_skill": "beginner"
+        }
+        
+        response = requests.post(f"{BASE_URL}/api/jobs", json=test_request)
+        print(f"Status: {response.status_code}")
+        if response.status_code != 202:
+            print(f"Error response: {response.json()}")
+            return False
+        
+        job_id = response.json()["data"]["job_id"]
+        print(f"Job id: {job_id}")
+        
+        # Poll for up to 2 minutes
+        for _ in range(60):
+            job = requests.get(f"{BASE_URL}/api/jobs/{job_id}").json()["data"]
+            if job["status"] in ("completed", "failed"):
+                print(f"Job finished with status: {job['status']}")
+                return job["status"] == "completed"
+            time.sleep(2)
+        
+        print("Job did not finish in time")
+        return False
+        
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_batch_meal_plan():
+    """Test planning several meals with one shopping list (requires API keys)"""
+    print("\nTesting batch meal plan generation...")
+    
+    if not os.getenv('SERPER_API_KEY') or not os.getenv('GEMINI_API_KEY'):
+        print("Skipping batch meal plan test - API keys not configured")
+        return True
+    
+    try:
+        test_request = {
+            "meals": ["Chicken Stir Fry", "Beef Tacos", "Pasta Carbonara"],
+            "servings": 4,
+            "budget": "$75",
+            "dietary_restrictions": [],
+            "cooking_skill": "beginner"
+        }
+        
+        response = requests.post(f"{BASE_URL}/api/meal-plans/batch", json=test_request, timeout=300)
+        print(f"Status: {response.status_code}")
+        if response.status_code != 200:
+            print(f"Error response: {response.json()}")
+            return False
+        
+        task_outputs = response.json()["data"]["task_outputs"]
+        print(f"Meal plans: {len(task_outputs['meal_planning'])}")
+        return len(task_outputs["meal_planning"]) == len(test_request["meals"])
+        
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_quantity_parsing():
+    """Test that abbreviated units with a trailing period are parsed and scaled (no server needed)"""
+    print("\nTesting quantity parsing...")
+    try:
+        from ingredients import parse_quantity, scale_quantity
+        cases = {
+            "1 lb. chicken breast": (1.0, "lb", "chicken breast"),
+            "2 tbsp. soy sauce": (2.0, "tbsp", "soy sauce"),
+            "2 c. rice": (2.0, "cup", "rice"),
+            "10 oz. tofu": (10.0, "oz", "tofu"),
+        }
+        for text, expected in cases.items():
+            print(f"  {text!r} -> {parse_quantity(text)}")
+            if parse_quantity(text) != expected:
+                return False
+        scaled = scale_quantity("1 lb. chicken", 2)
+        print(f"  scaled x2: {scaled!r}")
+        return scaled == "2 lb chicken" and scale_quantity("2 tbsp. soy sauce", 1.5) == "3 tbsp soy sauce"
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_similar_plan_rescaling():
+    """Test that rescaling a cached plan keeps abbreviated units readable (no server needed)"""
+    print("\nTesting similar plan rescaling...")
+    try:
+        from semantic_cache import rescale_result
+        cached = {"task_outputs": {"meal_planning": {
+            "meal_name": "Chicken Stir Fry",
+            "difficulty_level": "Easy",
+            "servings": 2,
+            "researched_ingredients": ["1 lb. chicken breast", "2 tbsp. soy sauce", "10 oz. tofu"]
+        }}}
+        ingredients = rescale_result(cached, 2, 4)["task_outputs"]["meal_planning"]["researched_ingredients"]
+        print(f"Rescaled ingredients: {ingredients}")
+        return ingredients == ["2 lb chicken breast", "4 tbsp soy sauce", "20 oz tofu"]
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
+def test_revision_scaling():
+    """Test that a serving-size revision keeps abbreviated units readable (no server needed)"""
+    print("\nTesting revision scaling...")
+    try:
+        from models import MealPlan
+        from revision import scale_meal_plan
+        meal_plan = MealPlan(
+            meal_name="Chicken Stir Fry",
+            difficulty_level="Easy",
+            servings=4,
+            researched_ingredients=["1 lb. chicken breast", "2 tbsp. soy sauce", "2 c. rice"]
+        )
+        revised = scale_meal_plan(meal_plan, 8)
+        print(f"Revised ingredients: {revised.researched_ingredients}")
+        return revised.researched_ingredients == ["2 lb chicken breast", "4 tbsp soy sauce", "4 cups rice"]
+    except Exception as e:
+        print(f"Error: {e}")
+        return False
+
 def run_all_tests():
     """Run all API tests"""
     print("=== Alex Meal Planner API Tests ===\n")
     
     tests = [
         ("Health Check", test_health_check),
+        ("Readiness", test_readiness_check),
         ("Configuration", test_config_endpoint),
         ("Supported Meals", test_supported_meals),
-        ("Meal Plan Generation", test_meal_plan_generation)
+        ("Cache Statistics", test_cache_stats),
+        ("Warm-up Status", test_warmup_status),
+        ("Metrics", test_metrics_endpoint),
+        ("Quantity Parsing", test_quantity_parsing),
+        ("Similar Plan Rescaling", test_similar_plan_rescaling),
+        ("Revision Scaling", test_revision_scaling),
+        ("Meal Plan Generation", test_meal_plan_generation),
+        ("Similar Meal Plan", test_similar_meal_plan),
+        ("Meal Plan Revision", test_meal_plan_revision),
+        ("Meal Plan Re-fetch", test_meal_plan_refetch),
+        ("Meal Plan Job", test_meal_plan_job),
+        ("Batch Meal Plan", test_batch_meal_plan)
     ]
     
     results = []
@@ -0,0 +1,225 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from catalog import COOKING_SKILLS, SUPPORTED_MEALS, restriction_sets
+from models import MealPlanRequest
+from plan_cache import is_cacheable
+import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def warmup_servings():
+    """Servings to pre-generate, from WARMUP_SERVINGS (comma separated, default 4)"""
+    return [int(value) for value in os.getenv("WARMUP_SERVINGS", "4").split(",") if value.strip()]
+
+
+def catalog_requests(meals=None, servings=None, budget_per_serving=None):
+    """A MealPlanRequest for every catalog meal x cooking skill x common restriction x servings"""
+    budget_per_serving = budget_per_serving or float(os.getenv("WARMUP_BUDGET_PER_SERVING", 5))
+    return [
+        MealPlanRequest(
+            meal_name=meal_name,
+            servings=count,
+            budget=f"${budget_per_serving * count:.2f}",
+            dietary_restrictions=restrictions,
+            cooking_skill=skill,
+        )
+        for meal_name in (meals or SUPPORTED_MEALS)
+        for skill in COOKING_SKILLS
+        for restrictions in restriction_sets()
+        for count in (servings or warmup_servings())
+    ]
+
+
+class RateLimiter:
+    """Spaces calls at least 60 / per_minute seconds apart across threads; 0 means no limit"""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self, stop_event=None):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_at)
+            self._next_at = start_at + self.interval
+        if stop_event:
+            stop_event.wait(start_at - now)
+        else:
+            time.sleep(start_at - now)
+
+
+class WarmupReport:
+    """Progress of one warm-up run"""
+
+    def __init__(self, total):
+        self.total = total
+        self.already_cached = 0
+        self.generated = 0
+        self.failed = 0
+        self.started_at = time.time()
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def record(self, outcome):
+        with self._lock:
+            if outcome == "cached":
+                self.already_cached += 1
+            elif outcome == "generated":
+                self.generated += 1
+            else:
+                self.failed += 1
+
+    @property
+    def done(self):
+        return self.already_cached + self.generated + self.failed
+
+    def to_dict(self):
+        with self._lock:
+            done = self.done
+            covered = self.already_cached + self.generated
+        return {
+            "total": self.total,
+            "done": done,
+            "already_cached": self.already_cached,
+            "generated": self.generated,
+            "failed": self.failed,
+            "progress": round(done / self.total, 4) if self.total else 1.0,
+            "coverage": round(covered / self.total, 4) if self.total else 1.0,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class PlanWarmer:
+    """Pre-generates and caches plans for the supported meals catalog.
+
+    Plans already in the cache are skipped, so a scheduled run only fills
+    entries that are missing or have expired. Generation runs on at most
+    concurrency threads and starts no more than rate_per_minute plans a minute.
+    """
+
+    def __init__(self, get_crew_service, plan_cache, concurrency=None, rate_per_minute=None, interval=None):
+        # Called when a plan has to be generated, so the crew service is only built if needed
+        self.get_crew_service = get_crew_service
+        self.plan_cache = plan_cache
+        self.concurrency = concurrency or int(os.getenv("WARMUP_CONCURRENCY", 2))
+        self.rate_per_minute = (
+            rate_per_minute if rate_per_minute is not None else float(os.getenv("WARMUP_RATE_PER_MINUTE", 6))
+        )
+        self.interval = interval if interval is not None else int(os.getenv("WARMUP_INTERVAL", 0))
+        self.last_report = None
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run(self, requests=None, refresh=False, on_progress=None):
+        """Generate and cache a plan for each request (the whole catalog by default).
+
+        With refresh, cached plans are regenerated too. on_progress(request, outcome, report)
+        is called after each request, with outcome 'cached', 'generated' or 'failed'.
+        Returns the WarmupReport, or None if another run is in progress.
+        """
+        if not self._run_lock.acquire(blocking=False):
+            logger.warning("Warm-up already running")
+            return None
+
+        try:
+            requests = requests if requests is not None else catalog_requests()
+            if len(requests) > self.plan_cache.store.max_entries:
+                logger.warning(
+                    f"Warm-up covers {len(requests)} plans but the plan cache holds {self.plan_cache.store.max_entries}"
+                )
+            report = self.last_report = WarmupReport(len(requests))
+            limiter = RateLimiter(self.rate_per_minute)
+
+            def warm(meal_request):
+                if self._stop.is_set():
+                    return
+                outcome = self.warm_one(meal_request, limiter, refresh)
+                if outcome is None:
+                    return
+                report.record(outcome)
+                metrics.record_warmup(outcome)
+                if on_progress:
+                    on_progress(meal_request, outcome, report)
+
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="plan-warmup") as executor:
+                list(executor.map(warm, requests))
+
+            report.finished_at = time.time()
+            summary = report.to_dict()
+            logger.info(
+                f"Warm-up finished: {summary['generated']} generated, {summary['already_cached']} already cached, "
+                f"{summary['failed']} failed, coverage {summary['coverage']:.0%}"
+            )
+            return report
+        finally:
+            self._run_lock.release()
+
+    def warm_one(self, meal_request, limiter, refresh=False):
+        if not refresh and self.plan_cache.contains(meal_request):
+            return "cached"
+
+        limiter.wait(self._stop)
+        if self._stop.is_set():
+            return None
+        try:
+            result = self.get_crew_service().generate_meal_plan(meal_request)
+        except Exception as e:
+            logger.warning(f"Warm-up failed for {meal_request.meal_name}: {str(e)}")
+            return "failed"
+
+        if not is_cacheable(result):
+            return "failed"
+        self.plan_cache.set(meal_request, result)
+        return "generated"
+
+    def coverage(self, requests=None):
+        """How much of the catalog grid currently has a cached plan, overall and per meal"""
+        requests = requests if requests is not None else catalog_requests()
+        by_meal = {}
+        for meal_request in requests:
+            counts = by_meal.setdefault(meal_request.meal_name, {"plans": 0, "cached": 0})
+            counts["plans"] += 1
+            counts["cached"] += self.plan_cache.contains(meal_request)
+        cached = sum(counts["cached"] for counts in by_meal.values())
+        return {
+            "plans": len(requests),
+            "cached": cached,
+            "coverage": round(cached / len(requests), 4) if requests else 1.0,
+            "by_meal": by_meal,
+        }
+
+    def status(self):
+        return {
+            "running": self._run_lock.locked(),
+            "interval_seconds": self.interval,
+            "last_run": self.last_report.to_dict() if self.last_report else None,
+            "catalog": self.coverage(),
+        }
+
+    def start(self):
+        """Warm the catalog now and every interval seconds; an interval of 0 disables the schedule"""
+        if self.interval <= 0 or self._thread:
+            return
+        self._thread = threading.Thread(target=self._loop, name="plan-warmer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self):
+        while True:
+            try:
+                self.run()
+            except Exception as e:
+                logger.error(f"Warm-up run failed: {str(e)}")
+            if self._stop.wait(self.interval):
+                break
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import Header from './components/Header';
 import Hero from './components/Hero';
 import MealPlanForm from './components/MealPlanForm';
@@ -13,9 +13,11 @@ const App = () => {
   const [error, setError] = useState(null);
   const [mealPlanResults, setMealPlanResults] = useState(null);
   const [apiStatus, setApiStatus] = useState(null);
+  const closeStreamRef = useRef(null);
 
   useEffect(() => {
     checkApiStatus();
+    return () => closeStreamRef.current?.();
   }, []);
 
   const checkApiStatus = async () => {
@@ -33,22 +35,40 @@ const App = () => {
     setError(null);
   };
 
-  const handleMealPlanSubmit = async (formData) => {
+  const handleMealPlanSubmit = (formData) => {
     setLoading(true);
     setError(null);
-    
-    try {
-      const result = await apiService.generateMealPlan(formData);
-      setMealPlanResults(result);
-      setCurrentView('results');
-    } catch (error) {
-      setError(error.message);
-    } finally {
-      setLoading(false);
-    }
+    setMealPlanResults(null);
+    closeStreamRef.current?.();
+
+    // Show each task's output as soon as it arrives instead of waiting for the whole crew
+    closeStreamRef.current = apiService.streamMealPlan(formData, {
+      onTask: ({ task, output }) => {
+        setMealPlanResults(prev => ({
+          ...prev,
+          data: {
+            ...prev?.data,
+            ...(task === 'summary' ? { summary: output } : {}),
+            task_outputs: { ...prev?.data?.task_outputs, [task]: output },
+          },
+        }));
+        setCurrentView('results');
+      },
+      onComplete: (result) => {
+        setMealPlanResults(result);
+        setCurrentView('results');
+        setLoading(false);
+      },
+      onError: (error) => {
+        setError(error.message);
+        setLoading(false);
+      },
+    });
   };
 
   const handleStartNew = () => {
+    closeStreamRef.current?.();
+    setLoading(false);
     setCurrentView('form');
     setMealPlanResults(null);
     setError(null);
@@ -68,7 +88,7 @@ const App = () => {
     <div className="min-h-screen bg-gray-50">
       <Header />
       
-      {loading && <LoadingSpinner message="This may take a minute while our AI creates your personalized meal plan..." />}
+      {loading && !mealPlanResults && <LoadingSpinner message="This may take a minute while our AI creates your personalized meal plan..." />}
       
       {error && (
         <ErrorMessage 
@@ -96,6 +116,7 @@ const App = () => {
           {currentView === 'results' && mealPlanResults && (
             <MealPlanResults 
               results={mealPlanResults}
+              inProgress={loading}
               onStartNew={handleStartNew}
             />
           )}
@@ -1,8 +1,19 @@
 import React, { useState } from 'react';
 import ReactMarkdown from "react-markdown";
 
-const MealPlanResults = ({ results, onStartNew }) => {
+const formatMoney = (amount, currency = 'USD') =>
+  new Intl.NumberFormat(undefined, { style: 'currency', currency }).format(amount);
+
+// Numeric price ranges ({low, high, currency}) from the cost model
+const formatPrice = (price) => {
+  if (!price) return 'unknown';
+  const low = formatMoney(price.low, price.currency);
+  return price.low === price.high ? low : `${low}-${formatMoney(price.high, price.currency)}`;
+};
+
+const MealPlanResults = ({ results, inProgress = false, onStartNew }) => {
   const [activeTab, setActiveTab] = useState('summary');
+  const [sortByPrice, setSortByPrice] = useState(false);
 
   if (!results) return null;
 
@@ -42,14 +53,25 @@ const MealPlanResults = ({ results, onStartNew }) => {
       case 'shopping':
         const shopping = taskOutputs.shopping;
         if (!shopping) return <p className="text-gray-600">Shopping list not available.</p>;
+        const sortItems = (items = []) =>
+          sortByPrice ? [...items].sort((a, b) => (b.price?.high ?? -1) - (a.price?.high ?? -1)) : items;
         return (
           <div className="space-y-4">
+            <div className="flex justify-between items-center">
+              {shopping.total && <p className="font-semibold text-gray-800">Estimated total: {formatPrice(shopping.total)}</p>}
+              <label className="flex items-center gap-2 text-sm text-gray-600 ml-auto">
+                <input type="checkbox" checked={sortByPrice} onChange={(e) => setSortByPrice(e.target.checked)} />
+                Most expensive first
+              </label>
+            </div>
             {shopping.shopping_sections?.map((section, idx) => (
               <div key={idx} className="bg-gray-50 rounded-lg p-4 border border-gray-200">
-                <h4 className="font-semibold text-gray-800 mb-2">{section.section_name} - {section.estimated_total}</h4>
+                <h4 className="font-semibold text-gray-800 mb-2">
+                  {section.section_name} - {section.total?.high ? formatPrice(section.total) : section.estimated_total}
+                </h4>
                 <ul className="list-disc pl-5 text-gray-700">
-                  {section.items?.map((item, itemIdx) => (
-                    <li key={itemIdx}>{item.name} ({item.quantity}) - {item.estimated_price}</li>
+                  {sortItems(section.items).map((item, itemIdx) => (
+                    <li key={itemIdx}>{item.name} ({item.quantity}) - {item.price ? formatPrice(item.price) : item.estimated_price}</li>
                   ))}
                 </ul>
               </div>
@@ -58,9 +80,60 @@ const MealPlanResults = ({ results, onStartNew }) => {
         );
 
       case 'budget':
+        const budget = taskOutputs.budget;
+        // Plans cached before the budget analysis was structured hold Markdown text
+        if (!budget || typeof budget === 'string') {
+          return (
+            <div className="bg-green-50 rounded-lg p-6">
+             <ReactMarkdown>{budget || "Budget data not available."}</ReactMarkdown>
+            </div>
+          );
+        }
+        const overBudget = budget.within_budget === false;
+        // Prices are in USD; a budget in another currency is shown but not compared
+        const otherCurrency = budget.total && budget.budget && budget.budget.currency !== budget.total.currency;
         return (
-          <div className="bg-green-50 rounded-lg p-6">
-           <ReactMarkdown>{taskOutputs.budget || "Budget data not available."}</ReactMarkdown>
+          <div className="space-y-4">
+            {budget.total && (
+              <div className={`rounded-lg p-4 border ${overBudget ? 'bg-red-50 border-red-200' : 'bg-green-50 border-green-200'}`}>
+                <p className="font-semibold text-gray-800">
+                  Estimated total: {formatPrice(budget.total)}
+                  {budget.budget && ` (budget ${formatPrice(budget.budget)})`}
+                </p>
+                {otherCurrency && (
+                  <p className="text-gray-600 text-sm">
+                    Prices are in {budget.total.currency}, so the {budget.budget.currency} budget wasn't checked
+                  </p>
+                )}
+                {overBudget && (
+                  <p className="text-red-700 text-sm">Over budget by {formatMoney(budget.over_budget_by, budget.total.currency)}</p>
+                )}
+                {budget.unpriced_items > 0 && (
+                  <p className="text-gray-600 text-sm">{budget.unpriced_items} items have no price yet</p>
+                )}
+              </div>
+            )}
+            {budget.substitutions?.length > 0 && (
+              <div className="bg-yellow-50 rounded-lg p-4 border border-yellow-200">
+                <h4 className="font-semibold text-gray-800 mb-2">Swaps to get within budget</h4>
+                <ul className="list-disc pl-5 text-gray-700">
+                  {budget.substitutions.map((swap, idx) => (
+                    <li key={idx}>{swap.replacement} instead of {swap.item} - saves {formatPrice(swap.savings)}</li>
+                  ))}
+                </ul>
+                {budget.rebalanced_total && (
+                  <p className="text-gray-700 text-sm mt-2">Total after swaps: {formatPrice(budget.rebalanced_total)}</p>
+                )}
+              </div>
+            )}
+            <div className="bg-green-50 rounded-lg p-6">
+              <ReactMarkdown>{budget.analysis}</ReactMarkdown>
+              {budget.money_saving_tips?.length > 0 && (
+                <ul className="list-disc pl-5 mt-4 text-gray-700">
+                  {budget.money_saving_tips.map((tip, idx) => <li key={idx}>{tip}</li>)}
+                </ul>
+              )}
+            </div>
           </div>
         );
 
@@ -81,6 +154,12 @@ const MealPlanResults = ({ results, onStartNew }) => {
       <div className="text-center mb-8">
         <h2 className="text-3xl font-bold text-gray-900">Your Personalized Meal Plan</h2>
         <p className="text-gray-600 mt-2">Everything you need to cook with confidence</p>
+        {inProgress && (
+          <div className="inline-flex items-center gap-2 mt-4 px-4 py-2 bg-blue-50 text-blue-700 rounded-full text-sm">
+            <span className="animate-pulse">⏳</span>
+            Still working on the rest of your plan...
+          </div>
+        )}
       </div>
 
       {/* Tabs */}
@@ -49,6 +49,77 @@ class ApiService {
       body: JSON.stringify(mealPlanRequest),
     });
   }
+
+  // Generate meal plan, receiving each task output as soon as it finishes.
+  // Returns a function that closes the stream.
+  streamMealPlan(mealPlanRequest, { onTask, onComplete, onError } = {}) {
+    const params = new URLSearchParams();
+    Object.entries(mealPlanRequest).forEach(([key, value]) => {
+      if (Array.isArray(value)) {
+        value.forEach(item => params.append(key, item));
+      } else if (value !== undefined && value !== null) {
+        params.append(key, value);
+      }
+    });
+
+    const controller = new AbortController();
+    const handlers = {
+      task: (data) => onTask?.(data),
+      complete: (data) => {
+        controller.abort();
+        onComplete?.(data);
+      },
+      error: (data) => {
+        controller.abort();
+        fail(data.error);
+      },
+    };
+    const fail = (message) => {
+      console.error('Meal plan stream failed:', message);
+      onError?.(new Error(message));
+    };
+
+    // fetch rather than EventSource, so rejections before the stream starts
+    // (validation errors, 429s) surface with the server's error message
+    (async () => {
+      const response = await fetch(`${API_BASE_URL}/api/meal-plan/stream?${params}`, {
+        headers: { Accept: 'text/event-stream' },
+        signal: controller.signal,
+      });
+      const contentType = response.headers.get('Content-Type') || '';
+      if (!response.ok || !contentType.includes('text/event-stream')) {
+        const data = contentType.includes('application/json') ? await response.json() : {};
+        fail(data.error || `HTTP error! status: ${response.status}`);
+        return;
+      }
+
+      const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+      let buffer = '';
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += value;
+        // Events are separated by a blank line; lines starting with ':' are keep-alive comments
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+          const block = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+          let event = 'message';
+          const data = [];
+          block.split('\n').forEach((line) => {
+            if (line.startsWith('event:')) event = line.slice(6).trim();
+            else if (line.startsWith('data:')) data.push(line.slice(5).trimStart());
+          });
+          if (data.length && handlers[event]) handlers[event](JSON.parse(data.join('\n')));
+        }
+      }
+      if (!controller.signal.aborted) fail('Lost connection to the meal plan stream');
+    })().catch((error) => {
+      if (!controller.signal.aborted) fail(error.message || 'Lost connection to the meal plan stream');
+    });
+
+    return () => controller.abort();
+  }
 }
 
 export const apiService = new ApiService();